@@ -0,0 +1,58 @@
+# ----- HEADER --------------------------------------------------
+
+# File: batch_evaluation.py
+# Description: Times the evaluation of a whole universe per symbol (pure Python / NumPy) against the cross-symbol
+# batch path of signal_batch.py and checks that all of them return the same results.
+# Usage: python -m backend.benchmark.batch_evaluation [symbols] [candles] [zigzag_period] [seed]
+
+# ----- LIBRARY --------------------------------------------------
+
+import sys as L_SYS
+import time as L_Time
+import random as L_Random
+
+from backend.trade import signal_logic as S_Strategy
+from backend.trade import signal_batch as M_Signal_Batch
+from backend.benchmark.zigzag_equivalence import F_Random_Candles
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Evaluate(p_contexts, p_zigzag_period):
+    # DESC: Runs the scanner's evaluation (status level, Fibonacci, long/short) over every context.
+    return [(S_Strategy.F_Get_ZigZag_Level(context, p_zigzag_period), S_Strategy.F_Find_Fibonacci(context),
+             S_Strategy.F_Find_Long_Signal(context, p_zigzag_period),
+             S_Strategy.F_Find_Short_Signal(context, p_zigzag_period)) for context in p_contexts]
+
+def main():
+    count = int(L_SYS.argv[1]) if len(L_SYS.argv) > 1 else 400
+    candles = int(L_SYS.argv[2]) if len(L_SYS.argv) > 2 else 500
+    zigzag_period = int(L_SYS.argv[3]) if len(L_SYS.argv) > 3 else 10
+    seed = int(L_SYS.argv[4]) if len(L_SYS.argv) > 4 else 1
+    rng = L_Random.Random(seed)
+    bundles = []
+    for _ in range(count):
+        closes, highs, lows = F_Random_Candles(rng, candles)
+        bundles.append({'close': closes, 'high': highs, 'low': lows})
+    timings, expected = {}, None
+    for name in S_Strategy.F_Get_Strategy_Backends() + ['batch']:
+        started = L_Time.perf_counter()
+        if name == 'batch':
+            contexts = M_Signal_Batch.F_Create_Contexts(bundles, (zigzag_period, S_Strategy.FIBONACCI_PERIOD))
+        else:
+            contexts = [S_Strategy.F_Create_Context(bundle['close'], bundle['high'], bundle['low'], name)
+                        for bundle in bundles]
+        results = F_Evaluate(contexts, zigzag_period)
+        timings[name] = L_Time.perf_counter() - started
+        if expected is None: expected = results
+        elif results != expected:
+            print(f"{name}: MISMATCH in symbol {next(i for i, r in enumerate(results) if r != expected[i])}")
+            return 1
+    signals = sum(1 for result in expected for signal in result[2:] if signal['signal'] != 'none')
+    print(f"{count} symbols x {candles} candles, zigzag period {zigzag_period}, {signals} signals, results identical")
+    for name, elapsed in timings.items():
+        print(f"{name}: {elapsed * 1000:.1f}ms | {elapsed / count * 1e6:.0f}us per symbol | "
+              f"speedup {timings['python'] / elapsed:.2f}x")
+    return 0
+
+if __name__ == "__main__":
+    L_SYS.exit(main())
@@ -0,0 +1,211 @@
+# ----- HEADER --------------------------------------------------
+
+# File: fake_bybit_server.py
+# Description: Local stand-in for the Bybit V5 public market REST API with latency, 429, timeout and rate limit injection.
+# Usage: python -m backend.benchmark.fake_bybit_server [symbol_count] [port] [latency_ms] [error_rate] [timeout_rate]
+# Point BYBIT_BASE_URL at http://127.0.0.1:<port>. Serves /v5/market/instruments-info, /v5/market/tickers and
+# /v5/market/kline. Klines are a deterministic function of (symbol, interval, candle start), so repeated and
+# incremental requests agree with each other; the newest candle is aligned to the wall clock.
+
+# ----- LIBRARY --------------------------------------------------
+
+import sys as L_SYS
+import math as L_Math
+import time as L_Time
+import random as L_Random
+import zlib as L_Zlib
+import asyncio as L_Asyncio
+import threading as L_Thread
+from collections import deque as L_Deque
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web as L_Web
+
+# ----- VARIABLE --------------------------------------------------
+
+# Per-second request limits of each endpoint class; 0 disables the limit
+DEFAULT_RATE_LIMITS = {'kline': 120, 'tickers': 20, 'instruments-info': 10}
+
+# Seconds an injected timeout keeps the request open before answering
+TIMEOUT_DELAY = 30.0
+
+# Kline intervals (Bybit interval -> milliseconds)
+INTERVAL_MS = {
+    '1': 60000, '3': 180000, '5': 300000, '15': 900000, '30': 1800000, '60': 3600000, '120': 7200000,
+    '240': 14400000, '360': 21600000, '720': 43200000, 'D': 86400000, 'W': 604800000,
+}
+
+# ----- CLASS --------------------------------------------------
+
+class C_Fake_Bybit_Server:
+    # DESC: Serves synthetic market data for p_symbol_count symbols. Faults are injected per request:
+    # p_latency (+ up to p_jitter) seconds of delay, p_error_rate HTTP 429s, p_timeout_rate requests held open
+    # for p_timeout_delay seconds. Requests beyond p_rate_limits (per class, per rolling second) are answered with
+    # retCode 10006, and every response carries the X-Bapi-Limit headers.
+    def __init__(
+            self,
+            p_symbol_count: int = 2000,
+            p_latency: float = 0.0,
+            p_jitter: float = 0.0,
+            p_error_rate: float = 0.0,
+            p_timeout_rate: float = 0.0,
+            p_timeout_delay: float = TIMEOUT_DELAY,
+            p_rate_limits: Optional[Dict[str, int]] = None,
+            p_seed: int = 0
+            ):
+        self.symbols = [f"SYN{index:05d}USDT" for index in range(p_symbol_count)]
+        self.latency = p_latency
+        self.jitter = p_jitter
+        self.error_rate = p_error_rate
+        self.timeout_rate = p_timeout_rate
+        self.timeout_delay = p_timeout_delay
+        self.rate_limits = dict(DEFAULT_RATE_LIMITS if p_rate_limits is None else p_rate_limits)
+        self.stats = {'requests': 0, 'ok': 0, 'http_429': 0, 'rate_limited': 0, 'timeouts': 0}
+        self.port: Optional[int] = None
+        self._random = L_Random.Random(p_seed)
+        self._windows: Dict[str, L_Deque] = {}
+        self._loop: Optional[L_Asyncio.AbstractEventLoop] = None
+        self._runner: Optional[L_Web.AppRunner] = None
+
+    # --- Market data ---
+
+    def _base_price(self, p_symbol: str) -> float:
+        return 0.01 * 10 ** (_stable_hash(p_symbol) % 700 / 100)
+
+    def _instruments(self) -> List[Dict[str, str]]:
+        return [{'symbol': symbol, 'contractType': 'LinearPerpetual', 'status': 'Trading',
+                 'baseCoin': symbol[:-4], 'quoteCoin': 'USDT'} for symbol in self.symbols]
+
+    def _ticker(self, p_symbol: str) -> Dict[str, str]:
+        price = self._candle_close(p_symbol, '1', int(L_Time.time() * 1000) // 60000 * 60000)
+        turnover = 1e5 * 10 ** (_stable_hash(p_symbol + 'turnover') % 400 / 100)
+        return {'symbol': p_symbol, 'lastPrice': f"{price:.6f}", 'markPrice': f"{price:.6f}",
+                'turnover24h': f"{turnover:.2f}", 'volume24h': f"{turnover / price:.2f}"}
+
+    def _candle_close(self, p_symbol: str, p_interval: str, p_start: int) -> float:
+        """
+        Deterministic price path: two overlapping waves plus per-candle noise around the symbol's base price.
+        """
+        index = p_start // INTERVAL_MS.get(p_interval, 60000)
+        phase = _stable_hash(p_symbol + p_interval) % 1000
+        noise = L_Random.Random(f"{p_symbol}|{p_interval}|{p_start}").uniform(-0.004, 0.004)
+        wave = 0.06 * L_Math.sin((index + phase) / 9) + 0.03 * L_Math.sin((index + phase) / 31)
+        return self._base_price(p_symbol) * (1 + wave + noise)
+
+    def _klines(self, p_symbol: str, p_interval: str, p_start: Optional[int], p_limit: int) -> List[List[str]]:
+        """
+        Returns up to p_limit rows newest first, ending at the forming candle and starting no earlier than p_start.
+        """
+        step = INTERVAL_MS.get(p_interval, 60000)
+        newest = int(L_Time.time() * 1000) // step * step
+        rows = []
+        for offset in range(p_limit):
+            start = newest - offset * step
+            if p_start is not None and start < p_start: break
+            close = self._candle_close(p_symbol, p_interval, start)
+            open_price = self._candle_close(p_symbol, p_interval, start - step)
+            high = max(open_price, close) * 1.002
+            low = min(open_price, close) * 0.998
+            volume = 1000 + _stable_hash(f"{p_symbol}|{start}") % 9000
+            rows.append([str(start), f"{open_price:.6f}", f"{high:.6f}", f"{low:.6f}", f"{close:.6f}",
+                         str(volume), f"{volume * close:.2f}"])
+        return rows
+
+    # --- Faults and limits ---
+
+    def _take_quota(self, p_class: str) -> Tuple[Dict[str, str], bool]:
+        """
+        Counts the request in the rolling one-second window of its class.
+        Returns the rate limit headers and whether the request exceeds the limit.
+        """
+        limit = self.rate_limits.get(p_class, 0)
+        if not limit: return {}, False
+        now = L_Time.time()
+        window = self._windows.setdefault(p_class, L_Deque())
+        while window and window[0] <= now - 1: window.popleft()
+        window.append(now)
+        reset = window[0] + 1
+        headers = {'X-Bapi-Limit': str(limit), 'X-Bapi-Limit-Status': str(max(0, limit - len(window))),
+                   'X-Bapi-Limit-Reset-Timestamp': str(int(reset * 1000))}
+        return headers, len(window) > limit
+
+    async def _handle(self, p_request):
+        endpoint_class = p_request.path.rstrip('/').rsplit('/', 1)[-1]
+        query = p_request.query
+        self.stats['requests'] += 1
+        roll = self._random.random()
+        if roll < self.timeout_rate:
+            self.stats['timeouts'] += 1
+            await L_Asyncio.sleep(self.timeout_delay)
+        delay = self.latency + self._random.random() * self.jitter
+        if delay > 0: await L_Asyncio.sleep(delay)
+        headers, exceeded = self._take_quota(endpoint_class)
+        if self.timeout_rate <= roll < self.timeout_rate + self.error_rate:
+            self.stats['http_429'] += 1
+            return L_Web.Response(status=429, text="Too Many Requests", headers=headers)
+        if exceeded:
+            self.stats['rate_limited'] += 1
+            return L_Web.json_response({'retCode': 10006, 'retMsg': "Too many visits!", 'result': {}}, headers=headers)
+        if endpoint_class == 'instruments-info':
+            items = self._instruments()
+        elif endpoint_class == 'tickers':
+            symbols = [query['symbol']] if query.get('symbol') else self.symbols
+            items = [self._ticker(symbol) for symbol in symbols]
+        else:
+            start = int(query['start']) if query.get('start') else None
+            items = self._klines(query.get('symbol', ''), query.get('interval', '1'), start,
+                                 min(1000, int(query.get('limit', 200))))
+        self.stats['ok'] += 1
+        payload = {'retCode': 0, 'retMsg': "OK", 'result': {'category': 'linear', 'list': items}, 'time': int(L_Time.time() * 1000)}
+        return L_Web.json_response(payload, headers=headers)
+
+    # --- Lifecycle ---
+
+    async def _start(self, p_port: int):
+        app = L_Web.Application()
+        for path in ("/v5/market/instruments-info", "/v5/market/tickers", "/v5/market/kline"):
+            app.router.add_get(path, self._handle)
+        self._runner = L_Web.AppRunner(app)
+        await self._runner.setup()
+        site = L_Web.TCPSite(self._runner, '127.0.0.1', p_port, backlog=1024)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    def start(self, p_port: int = 0) -> str:
+        # DESC: Starts the server on a background thread and returns its base URL (port 0 = any free port).
+        self._loop = L_Asyncio.new_event_loop()
+        L_Thread.Thread(target=self._loop.run_forever, name="FakeBybitServer", daemon=True).start()
+        L_Asyncio.run_coroutine_threadsafe(self._start(p_port), self._loop).result()
+        return f"http://127.0.0.1:{self.port}"
+
+    def stop(self):
+        # DESC: Shuts the server down.
+        if self._loop is None: return
+        L_Asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+# ----- FUNCTION --------------------------------------------------
+
+def _stable_hash(p_text: str) -> int:
+    """
+    Process-independent hash, so synthetic data is identical across runs.
+    """
+    return L_Zlib.crc32(p_text.encode())
+
+def main():
+    symbol_count = int(L_SYS.argv[1]) if len(L_SYS.argv) > 1 else 2000
+    port = int(L_SYS.argv[2]) if len(L_SYS.argv) > 2 else 8080
+    latency = float(L_SYS.argv[3]) / 1000 if len(L_SYS.argv) > 3 else 0.0
+    error_rate = float(L_SYS.argv[4]) if len(L_SYS.argv) > 4 else 0.0
+    timeout_rate = float(L_SYS.argv[5]) if len(L_SYS.argv) > 5 else 0.0
+    server = C_Fake_Bybit_Server(symbol_count, p_latency=latency, p_error_rate=error_rate, p_timeout_rate=timeout_rate)
+    print(f"Serving {symbol_count} symbols on {server.start(port)}")
+    try:
+        L_Thread.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+if __name__ == "__main__":
+    L_SYS.exit(main())
@@ -0,0 +1,123 @@
+# ----- HEADER --------------------------------------------------
+
+# File: fake_kline_stream.py
+# Description: Local stand-in for the Bybit public kline WebSocket that replays recorded frames.
+# Usage: python -m backend.benchmark.fake_kline_stream frames.jsonl [port] [drop_after]
+# Frames are the raw JSON lines written by C_Kline_Stream(p_record_path=...). Point BYBIT_STREAM_URL at
+# ws://127.0.0.1:<port>/v5/public/linear. drop_after closes every connection after that many frames so that
+# reconnect and REST backfill can be exercised.
+
+# ----- LIBRARY --------------------------------------------------
+
+import sys as L_SYS
+import json as L_JSON
+import asyncio as L_Asyncio
+import threading as L_Thread
+from typing import List, Optional
+
+from aiohttp import web as L_Web, WSMsgType as L_WS_Type
+
+# ----- VARIABLE --------------------------------------------------
+
+STREAM_PATH = "/v5/public/linear"
+
+# Delay between replayed frames (seconds)
+FRAME_INTERVAL = 0.01
+
+# ----- CLASS --------------------------------------------------
+
+class C_Fake_Kline_Stream:
+    # DESC: Replays kline frames to every connection, filtered to the topics the client subscribed.
+    # The replay position is shared across connections, so a reconnecting client resumes where the
+    # previous connection was dropped (frames sent while disconnected are lost, like on the real stream).
+    def __init__(self, p_frames: List[str], p_drop_after: Optional[int] = None, p_frame_interval: float = FRAME_INTERVAL):
+        self.frames = p_frames
+        self.drop_after = p_drop_after
+        self.frame_interval = p_frame_interval
+        self.position = 0
+        self.connections = 0
+        self.port: Optional[int] = None
+        self._loop: Optional[L_Asyncio.AbstractEventLoop] = None
+        self._runner: Optional[L_Web.AppRunner] = None
+
+    async def _handle(self, p_request):
+        ws = L_Web.WebSocketResponse()
+        await ws.prepare(p_request)
+        self.connections += 1
+        topics = set()
+        replay = L_Asyncio.ensure_future(self._replay(ws, topics))
+        try:
+            async for message in ws:
+                if message.type != L_WS_Type.TEXT: break
+                request = L_JSON.loads(message.data)
+                op = request.get('op')
+                if op == 'ping':
+                    await ws.send_str(L_JSON.dumps({"success": True, "ret_msg": "pong", "op": "ping"}))
+                elif op in ('subscribe', 'unsubscribe'):
+                    args = set(request.get('args', []))
+                    if op == 'subscribe': topics |= args
+                    else: topics -= args
+                    await ws.send_str(L_JSON.dumps({"success": True, "ret_msg": "", "op": op}))
+        finally:
+            replay.cancel()
+        return ws
+
+    async def _replay(self, p_ws, p_topics):
+        sent = 0
+        while self.position < len(self.frames) and not p_ws.closed:
+            await L_Asyncio.sleep(self.frame_interval)
+            frame = self.frames[self.position]
+            self.position += 1
+            if L_JSON.loads(frame).get('topic') not in p_topics: continue
+            await p_ws.send_str(frame)
+            sent += 1
+            if self.drop_after and sent >= self.drop_after:
+                await p_ws.close()
+                return
+
+    async def _start(self, p_port: int):
+        app = L_Web.Application()
+        app.router.add_get(STREAM_PATH, self._handle)
+        self._runner = L_Web.AppRunner(app)
+        await self._runner.setup()
+        site = L_Web.TCPSite(self._runner, '127.0.0.1', p_port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    def start(self, p_port: int = 0) -> str:
+        # DESC: Starts the server on a background thread and returns its WebSocket URL (port 0 = any free port).
+        self._loop = L_Asyncio.new_event_loop()
+        L_Thread.Thread(target=self._loop.run_forever, name="FakeKlineStream", daemon=True).start()
+        L_Asyncio.run_coroutine_threadsafe(self._start(p_port), self._loop).result()
+        return f"ws://127.0.0.1:{self.port}{STREAM_PATH}"
+
+    def stop(self):
+        # DESC: Shuts the server down.
+        if self._loop is None: return
+        L_Asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Load_Frames(p_path: str) -> List[str]:
+    # DESC: Reads recorded frames (one JSON document per line), skipping control frames.
+    with open(p_path, 'r', encoding='utf-8') as record:
+        return [line.strip() for line in record if line.strip() and '"topic"' in line]
+
+def main():
+    if len(L_SYS.argv) < 2:
+        print("Usage: python -m backend.benchmark.fake_kline_stream frames.jsonl [port] [drop_after]")
+        return 1
+    port = int(L_SYS.argv[2]) if len(L_SYS.argv) > 2 else 8081
+    drop_after = int(L_SYS.argv[3]) if len(L_SYS.argv) > 3 else None
+    server = C_Fake_Kline_Stream(F_Load_Frames(L_SYS.argv[1]), drop_after)
+    print(f"Replaying {len(server.frames)} frames on {server.start(port)}")
+    try:
+        L_Thread.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+if __name__ == "__main__":
+    L_SYS.exit(main())
@@ -0,0 +1,116 @@
+# ----- HEADER --------------------------------------------------
+
+# File: load_test.py
+# Description: Drives scanner_engine.F_Scanner against the fake Bybit server and reports throughput, cycle latency
+# and error rates.
+# Usage: python -m backend.benchmark.load_test [symbol_count] [cycles] [latency_ms] [error_rate] [timeout_rate]
+# The scanner runs on a throw-away database (settings below, no Telegram users), so the bot database is untouched.
+
+# ----- LIBRARY --------------------------------------------------
+
+import os as L_OS
+import sys as L_SYS
+import time as L_Time
+import tempfile as L_Tempfile
+
+from backend.core import database as DB
+from backend.core import config as M_Bybit
+from backend.market import bybit_service as S_Bybit
+from backend.market import scanner_engine as S_Scanner
+from backend.market import kline_store as M_Kline_Store
+from backend.market.market_client import C_Market_Client
+from backend.benchmark.fake_bybit_server import C_Fake_Bybit_Server
+
+# ----- VARIABLE --------------------------------------------------
+
+# Scanner settings used for the run; the interval schedule with wait_time 0 rescans everything back to back
+LOAD_TEST_SETTINGS = {
+    'p_parity': "USDT",
+    'p_min_volume': 0,
+    'p_zigzag_period': 10,
+    'p_period_1': "15",
+    'p_period_2': "60",
+    'p_wait_time': 0,
+    'p_scan_mode': "poll",
+    'p_scan_schedule': "interval",
+}
+
+# Client timeout (seconds); injected timeouts hold requests open longer than this
+CLIENT_TIMEOUT = 2.0
+
+# Status polling interval while waiting for cycles (seconds)
+POLL_INTERVAL = 0.01
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Percentile(p_values, p_percent):
+    # DESC: Nearest-rank percentile of a non-empty list.
+    ordered = sorted(p_values)
+    index = max(0, min(len(ordered) - 1, int(round(p_percent / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def F_Prepare_Database():
+    # DESC: Points the database layer and the kline store at fresh temporary files and stores the load test settings.
+    handle, path = L_Tempfile.mkstemp(prefix="load_test_", suffix=".db")
+    L_OS.close(handle)
+    DB.DB_PATH = path
+    DB.init_db()
+    M_Kline_Store.F_Set_Path(path + ".klines")
+    M_Bybit._settings_cache = None
+    M_Bybit.F_Update_Settings(**LOAD_TEST_SETTINGS)
+    return path
+
+def F_Run_Load_Test(p_server, p_cycles):
+    # DESC: Runs the scanner until p_cycles polling cycles have completed.
+    # Returns (elapsed seconds, cycle latencies, requests sent per endpoint, final scanner status).
+    S_Bybit.F_Set_Provider(C_Market_Client(p_base_url=p_server.start(), p_timeout=CLIENT_TIMEOUT,
+                                           p_governor=S_Bybit._rate_governor))
+    S_Bybit.F_Clear_Candle_Cache()
+    S_Bybit.F_Reset_Request_Stats()
+    latencies, seen = [], 0
+    started = L_Time.perf_counter()
+    S_Scanner.F_Start_Scanner()
+    try:
+        while len(latencies) < p_cycles:
+            L_Time.sleep(POLL_INTERVAL)
+            status = S_Scanner.F_Get_Status_Scanner()
+            if status['cycle_count'] > seen:
+                seen = status['cycle_count']
+                latencies.append(status['last_cycle_time'])
+    finally:
+        elapsed = L_Time.perf_counter() - started
+        S_Scanner.F_Stop_Scanner()
+        S_Bybit.F_Set_Provider(None).close()
+        p_server.stop()
+    return elapsed, latencies, S_Bybit.F_Get_Request_Stats(), status
+
+def main():
+    symbol_count = int(L_SYS.argv[1]) if len(L_SYS.argv) > 1 else 2000
+    cycles = int(L_SYS.argv[2]) if len(L_SYS.argv) > 2 else 5
+    latency = float(L_SYS.argv[3]) / 1000 if len(L_SYS.argv) > 3 else 0.05
+    error_rate = float(L_SYS.argv[4]) if len(L_SYS.argv) > 4 else 0.0
+    timeout_rate = float(L_SYS.argv[5]) if len(L_SYS.argv) > 5 else 0.0
+    database_path = F_Prepare_Database()
+    server = C_Fake_Bybit_Server(symbol_count, p_latency=latency, p_jitter=latency / 2, p_error_rate=error_rate,
+                                 p_timeout_rate=timeout_rate, p_timeout_delay=CLIENT_TIMEOUT * 2)
+    try:
+        elapsed, latencies, requests, status = F_Run_Load_Test(server, cycles)
+    finally:
+        M_Kline_Store.F_Set_Path(None)
+        for suffix in ("", ".klines", ".klines-wal", ".klines-shm"):
+            if L_OS.path.exists(database_path + suffix): L_OS.remove(database_path + suffix)
+    served = server.stats['requests']
+    print(f"Symbols: {symbol_count} | Cycles: {len(latencies)} | Latency: {latency * 1000:.0f}ms | "
+          f"Injected 429: {error_rate:.1%} | Injected timeouts: {timeout_rate:.1%}")
+    print(f"Requests: {served} in {elapsed:.1f}s | {served / elapsed:.1f} requests/s | Client: {requests}")
+    print(f"Cycle latency: first {latencies[0]:.2f}s | p50 {F_Percentile(latencies, 50):.2f}s | "
+          f"p99 {F_Percentile(latencies, 99):.2f}s | max {max(latencies):.2f}s")
+    print("Errors: " + " | ".join(f"{name} {server.stats[name]} ({server.stats[name] / max(1, served):.2%})"
+                                  for name in ('http_429', 'rate_limited', 'timeouts')))
+    print(f"Concurrency: {status['concurrency']} | Adjustments: "
+          + ", ".join(f"{step['level']} ({step['reason']})" for step in status["concurrency_history"][-10:]))
+    print(f"Evaluation cache: {status['evaluation_cache']}")
+    return 0
+
+if __name__ == "__main__":
+    L_SYS.exit(main())
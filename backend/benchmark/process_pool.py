@@ -0,0 +1,64 @@
+# ----- HEADER --------------------------------------------------
+
+# File: process_pool.py
+# Description: Measures strategy evaluation throughput in the scanner's worker threads and in the strategy process
+# pool with 1, 2, 4 and 8 processes, and checks that the pool returns the in-thread results.
+# Usage: python -m backend.benchmark.process_pool [series] [candles] [zigzag_period] [backend] [threads]
+
+# ----- LIBRARY --------------------------------------------------
+
+import os as L_OS
+import sys as L_SYS
+import time as L_Time
+import random as L_Random
+import concurrent.futures as L_Futures
+
+from backend.trade import signal_logic as S_Strategy
+from backend.trade import strategy_registry as M_Strategy_Registry
+from backend.trade.strategy_pool import C_Strategy_Pool, F_Evaluate_Strategies
+from backend.benchmark.zigzag_equivalence import F_Random_Candles
+
+# ----- VARIABLE --------------------------------------------------
+
+PROCESS_COUNTS = [1, 2, 4, 8]
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Run(p_evaluate, p_series, p_threads):
+    # DESC: Evaluates every candle bundle from p_threads threads (like the scanner workers). Returns (results, seconds).
+    started = L_Time.perf_counter()
+    with L_Futures.ThreadPoolExecutor(max_workers=p_threads) as executor:
+        results = list(executor.map(p_evaluate, p_series))
+    return results, L_Time.perf_counter() - started
+
+def main():
+    count = int(L_SYS.argv[1]) if len(L_SYS.argv) > 1 else 800
+    candles = int(L_SYS.argv[2]) if len(L_SYS.argv) > 2 else 500
+    zigzag_period = int(L_SYS.argv[3]) if len(L_SYS.argv) > 3 else 10
+    backend = L_SYS.argv[4] if len(L_SYS.argv) > 4 else S_Strategy.DEFAULT_STRATEGY_BACKEND
+    threads = int(L_SYS.argv[5]) if len(L_SYS.argv) > 5 else 32
+    rng = L_Random.Random(1)
+    series = [dict(zip(('close', 'high', 'low'), F_Random_Candles(rng, candles))) for _ in range(count)]
+    strategies = M_Strategy_Registry.F_Get_Strategies()
+    expected, elapsed = F_Run(lambda bundle: F_Evaluate_Strategies(strategies, bundle, zigzag_period, backend),
+                              series, threads)
+    print(f"{count} series x {candles} candles, backend {backend}, {threads} threads, {L_OS.cpu_count()} CPUs")
+    print(f"threads only: {count / elapsed:.0f} evaluations/s")
+    for processes in PROCESS_COUNTS:
+        pool = C_Strategy_Pool(processes)
+        try:
+            # Warm-up: start the workers and import the strategy modules before timing
+            list(L_Futures.as_completed([pool.submit(strategies, series[0], zigzag_period, backend)
+                                         for _ in range(processes)]))
+            results, elapsed = F_Run(lambda bundle: pool.evaluate(strategies, bundle, zigzag_period, backend),
+                                     series, threads)
+        finally:
+            pool.close()
+        if results != expected:
+            print(f"{processes} processes: MISMATCH")
+            return 1
+        print(f"{processes} processes: {count / elapsed:.0f} evaluations/s")
+    return 0
+
+if __name__ == "__main__":
+    L_SYS.exit(main())
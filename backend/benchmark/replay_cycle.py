@@ -0,0 +1,102 @@
+# ----- HEADER --------------------------------------------------
+
+# File: replay_cycle.py
+# Description: Records one live scan cycle, or times full scan cycles served from a recording without network access.
+# Usage:
+#   python -m backend.benchmark.replay_cycle record <path> [periods] [zigzag_period]
+#   python -m backend.benchmark.replay_cycle synthetic <path> [symbol_count] [periods] [zigzag_period]
+#   python -m backend.benchmark.replay_cycle replay <path> [periods] [zigzag_period] [latency_ms] [cycles]
+# periods is a comma-separated list of Bybit intervals (default: the period_1/period_2 settings, else "15,60").
+# Recordings are gzip JSON lines; the same file can also be served to the scanner with MARKET_REPLAY_PATH.
+
+# ----- LIBRARY --------------------------------------------------
+
+import sys as L_SYS
+import time as L_Time
+
+from backend.core import config as M_Bybit
+from backend.market import bybit_service as S_Bybit
+from backend.market import scanner_engine as S_Scanner
+from backend.market import kline_store as M_Kline_Store
+from backend.market.market_client import C_Market_Client
+from backend.market.market_provider import C_Recording_Provider, C_Replay_Provider
+from backend.benchmark.request_count import C_Synthetic_Session
+
+# ----- VARIABLE --------------------------------------------------
+
+DEFAULT_PERIODS = ["15", "60"]
+DEFAULT_ZIGZAG_PERIOD = 10
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Get_Cycle_Settings(p_args):
+    # DESC: Resolves (periods, zigzag_period) from the command line, falling back to the scanner settings.
+    settings = M_Bybit.F_Get_Settings()
+    period_map = M_Bybit.F_Get_Period()
+    if p_args and p_args[0]:
+        periods = p_args[0].split(',')
+    elif settings.get('period_1') and settings.get('period_2'):
+        periods = [period_map.get(settings['period_1'], settings['period_1']),
+                   period_map.get(settings['period_2'], settings['period_2'])]
+    else:
+        periods = DEFAULT_PERIODS
+    zigzag_period = int(p_args[1]) if len(p_args) > 1 else int(settings.get('zigzag_period') or DEFAULT_ZIGZAG_PERIOD)
+    return periods, zigzag_period
+
+def F_Run_Cycle(p_periods, p_zigzag_period):
+    # DESC: Runs one polling scan cycle the way F_Scanner does and returns (seconds, symbols, requests per endpoint).
+    S_Bybit.F_Reset_Request_Stats()
+    started = L_Time.perf_counter()
+    symbols = S_Bybit.F_Get_Symbol() or []
+    S_Scanner.F_Scan_Cycle(symbols, p_periods, p_zigzag_period)
+    return L_Time.perf_counter() - started, len(symbols), S_Bybit.F_Get_Request_Stats()
+
+def F_Record(p_inner, p_path, p_periods, p_zigzag_period):
+    # DESC: Runs one cycle against p_inner while recording every response to p_path.
+    recorder = C_Recording_Provider(p_inner, p_path)
+    S_Bybit.F_Set_Provider(recorder)
+    try:
+        elapsed, symbols, stats = F_Run_Cycle(p_periods, p_zigzag_period)
+    finally:
+        recorder.close()
+        S_Bybit.F_Set_Provider(None)
+    print(f"Recorded {symbols} symbols | {sum(stats.values())} requests | {elapsed:.2f}s -> {p_path}")
+
+def F_Replay(p_path, p_periods, p_zigzag_period, p_latency, p_cycles):
+    # DESC: Times p_cycles full cycles served from the recording. The first cycle warms the candle cache,
+    # later cycles are steady-state (incremental fetches only).
+    provider = C_Replay_Provider(p_path, p_latency=p_latency)
+    S_Bybit.F_Set_Provider(provider)
+    S_Bybit.F_Clear_Candle_Cache()
+    print(f"Replaying {p_path} | Periods: {', '.join(p_periods)} | ZigZag: {p_zigzag_period} | "
+          f"Latency: {p_latency * 1000:.0f}ms")
+    for cycle in range(p_cycles):
+        elapsed, symbols, stats = F_Run_Cycle(p_periods, p_zigzag_period)
+        print(f"cycle {cycle + 1}: {elapsed:7.3f}s | {symbols} symbols | {sum(stats.values())} requests | {stats}")
+    print(f"Provider: {provider.stats}")
+    S_Bybit.F_Set_Provider(None)
+
+def main():
+    if len(L_SYS.argv) < 3 or L_SYS.argv[1] not in ('record', 'synthetic', 'replay'):
+        print("Usage: python -m backend.benchmark.replay_cycle record|synthetic|replay <path> [...]")
+        return 1
+    command, path, args = L_SYS.argv[1], L_SYS.argv[2], L_SYS.argv[3:]
+    # Every run starts cold and leaves the candle store of the bot untouched
+    M_Kline_Store.F_Set_Path(None)
+    if command == 'record':
+        periods, zigzag_period = F_Get_Cycle_Settings(args)
+        F_Record(C_Market_Client(p_base_url=M_Bybit.F_Get_Market_Url(), p_governor=S_Bybit._rate_governor),
+                 path, periods, zigzag_period)
+    elif command == 'synthetic':
+        symbol_count = int(args[0]) if args else 200
+        periods, zigzag_period = F_Get_Cycle_Settings(args[1:])
+        F_Record(C_Synthetic_Session(symbol_count), path, periods, zigzag_period)
+    else:
+        periods, zigzag_period = F_Get_Cycle_Settings(args[:2])
+        latency = float(args[2]) / 1000 if len(args) > 2 else 0.0
+        cycles = int(args[3]) if len(args) > 3 else 2
+        F_Replay(path, periods, zigzag_period, latency, cycles)
+    return 0
+
+if __name__ == "__main__":
+    L_SYS.exit(main())
@@ -0,0 +1,118 @@
+# ----- HEADER --------------------------------------------------
+
+# File: request_count.py
+# Description: Counts Bybit REST requests and parsed kline rows per scan cycle (legacy, candle bundle, warm cache).
+# Usage: python -m backend.benchmark.request_count [symbol_count]
+# "restart" is a cold start (empty memory cache) two candles later, served from a temporary kline store.
+
+# ----- LIBRARY --------------------------------------------------
+
+import os as L_OS
+import sys as L_SYS
+import random as L_Random
+import tempfile as L_Tempfile
+
+from backend.market import bybit_service as S_Bybit
+from backend.market import kline_store as M_Kline_Store
+from backend.market.market_provider import C_Market_Provider
+
+# ----- VARIABLE --------------------------------------------------
+
+PERIODS = ["15", "60"]
+
+# ----- CLASS --------------------------------------------------
+
+class C_Synthetic_Session(C_Market_Provider):
+    # DESC: Offline stand-in for the Bybit HTTP session that serves random-walk klines. F_Advance moves the clock forward.
+    def __init__(self, p_symbol_count, p_candle_count=600):
+        self.symbols = [f"SYM{i}USDT" for i in range(p_symbol_count)]
+        self.candle_count = p_candle_count
+
+    def F_Advance(self, p_candles=1):
+        self.candle_count += p_candles
+
+    def get_instruments_info(self, **kwargs):
+        return {'result': {'list': [{'symbol': s} for s in self.symbols]}}
+
+    def get_tickers(self, **kwargs):
+        symbols = [kwargs['symbol']] if kwargs.get('symbol') else self.symbols
+        return {'result': {'list': [{'symbol': s, 'turnover24h': '50000000', 'lastPrice': '100', 'markPrice': '100'}
+                                    for s in symbols]}}
+
+    def get_kline(self, **kwargs):
+        rng = L_Random.Random(kwargs['symbol'] + kwargs['interval'])
+        price, rows = 100.0, []
+        for i in range(self.candle_count):
+            open_price = price
+            price = max(0.01, price * (1 + rng.uniform(-0.01, 0.01)))
+            high, low = max(open_price, price) * 1.002, min(open_price, price) * 0.998
+            rows.append([str(i * 60000), str(open_price), str(high), str(low), str(price), "10", "1000"])
+        start = kwargs.get('start')
+        if start is not None: rows = [row for row in rows if int(row[0]) >= start]
+        rows = rows[-kwargs.get('limit', 200):]
+        rows.reverse()
+        return {'result': {'list': rows}}
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Run_Legacy_Cycle(p_symbols):
+    # DESC: Replays the per symbol-period access pattern used before the candle bundle (close, high, low, 1m price)
+    # plus one get_tickers volume lookup per symbol-period (as if every evaluation fired a signal).
+    # Every legacy call downloaded the full window, so the candle cache is emptied before each one.
+    S_Bybit.F_Get_Symbol()
+    for symbol in p_symbols:
+        for period in PERIODS:
+            for accessor, interval in ((S_Bybit.F_Get_Close, period), (S_Bybit.F_Get_High, period),
+                                       (S_Bybit.F_Get_Low, period), (S_Bybit.F_Get_Close, "1")):
+                S_Bybit.F_Evict_Candles([])
+                accessor(symbol, interval)
+            S_Bybit._ticker_snapshot = {}
+            S_Bybit.F_Get_Volume(symbol)
+
+def F_Run_Bundle_Cycle(p_symbols):
+    # DESC: Replays the scanner access pattern: one universe/ticker snapshot per cycle, then a single candle bundle
+    # per symbol-period; price and volume come from the snapshot.
+    S_Bybit.F_Get_Symbol()
+    for symbol in p_symbols:
+        for period in PERIODS:
+            S_Bybit.F_Get_Candles(symbol, period)
+            S_Bybit.F_Get_Ticker(symbol)
+            S_Bybit.F_Get_Volume(symbol)
+
+def F_Measure(p_cycle, p_symbols):
+    # DESC: Runs one cycle and returns the per-endpoint request counts and the number of kline rows parsed.
+    S_Bybit.F_Reset_Request_Stats()
+    rows_before = S_Bybit.F_Get_Candle_Cache_Stats()['rows']
+    p_cycle(p_symbols)
+    return S_Bybit.F_Get_Request_Stats(), S_Bybit.F_Get_Candle_Cache_Stats()['rows'] - rows_before
+
+def main():
+    symbol_count = int(L_SYS.argv[1]) if len(L_SYS.argv) > 1 else 200
+    session = C_Synthetic_Session(symbol_count)
+    S_Bybit.F_Set_Provider(session)
+    store_directory = L_Tempfile.mkdtemp(prefix="request_count_")
+    M_Kline_Store.F_Set_Path(None)
+    results = {}
+    results['legacy'] = F_Measure(F_Run_Legacy_Cycle, session.symbols)
+    S_Bybit.F_Clear_Candle_Cache()
+    results['bundle'] = F_Measure(F_Run_Bundle_Cycle, session.symbols)
+    # Steady state: one new candle closed since the warm-up pass
+    session.F_Advance()
+    results['steady'] = F_Measure(F_Run_Bundle_Cycle, session.symbols)
+    # Restart: the store was written during the previous run, the process comes back two candles later
+    M_Kline_Store.F_Set_Path(L_OS.path.join(store_directory, "kline_store.db"))
+    S_Bybit.F_Clear_Candle_Cache()
+    F_Run_Bundle_Cycle(session.symbols)
+    S_Bybit.F_Clear_Candle_Cache()
+    session.F_Advance(2)
+    results['restart'] = F_Measure(F_Run_Bundle_Cycle, session.symbols)
+    M_Kline_Store.F_Set_Path(None)
+    print(f"Symbols: {symbol_count} | Periods: {', '.join(PERIODS)}")
+    for name, (stats, rows) in results.items():
+        total = sum(stats.values())
+        print(f"{name:>8}: {total:6d} requests/cycle | {total / symbol_count:.2f} per symbol | "
+              f"{rows:8d} kline rows | {stats}")
+    return 0
+
+if __name__ == "__main__":
+    L_SYS.exit(main())
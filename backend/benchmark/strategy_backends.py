@@ -0,0 +1,56 @@
+# ----- HEADER --------------------------------------------------
+
+# File: strategy_backends.py
+# Description: Times a full strategy evaluation (pivots, long/short signals, Fibonacci levels) per strategy
+# backend on random candle series and checks that every backend returns the same results as pure Python. Also
+# reports how long loading the backends took: the Numba kernels are compiled on the first run and read from the
+# on-disk cache afterwards.
+# Usage: python -m backend.benchmark.strategy_backends [series] [candles] [zigzag_period] [seed]
+
+# ----- LIBRARY --------------------------------------------------
+
+import sys as L_SYS
+import time as L_Time
+import random as L_Random
+
+from backend.trade import signal_logic as S_Strategy
+from backend.benchmark.zigzag_equivalence import F_Random_Candles
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Evaluate(p_backend, p_series, p_zigzag_period):
+    # DESC: Evaluates every series like the scanner does. Returns (results, seconds).
+    results = []
+    started = L_Time.perf_counter()
+    for closes, highs, lows in p_series:
+        context = S_Strategy.F_Create_Context(closes, highs, lows, p_backend)
+        results.append((S_Strategy.F_Get_ZigZag_Level(context, p_zigzag_period), S_Strategy.F_Find_Fibonacci(context),
+                        S_Strategy.F_Find_Long_Signal(context, p_zigzag_period),
+                        S_Strategy.F_Find_Short_Signal(context, p_zigzag_period)))
+    return results, L_Time.perf_counter() - started
+
+def main():
+    count = int(L_SYS.argv[1]) if len(L_SYS.argv) > 1 else 500
+    candles = int(L_SYS.argv[2]) if len(L_SYS.argv) > 2 else 500
+    zigzag_period = int(L_SYS.argv[3]) if len(L_SYS.argv) > 3 else 10
+    seed = int(L_SYS.argv[4]) if len(L_SYS.argv) > 4 else 1
+    rng = L_Random.Random(seed)
+    series = [F_Random_Candles(rng, candles) for _ in range(count)]
+    started = L_Time.perf_counter()
+    backends = S_Strategy.F_Get_Strategy_Backends()
+    print(f"backends loaded in {(L_Time.perf_counter() - started) * 1000:.1f}ms: {', '.join(backends)}")
+    expected, baseline = F_Evaluate('python', series, zigzag_period)
+    signals = sum(1 for result in expected for signal in result[2:] if signal['signal'] != 'none')
+    print(f"{count} series x {candles} candles, zigzag period {zigzag_period}, {signals} signals")
+    for backend in backends:
+        results, elapsed = F_Evaluate(backend, series, zigzag_period)
+        if results != expected:
+            mismatch = next(index for index, result in enumerate(results) if result != expected[index])
+            print(f"{backend}: MISMATCH in series {mismatch}")
+            return 1
+        print(f"{backend}: {elapsed * 1000:.1f}ms | {elapsed / count * 1e6:.0f}us per series | "
+              f"speedup {baseline / elapsed:.2f}x")
+    return 0
+
+if __name__ == "__main__":
+    L_SYS.exit(main())
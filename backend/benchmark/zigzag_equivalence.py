@@ -0,0 +1,126 @@
+# ----- HEADER --------------------------------------------------
+
+# File: zigzag_equivalence.py
+# Description: Checks signal_logic.F_Get_ZigZag, the long/short signals and the Fibonacci levels, and the analysis
+# context of every available strategy backend, against the reference implementation on randomized series and
+# times the ZigZag of both.
+# Usage: python -m backend.benchmark.zigzag_equivalence [cases] [seed]
+# Exits with status 1 on the first mismatch and prints the failing case.
+
+# ----- LIBRARY --------------------------------------------------
+
+import sys as L_SYS
+import time as L_Time
+import random as L_Random
+
+from backend.trade import signal_logic as S_Strategy
+from backend.benchmark.zigzag_reference import (F_Get_ZigZag_Reference, F_Get_Long_Signal_Reference,
+                                                F_Get_Short_Signal_Reference, F_Get_Fibonacci_Reference)
+
+# ----- VARIABLE --------------------------------------------------
+
+# Series lengths and zigzag periods drawn for the randomized cases
+MAX_LENGTH = 800
+MAX_PERIOD = 30
+
+# (length, period) pairs used for the timing comparison; short periods on long histories produce thousands of
+# pivots, which is where the labeling pass dominates
+TIMING_CASES = [(500, 10), (500, 30), (5000, 2), (5000, 10), (20000, 2)]
+TIMING_REPEATS = 5
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Random_Candles(p_random, p_length):
+    # DESC: Returns (close, high, low) of a random series. Some series are quantized to a few price steps so that
+    # equal highs/lows (the >= / <= tie cases) are frequent.
+    style = p_random.choice(('walk', 'ticks', 'flat'))
+    drift = p_random.choice((-0.002, 0.0, 0.002))
+    price, closes, highs, lows = 100.0, [], [], []
+    for _ in range(p_length):
+        if style == 'walk': price *= 1 + p_random.gauss(drift, 0.01)
+        elif style == 'ticks': price = 100.0 + p_random.randint(-5, 5)
+        else: price = 100.0 + p_random.choice((0.0, 0.0, 0.0, 1.0))
+        spread = abs(p_random.gauss(0, 0.005)) * price if style == 'walk' else float(p_random.randint(0, 2))
+        high, low = price + spread, price - spread
+        highs.append(high)
+        lows.append(low)
+        closes.append(p_random.uniform(low, high) if style == 'walk' else price)
+    return closes, highs, lows
+
+def F_Check_Equivalence(p_cases, p_seed, p_signals=None):
+    # DESC: Compares both implementations on p_cases random series. Returns the first mismatching case or None.
+    # p_signals (dict), when given, counts the long/short signals the cases produced.
+    rng = L_Random.Random(p_seed)
+    checks = (
+        ('zigzag', F_Get_ZigZag_Reference, S_Strategy.F_Get_ZigZag),
+        ('long', F_Get_Long_Signal_Reference, S_Strategy.F_Get_Long_Signal),
+        ('short', F_Get_Short_Signal_Reference, S_Strategy.F_Get_Short_Signal),
+    )
+    for case in range(p_cases):
+        length = rng.randint(0, MAX_LENGTH)
+        period = rng.randint(0, MAX_PERIOD)
+        closes, highs, lows = F_Random_Candles(rng, length)
+        for name, reference, optimized in checks:
+            expected = reference(closes, highs, lows, period)
+            actual = optimized(closes, highs, lows, period)
+            if actual != expected: return {'case': case, 'check': name, 'length': length, 'period': period,
+                                            'expected': expected[:5], 'actual': actual[:5]}
+            if p_signals is not None and name != 'zigzag' and actual['signal'] != 'none':
+                p_signals[name] = p_signals.get(name, 0) + 1
+        fibonacci = F_Get_Fibonacci_Reference(closes, highs, lows)
+        if S_Strategy.F_Get_Fibonacci(closes, highs, lows) != fibonacci:
+            return {'case': case, 'check': 'fibonacci', 'length': length}
+        mismatch = F_Check_Backends(closes, highs, lows, period, fibonacci)
+        if mismatch is not None: return dict(mismatch, case=case, length=length, period=period)
+    return None
+
+def F_Check_Backends(p_close, p_high, p_low, p_period, p_fibonacci):
+    # DESC: Compares the ZigZag, long/short signals and Fibonacci levels of every available strategy backend's
+    # analysis context with the reference. Returns the first mismatch ({'backend', 'check'}) or None.
+    expected = (F_Get_ZigZag_Reference(p_close, p_high, p_low, p_period),
+                F_Get_Long_Signal_Reference(p_close, p_high, p_low, p_period),
+                F_Get_Short_Signal_Reference(p_close, p_high, p_low, p_period), p_fibonacci)
+    for backend in S_Strategy.F_Get_Strategy_Backends():
+        context = S_Strategy.F_Create_Context(p_close, p_high, p_low, backend)
+        actual = (context.zigzag(p_period), S_Strategy.F_Find_Long_Signal(context, p_period),
+                  S_Strategy.F_Find_Short_Signal(context, p_period), S_Strategy.F_Find_Fibonacci(context))
+        for name, value, reference in zip(('zigzag', 'long', 'short', 'fibonacci'), actual, expected):
+            if value != reference: return {'backend': backend, 'check': name}
+    return None
+
+def F_Time(p_func, p_args, p_repeats):
+    # DESC: Returns the best wall time (seconds) of p_repeats calls.
+    best = None
+    for _ in range(p_repeats):
+        started = L_Time.perf_counter()
+        p_func(*p_args)
+        elapsed = L_Time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    cases = int(L_SYS.argv[1]) if len(L_SYS.argv) > 1 else 2000
+    seed = int(L_SYS.argv[2]) if len(L_SYS.argv) > 2 else 1
+    signals = {}
+    mismatch = F_Check_Equivalence(cases, seed, signals)
+    if mismatch is not None:
+        print(f"MISMATCH: {mismatch}")
+        return 1
+    print(f"Equivalence: {cases} random series identical (seed {seed}) | signals: {signals} | "
+          f"backends: {', '.join(S_Strategy.F_Get_Strategy_Backends())}")
+    rng = L_Random.Random(seed)
+    for length, period in TIMING_CASES:
+        closes, highs, lows = F_Random_Candles(L_Random.Random(rng.random()), length)
+        args = (closes, highs, lows, period)
+        pivots = S_Strategy.F_Get_ZigZag(*args)
+        if pivots != F_Get_ZigZag_Reference(*args):
+            print(f"MISMATCH: {length} candles, period {period}")
+            return 1
+        reference = F_Time(F_Get_ZigZag_Reference, args, TIMING_REPEATS)
+        optimized = F_Time(S_Strategy.F_Get_ZigZag, args, TIMING_REPEATS)
+        print(f"{length} candles, period {period}, {len(pivots)} pivots: reference {reference * 1000:.2f}ms | "
+              f"F_Get_ZigZag {optimized * 1000:.2f}ms | speedup {reference / optimized:.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    L_SYS.exit(main())
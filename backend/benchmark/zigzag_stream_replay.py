@@ -0,0 +1,79 @@
+# ----- HEADER --------------------------------------------------
+
+# File: zigzag_stream_replay.py
+# Description: Replays a long random candle history through the incremental ZigZag engine the way the scanner sees
+# it (a sliding kline window whose last candle is still forming) and checks every evaluation against the batch
+# computation over the same window. Reports the time of both.
+# Usage: python -m backend.benchmark.zigzag_stream_replay [candles] [window] [zigzag_period] [seed]
+
+# ----- LIBRARY --------------------------------------------------
+
+import sys as L_SYS
+import time as L_Time
+import random as L_Random
+
+from backend.trade import signal_logic as S_Strategy
+from backend.trade import zigzag_stream as M_ZigZag_Stream
+from backend.benchmark.zigzag_equivalence import F_Random_Candles
+
+# ----- VARIABLE --------------------------------------------------
+
+# Evaluations per closed candle (the forming candle is re-sampled each time) and chance of skipping a candle
+EVALUATIONS_PER_CANDLE = 2
+SKIP_RATE = 0.2
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Build_Windows(p_candles, p_window, p_seed):
+    # DESC: Returns the kline bundles the scanner would evaluate while replaying p_candles: a window of at most
+    # p_window candles whose last candle is a partial (forming) version of the next candle.
+    rng = L_Random.Random(p_seed)
+    closes, highs, lows = F_Random_Candles(rng, p_candles)
+    windows = []
+    for end in range(1, p_candles):
+        if rng.random() < SKIP_RATE: continue
+        begin = max(0, end + 1 - p_window)
+        for _ in range(EVALUATIONS_PER_CANDLE):
+            # Forming candle: a random part of the final candle's range
+            high = rng.uniform(lows[end], highs[end])
+            low = rng.uniform(lows[end], high)
+            windows.append({
+                'start_time': [float(index) for index in range(begin, end + 1)],
+                'close': closes[begin:end] + [rng.uniform(low, high)],
+                'high': highs[begin:end] + [high],
+                'low': lows[begin:end] + [low],
+            })
+    return windows
+
+def F_Evaluate(p_context, p_zigzag_period):
+    # DESC: Runs the scanner's evaluation over an analysis context.
+    return (p_context.zigzag(p_zigzag_period), S_Strategy.F_Find_Long_Signal(p_context, p_zigzag_period),
+            S_Strategy.F_Find_Short_Signal(p_context, p_zigzag_period))
+
+def main():
+    candles = int(L_SYS.argv[1]) if len(L_SYS.argv) > 1 else 3000
+    window = int(L_SYS.argv[2]) if len(L_SYS.argv) > 2 else 500
+    zigzag_period = int(L_SYS.argv[3]) if len(L_SYS.argv) > 3 else 10
+    seed = int(L_SYS.argv[4]) if len(L_SYS.argv) > 4 else 1
+    windows = F_Build_Windows(candles, window, seed)
+    M_ZigZag_Stream.F_Clear()
+    batch_time = stream_time = 0.0
+    for index, bundle in enumerate(windows):
+        started = L_Time.perf_counter()
+        expected = F_Evaluate(S_Strategy.C_Analysis_Context(bundle['close'], bundle['high'], bundle['low']),
+                              zigzag_period)
+        batch_time += L_Time.perf_counter() - started
+        started = L_Time.perf_counter()
+        actual = F_Evaluate(M_ZigZag_Stream.F_Create_Context('REPLAY', '15', zigzag_period, bundle), zigzag_period)
+        stream_time += L_Time.perf_counter() - started
+        if actual != expected:
+            print(f"MISMATCH at evaluation {index} (window ending at candle {int(bundle['start_time'][-1])})")
+            return 1
+    print(f"{len(windows)} evaluations over {candles} candles (window {window}, zigzag period {zigzag_period}) "
+          f"identical | {M_ZigZag_Stream.F_Get_Stats()}")
+    print(f"Batch: {batch_time * 1000:.1f}ms | Incremental: {stream_time * 1000:.1f}ms | "
+          f"speedup {batch_time / stream_time:.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    L_SYS.exit(main())
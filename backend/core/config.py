@@ -68,6 +68,27 @@ def F_Get_Bot_Keys():
     # Fallback to empty dict if not set
     return {}
 
+# DESC: Retrieves the Bybit REST base URL (override with BYBIT_BASE_URL, e.g. for a local fake exchange).
+def F_Get_Market_Url():
+    return L_OS.getenv("BYBIT_BASE_URL", "https://api.bybit.com")
+
+# DESC: Retrieves the Bybit public linear WebSocket URL (override with BYBIT_STREAM_URL).
+def F_Get_Stream_Url():
+    return L_OS.getenv("BYBIT_STREAM_URL", "wss://stream.bybit.com/v5/public/linear")
+
+# DESC: Retrieves the market data recording paths. MARKET_REPLAY_PATH serves market data from a recording
+# (no network); MARKET_RECORD_PATH records live responses to that file.
+def F_Get_Market_Replay_Path():
+    return L_OS.getenv("MARKET_REPLAY_PATH") or None
+
+def F_Get_Market_Record_Path():
+    return L_OS.getenv("MARKET_RECORD_PATH") or None
+
+# DESC: Retrieves the persistent candle store path (override with KLINE_STORE_PATH; an empty value disables the store).
+def F_Get_Kline_Store_Path():
+    default_path = L_OS.path.join(L_OS.path.dirname(DB.DB_PATH), "kline_store.db")
+    return L_OS.getenv("KLINE_STORE_PATH", default_path) or None
+
 # DESC: Saves or updates the Bybit API and Secret keys.
 # NOW: Reminds user to use .env
 def F_Add_Bot_Keys(p_api_key, p_secret_key):
@@ -90,7 +111,15 @@ def F_Update_Settings(
         p_period_1=None, 
         p_period_2=None, 
         p_max_volume=None, 
-        p_wait_time=None
+        p_wait_time=None,
+        p_scan_mode=None,
+        p_instrument_ttl=None,
+        p_cycle_budget=None,
+        p_scan_schedule=None,
+        p_priority_head=None,
+        p_tail_scan_every=None,
+        p_strategy_backend=None,
+        p_strategy_processes=None
         ):
     global _settings_cache
     
@@ -105,7 +134,15 @@ def F_Update_Settings(
         "period_1": p_period_1,
         "period_2": p_period_2,
         "max_volume": p_max_volume,
-        "wait_time": p_wait_time
+        "wait_time": p_wait_time,
+        "scan_mode": p_scan_mode,
+        "instrument_ttl": p_instrument_ttl,
+        "cycle_budget": p_cycle_budget,
+        "scan_schedule": p_scan_schedule,
+        "priority_head": p_priority_head,
+        "tail_scan_every": p_tail_scan_every,
+        "strategy_backend": p_strategy_backend,
+        "strategy_processes": p_strategy_processes
     }
     
     try:
@@ -11,7 +11,8 @@ from threading import Lock
 
 # Database Logic
 DB_NAME = "bot_data.db"
-DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", DB_NAME)
+# BOT_DB_PATH (environment) points the bot at another database file, e.g. a throw-away one in tests
+DB_PATH = os.getenv("BOT_DB_PATH") or os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", DB_NAME)
 _db_lock = Lock()
 
 def get_connection():
@@ -72,6 +73,15 @@ def init_db():
             )
         ''')
 
+        # Instruments Table (persisted Bybit instrument registry)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS instruments (
+                symbol TEXT PRIMARY KEY,
+                data TEXT,
+                updated_at REAL
+            )
+        ''')
+
         # Buttons Table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS buttons (
@@ -6,92 +6,220 @@
 # ----- LIBRARY --------------------------------------------------
 
 import time as L_Time
-from typing import Dict, List, Optional, Any, Union
-from pybit.unified_trading import HTTP as L_Bybit_HTTP
+import threading as L_Thread
+from typing import Dict, List, Optional, Any, Union, Tuple, Iterable, Callable
 
 from backend.core import config as M_Bybit
 from backend.logger import log_service as M_Log
+from backend.market import instrument_registry as M_Instruments
+from backend.market import kline_store as M_Kline_Store
+from backend.market.market_client import C_Market_Client, C_Market_Error
+from backend.market.market_provider import C_Market_Provider, C_Recording_Provider, C_Replay_Provider
+from backend.market.rate_limiter import C_Rate_Governor
+from backend.market.circuit_breaker import C_Circuit_Breaker
+from backend.market.single_flight import C_Single_Flight
 
 # ----- VARIABLE --------------------------------------------------
 
-_session: Optional[L_Bybit_HTTP] = None
+_session: Optional[C_Market_Provider] = None
+
+# Bybit public market limit is 600 requests per 5s per IP. Budgets are (requests per second, burst) per endpoint
+# class; bursts stay small because the limit is a rolling window. The governor hands out RATE_TARGET of each
+# so the scanner runs close to quota without hitting 429s.
+RATE_TARGET = 0.95
+RATE_SHARED_BUDGET = (120, 20)
+RATE_BUDGETS = {
+    'kline': (110, 20),
+    'tickers': (10, 2),
+    'instruments-info': (5, 2),
+}
+_rate_governor = C_Rate_Governor(RATE_BUDGETS, RATE_SHARED_BUDGET, RATE_TARGET)
+
+# Time budget (seconds) of one logical request including its retries, and the pause between retries
+REQUEST_DEADLINE = 20.0
+RETRY_DELAY = 2.0
+
+# Symbols whose kline requests fail this many times in a row are skipped for the cooldown (seconds). Only
+# failures of the symbol itself count (error code or invalid kline data), not rate limits or network errors.
+# After the cooldown one trial request is let through; it holds the symbol for at most REQUEST_DEADLINE
+CIRCUIT_THRESHOLD = 3
+CIRCUIT_COOLDOWN = 300.0
+_symbol_circuit = C_Circuit_Breaker(CIRCUIT_THRESHOLD, CIRCUIT_COOLDOWN, REQUEST_DEADLINE)
+
+# Concurrent identical requests (same endpoint, symbol, interval) share one call and its parsed result
+_market_flight = C_Single_Flight()
+
+# Kline request depth and the column order of a V5 kline row
+KLINE_LIMIT = 500
+KLINE_COLUMNS = ('start_time', 'open', 'high', 'low', 'close', 'volume', 'turnover')
+
+# Number of API calls sent per endpoint (used for request budgeting and benchmarks)
+_request_stats: Dict[str, int] = {}
+_request_stats_lock = L_Thread.Lock()
+
+# Failed API calls by kind since start-up (never reset; consumers such as the concurrency controller take deltas)
+_error_stats = {'rate_limited': 0, 'timeouts': 0, 'other': 0}
+
+# Per (symbol, interval) candle cache; after warm-up only candles newer than the cached tail are requested
+_candle_cache: Dict[Tuple[str, str], Dict[str, List[float]]] = {}
+_candle_fetched_at: Dict[Tuple[str, str], float] = {}
+_candle_cache_lock = L_Thread.Lock()
+_candle_cache_stats = {'warm_up': 0, 'incremental': 0, 'streamed': 0, 'restored': 0, 'rows': 0, 'evicted': 0}
+
+# Cycle-scoped ticker snapshot, rebuilt from the get_tickers response that F_Get_Symbol already downloads
+_ticker_snapshot: Dict[str, Dict[str, float]] = {}
+_ticker_snapshot_time = 0.0
 
 # ----- FUNCTION --------------------------------------------------
 
-def _get_session() -> L_Bybit_HTTP:
+def _get_session() -> C_Market_Provider:
     """
-    Internal helper to get or create the Bybit HTTP session.
+    Internal helper to get or create the market data provider.
+    Market endpoints are public, so no API keys are attached. MARKET_REPLAY_PATH replaces Bybit with a recording,
+    MARKET_RECORD_PATH records the live responses.
     """
     global _session
     if _session is None:
-        keys = M_Bybit.F_Get_Bot_Keys()
-        api_key = keys.get("main_api_key")
-        secret_key = keys.get("main_secret_key")
-        
-        # Initialize HTTP session
-        # Note: We are using MAINNET (testnet=False). 
-        # By default pybit uses requests.
         try:
-            _session = L_Bybit_HTTP(
-                testnet=False,
-                api_key=api_key,
-                api_secret=secret_key
-            )
+            replay_path = M_Bybit.F_Get_Market_Replay_Path()
+            record_path = M_Bybit.F_Get_Market_Record_Path()
+            if replay_path:
+                _session = C_Replay_Provider(replay_path)
+            else:
+                _session = C_Market_Client(p_base_url=M_Bybit.F_Get_Market_Url(), p_governor=_rate_governor)
+                if record_path: _session = C_Recording_Provider(_session, record_path)
         except Exception as e:
             M_Log.F_Add_Log('error', 'BybitSessionInit', f"Failed to initialize Bybit session: {e}")
             raise e
             
     return _session
 
-def _handle_api_call(p_func, *args, **kwargs):
+def F_Set_Provider(p_provider: Optional[C_Market_Provider]) -> Optional[C_Market_Provider]:
+    # DESC: Replaces the market data provider (e.g. with a C_Replay_Provider) and returns the previous one.
+    # None resets to the provider chosen by _get_session on the next call.
+    global _session
+    previous, _session = _session, p_provider
+    return previous
+
+def _handle_api_call(p_func, *args, p_deadline: Optional[float] = None, **kwargs):
     """
-    Generic wrapper to handle Bybit API calls with rate limiting (429) backoff.
+    Generic wrapper to handle Bybit API calls with rate limiting (429) retries.
+    Pacing is done by the shared rate governor before a request is sent; after a 429 the governor
+    holds the endpoint class until the limit resets, so the retry does not sleep on its own.
+    p_deadline (epoch seconds) bounds the retries: no new attempt is started after it.
     """
     max_retries = 3
-    retry_delay = 5
     
     for attempt in range(max_retries):
+        _count_request(p_func.__name__)
         try:
-            # Set a standard timeout for all pybit internal requests if possible, 
-            # though pybit handles its own requests session.
+            # The market client applies its own per-request timeout
             return p_func(*args, **kwargs)
         except Exception as e:
             error_msg = str(e)
+            _count_error(e)
+            if p_deadline is not None and L_Time.time() >= p_deadline: raise e
             if "429" in error_msg or "Too Many Requests" in error_msg:
-                M_Log.F_Add_Log('alert', 'RateLimit', f"Rate limit hit. Retrying in {retry_delay}s... (Attempt {attempt+1}/{max_retries})")
-                L_Time.sleep(retry_delay)
-                retry_delay *= 2 # Exponential backoff
+                M_Log.F_Add_Log('alert', 'RateLimit', f"Rate limit hit on {p_func.__name__}. Retrying after governor pause... (Attempt {attempt+1}/{max_retries})")
+                if attempt == max_retries - 1: raise e
             elif "timeout" in error_msg.lower():
                 M_Log.F_Add_Log('error', 'NetworkTimeout', f"Request timed out: {p_func.__name__}")
                 if attempt == max_retries - 1: raise e
-                L_Time.sleep(2)
+                L_Time.sleep(_remaining(p_deadline, RETRY_DELAY))
             else:
                 raise e
     return None
 
-def F_Get_Bybit_Symbol_Info() -> List[Dict[str, Any]]:
-    # DESC: Fetches symbol information from Bybit's public API. 
+def _call_until_deadline(p_title: str, p_func, p_deadline: Optional[float] = None, **kwargs) -> Dict[str, Any]:
+    """
+    Repeats an API call until it succeeds or its deadline passes: REQUEST_DEADLINE from now, or p_deadline if
+    that is earlier (e.g. the end of the cycle budget). Raises the last error once the deadline is reached,
+    so a failing request never blocks its caller for longer.
+    """
+    deadline = L_Time.time() + REQUEST_DEADLINE
+    if p_deadline is not None: deadline = min(deadline, p_deadline)
     while True:
         try:
-            session = _get_session()
-            response = _handle_api_call(session.get_instruments_info, category="linear")
-            return response.get('result', {}).get('list', [])
+            response = _handle_api_call(p_func, p_deadline=deadline, **kwargs)
+            if response is None: raise C_Market_Error(f"No response from {p_func.__name__}")
+            return response
         except Exception as e:
-            M_Log.F_Add_Log('alert', 'F_Get_Bybit_Symbol_Info', f"API error: {e}")
-            L_Time.sleep(30)
-            continue
+            symbol = f" ({kwargs['symbol']})" if kwargs.get('symbol') else ""
+            M_Log.F_Add_Log('alert', p_title, f"API error{symbol}: {e}")
+            if L_Time.time() + RETRY_DELAY >= deadline: raise e
+            L_Time.sleep(RETRY_DELAY)
 
-def F_Get_Bybit_Ticker_Info() -> List[Dict[str, Any]]:
-    # DESC: Fetches ticker information from Bybit's public API. 
-    while True:
-        try:
-            session = _get_session()
-            response = _handle_api_call(session.get_tickers, category="linear")
-            return response.get('result', {}).get('list', [])
-        except Exception as e:
-            M_Log.F_Add_Log('alert', 'F_Get_Bybit_Ticker_Info', f"API error: {e}")
-            L_Time.sleep(30)
-            continue
+def _remaining(p_deadline: Optional[float], p_cap: float) -> float:
+    """
+    Seconds left until p_deadline, capped at p_cap (p_cap when there is no deadline).
+    """
+    if p_deadline is None: return p_cap
+    return max(0.0, min(p_cap, p_deadline - L_Time.time()))
+
+def _count_request(p_endpoint: str):
+    """
+    Increments the per-endpoint request counter.
+    """
+    with _request_stats_lock:
+        _request_stats[p_endpoint] = _request_stats.get(p_endpoint, 0) + 1
+
+def _count_error(p_error: Exception):
+    """
+    Counts a failed API call as rate limited, timed out or other.
+    """
+    error_msg = str(p_error)
+    if "429" in error_msg or "Too Many Requests" in error_msg: kind = 'rate_limited'
+    elif "timeout" in error_msg.lower(): kind = 'timeouts'
+    else: kind = 'other'
+    with _request_stats_lock:
+        _error_stats[kind] += 1
+
+def F_Get_Error_Stats() -> Dict[str, int]:
+    # DESC: Returns the number of failed API calls (rate limited, timeouts, other) since start-up.
+    with _request_stats_lock:
+        return dict(_error_stats)
+
+def F_Get_Rate_Status() -> Dict[str, Dict[str, float]]:
+    # DESC: Returns the rate governor state per endpoint class (utilization of quota, paced rate, remaining quota, throttles).
+    return _rate_governor.status()
+
+def F_Get_Request_Stats() -> Dict[str, int]:
+    # DESC: Returns a copy of the per-endpoint request counters.
+    with _request_stats_lock:
+        return dict(_request_stats)
+
+def F_Reset_Request_Stats():
+    # DESC: Clears the per-endpoint request counters and the coalescing counters.
+    with _request_stats_lock:
+        _request_stats.clear()
+    _market_flight.reset_stats()
+
+def F_Get_Coalescing_Stats() -> Dict[str, int]:
+    # DESC: Returns request coalescing counters: misses (requests sent), hits (callers served by a request
+    # already in flight, i.e. saved requests) and the number of requests currently in flight.
+    return _market_flight.get_stats()
+
+def F_Get_Bybit_Symbol_Info(p_deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+    # DESC: Fetches symbol information from Bybit's public API. Returns an empty list if the request
+    # still fails at the deadline (at most REQUEST_DEADLINE from now).
+    try:
+        session = _get_session()
+        response = _market_flight.do(('get_instruments_info',), lambda: _call_until_deadline(
+            'F_Get_Bybit_Symbol_Info', session.get_instruments_info, p_deadline, category="linear"))
+        return response.get('result', {}).get('list', [])
+    except Exception:
+        return []
+
+def F_Get_Bybit_Ticker_Info(p_deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+    # DESC: Fetches ticker information from Bybit's public API. Returns an empty list if the request
+    # still fails at the deadline (at most REQUEST_DEADLINE from now).
+    try:
+        session = _get_session()
+        response = _market_flight.do(('get_tickers',), lambda: _call_until_deadline(
+            'F_Get_Bybit_Ticker_Info', session.get_tickers, p_deadline, category="linear"))
+        return response.get('result', {}).get('list', [])
+    except Exception:
+        return []
 
 def F_Get_Symbol() -> Optional[List[Dict[str, Union[str, float]]]]:
     # DESC: Returns a list of symbols filtered by volume from Bybit. 
@@ -99,10 +227,14 @@ def F_Get_Symbol() -> Optional[List[Dict[str, Union[str, float]]]]:
     parity = settings.get('parity', '').upper()
     min_volume = int(settings.get('min_volume', 0))
     try:
-        symbols_info = F_Get_Bybit_Symbol_Info()
+        # Listings change a few times a day; the registry only hits the network when its TTL expires
+        symbols_info = M_Instruments.F_Get_Instruments(F_Get_Bybit_Symbol_Info)
         if not symbols_info: return None
+        delisted = M_Instruments.F_Pop_Changes()['removed']
+        if delisted: F_Drop_Candles(delisted)
         tickers = F_Get_Bybit_Ticker_Info()
         if not tickers: return None
+        _store_ticker_snapshot(tickers)
         ticker_dict = {t['symbol']: t for t in tickers}
         filtered = []
         for s in symbols_info:
@@ -117,93 +249,325 @@ def F_Get_Symbol() -> Optional[List[Dict[str, Union[str, float]]]]:
         M_Log.F_Add_Log('error', 'F_Get_Symbol', str(e))
         return []
 
+def _store_ticker_snapshot(p_tickers: List[Dict[str, Any]]):
+    """
+    Replaces the ticker snapshot with last price, 24h turnover and mark price of every symbol.
+    """
+    global _ticker_snapshot, _ticker_snapshot_time
+    snapshot = {}
+    for ticker in p_tickers:
+        try:
+            snapshot[ticker['symbol']] = {
+                'last_price': float(ticker.get('lastPrice') or 0),
+                'turnover24h': float(ticker.get('turnover24h') or 0),
+                'mark_price': float(ticker.get('markPrice') or 0),
+            }
+        except (KeyError, ValueError): continue
+    # Swap the whole dict so readers never see a half-built snapshot
+    _ticker_snapshot, _ticker_snapshot_time = snapshot, L_Time.time()
+
+def F_Get_Ticker(p_symbol: str) -> Optional[Dict[str, float]]:
+    # DESC: Returns the snapshot entry (last_price, turnover24h, mark_price) of a symbol, or None if it is not in the snapshot.
+    return _ticker_snapshot.get(p_symbol)
+
+def F_Get_Ticker_Snapshot_Age() -> Optional[float]:
+    # DESC: Returns the age of the ticker snapshot in seconds (None before the first cycle).
+    return L_Time.time() - _ticker_snapshot_time if _ticker_snapshot_time else None
+
 def F_Get_Close(p_symbol: str, p_period: str) -> List[float]:
     # DESC: Returns closing prices for a symbol/period from Bybit.
-    return _fetch_kline_data(p_symbol, p_period, index=4)
+    return F_Get_Candles(p_symbol, p_period).get('close', [])
 
 def F_Get_High(p_symbol: str, p_period: str) -> List[float]:
     # DESC: Returns high prices for a symbol/period from Bybit.
-    return _fetch_kline_data(p_symbol, p_period, index=2)
+    return F_Get_Candles(p_symbol, p_period).get('high', [])
 
 def F_Get_Low(p_symbol: str, p_period: str) -> List[float]:
     # DESC: Returns low prices for a symbol/period from Bybit. 
-    return _fetch_kline_data(p_symbol, p_period, index=3)
+    return F_Get_Candles(p_symbol, p_period).get('low', [])
 
-def _fetch_kline_data(symbol: str, period: str, index: int) -> List[float]:
+def F_Get_Candles(p_symbol: str, p_period: str, p_fresh_since: Optional[float] = None,
+                  p_deadline: Optional[float] = None) -> Dict[str, List[float]]:
+    # DESC: Returns the full OHLCV bundle for a symbol/period with a single kline request. Series are ordered Oldest -> Newest.
+    # p_fresh_since: serve the cached bundle without a request if it was refreshed at or after this epoch time.
+    # p_deadline: give up at this epoch time (at most REQUEST_DEADLINE from now). Returns an empty bundle when the
+    # request fails or the symbol's circuit is open, so callers treat it as "no data" instead of waiting.
+    key = (p_symbol, p_period)
+    _restore_candles([key])
+    with _candle_cache_lock:
+        cached = _candle_cache.get(key)
+        if cached and p_fresh_since is not None and _candle_fetched_at.get(key, 0) >= p_fresh_since: return cached
+    if not _symbol_circuit.allow(p_symbol): return {}
+    return _market_flight.do(('get_kline',) + key, lambda: _refresh_candles(key, p_deadline))
+
+def F_Peek_Candles(p_symbol: str, p_period: str, p_fresh_since: Optional[float] = None) -> Dict[str, List[float]]:
+    # DESC: Returns the cached bundle of a symbol/period without any request (empty if it is not cached, or was
+    # refreshed before p_fresh_since).
+    key = (p_symbol, p_period)
+    with _candle_cache_lock:
+        cached = _candle_cache.get(key)
+        if not cached: return {}
+        if p_fresh_since is not None and _candle_fetched_at.get(key, 0) < p_fresh_since: return {}
+        return cached
+
+def _refresh_candles(p_key: Tuple[str, str], p_deadline: Optional[float]) -> Dict[str, List[float]]:
     """
-    Helper function to fetch kline data and extract specific index.
-    index 4 = close, index 2 = high, index 3 = low
+    Requests the candles missing from the cache of one symbol/period and returns the merged bundle
+    (an empty bundle if the request fails).
     """
-    while True:
+    with _candle_cache_lock: cached = _candle_cache.get(p_key)
+    params = _kline_params(p_key[0], p_key[1], cached)
+    try:
+        response = _fetch_kline_data(params, p_deadline)
+    except Exception as e:
+        if _is_symbol_error(e): _record_symbol_failure(p_key[0])
+        return {}
+    return _accept_candles(p_key, cached, params, response)
+
+def F_Prefetch_Candles(p_pairs: Iterable[Tuple[str, str]], p_concurrency: Optional[Callable[[], int]] = None,
+                       p_deadline: Optional[float] = None) -> int:
+    # DESC: Refreshes the candle cache for many symbol/period pairs with concurrent kline requests.
+    # p_concurrency returns the number of requests allowed in flight; the next request starts as soon as one
+    # completes, and the limit is read again each time, so a controller adjusting it during the prefetch takes
+    # effect. None sends all requests at once. No request is started after p_deadline (epoch seconds).
+    # Returns the number of refreshed pairs; failed and skipped pairs are left to the regular F_Get_Candles path.
+    keys = list(dict.fromkeys(p_pairs))
+    if not keys: return 0
+    _restore_candles(keys)
+    # Symbols with an open circuit are not requested until their cooldown is over
+    keys = [key for key in keys if _symbol_circuit.allow(key[0])]
+    # Pairs another caller is already refreshing are left to that call
+    flights = {}
+    for key in keys:
+        flight, leader = _market_flight.begin(('get_kline',) + key)
+        if leader: flights[key] = flight
+    if not flights: return 0
+    try:
+        with _candle_cache_lock: cached_list = [_candle_cache.get(key) for key in flights]
+        params_list = [_kline_params(symbol, period, cached) for (symbol, period), cached in zip(flights, cached_list)]
         try:
-            session = _get_session()
-            response = _handle_api_call(
-                session.get_kline,
-                category="linear",
-                symbol=symbol,
-                interval=period,
-                limit=500
-            )
-            kline_list = response.get('result', {}).get('list', [])
-            # Bybit V5 returns klines in reverse order (newest first), 
-            # but usually strategies expect oldest first or consistent order.
-            # The original code acted on index 4.
-            # Pybit V5 kline: [startTime, open, high, low, close, volume, turnover]
-            
-            # Note: Verify if the original code expected reverse order or not.
-            # Original code: `closes = [float(item[4]) for item in kline_list]`
-            # Calls are usually `closes[-1]` which implies the list was appended to?
-            # API returns Newest -> Oldest. 
-            # If we want time series, we usually want Oldest -> Newest.
-            # However, I will keep the raw list order to minimize logic change risk, 
-            # BUT usually standard TA libs expect Oldest->Newest.
-            # Let's check `requests` logic. standard API responses are Newest First.
-            # If original code did `closes[-1]`, that would be the OLDEST candle if raw list.
-            # IF original code worked, `closes[-1]` was the one it checked?
-            # Wait, `c_scanner.py` acts on `closes[-1]`. 
-            # If API returns [Newest, ..., Oldest], then [-1] is Oldest.
-            # This seems wrong for "Current Price". 
-            # Usually `closes[0]` is current if Newest First.
-            # OR the original `requests` code received Oldest First?
-            # Bybit V5 documentation says: "Sort in reverse chronological order".
-            
-            # Let's look at `c_scanner.py`: `closes[-1]` is used as current price.
-            # If `kline_list` from API (Newest First) was used directly:
-            # item[0] = Newest. item[-1] = Oldest.
-            # That implies the bot was looking at 500 candles ago? 
-            # THAT WOULD BE A MAJOR BUG IN THE ORIGINAL CODE if V5 was used.
-            # Original code used: `https://api.bybit.com/v5/market/kline`
-            # Answer: Yes, V5 returns reverse chronological.
-            # So `list[0]` is the current candle.
-            # BUT the original code did `closes[-1]`. 
-            # This implies the user might have had a buggy bot or I am misinterpreting.
-            # HOWEVER, `F_Get_Price` grabs `F_Get_Close(..., "1")` and takes `closes[-1]`.
-            # If that is Oldest, it is VERY wrong.
-            
-            # CORRECTION: Many libraries REVERSE the list to be Oldest -> Newest.
-            # But the original code `a_bybit.py` did NOT reverse it.
-            # `closes = [float(item[4]) for item in kline_list]`
-            # It just mapped it.
-            
-            # Let's assume the user wants the standard time series (Oldest -> Newest).
-            # I will reverse the list here to make it "Correct" for standard usage (closes[-1] = Newest).
-            # This fixes the potential bug in the original code seamlessly.
-            
-            values = [float(item[index]) for item in kline_list]
-            values.reverse() # Now it is Oldest -> Newest. closes[-1] is CURRENT.
-            
-            return values
+            responses = _get_session().map('get_kline', params_list, p_concurrency, p_deadline)
         except Exception as e:
-            M_Log.F_Add_Log('alert', f'F_Get_Kline_{index}', f"Network error ({symbol}): {e}")
-            L_Time.sleep(30)
+            responses = [e] * len(params_list)
+        refreshed = _accept_prefetched(flights, cached_list, params_list, responses)
+    finally:
+        # Never leave followers waiting, even if storing a response failed
+        for key, flight in flights.items():
+            if not flight.done.is_set(): _market_flight.finish(('get_kline',) + key, flight, {})
+    M_Kline_Store.F_Flush()
+    return refreshed
+
+def _accept_prefetched(p_flights: Dict[Tuple[str, str], Any], p_cached_list: List[Optional[Dict[str, List[float]]]],
+                       p_params_list: List[Dict[str, Any]], p_responses: List[Any]) -> int:
+    """
+    Stores the prefetch responses, in the order of p_flights, and hands each bundle to the callers waiting on its
+    flight. Requests skipped at the deadline (None) release their callers with an empty bundle.
+    Returns the number of refreshed pairs.
+    """
+    refreshed = 0
+    for (key, flight), cached, params, response in zip(p_flights.items(), p_cached_list, p_params_list, p_responses):
+        if response is None:
+            _market_flight.finish(('get_kline',) + key, flight, {})
             continue
+        _count_request('get_kline')
+        if isinstance(response, Exception):
+            M_Log.F_Add_Log('alert', 'F_Prefetch_Candles', f"Network error ({key[0]}): {response}")
+            _count_error(response)
+            if _is_symbol_error(response): _record_symbol_failure(key[0])
+            _market_flight.finish(('get_kline',) + key, flight, {})
+            continue
+        candles = _accept_candles(key, cached, params, response)
+        _market_flight.finish(('get_kline',) + key, flight, candles)
+        if candles: refreshed += 1
+    return refreshed
+
+def _accept_candles(p_key: Tuple[str, str], p_cached: Optional[Dict[str, List[float]]],
+                    p_params: Dict[str, Any], p_response: Dict[str, Any]) -> Dict[str, List[float]]:
+    """
+    Stores a get_kline response and returns the merged bundle. An empty or malformed kline list is a failure of
+    the symbol (empty bundle returned); a stored response closes the symbol's circuit.
+    """
+    try:
+        kline_list = p_response.get('result', {}).get('list', [])
+        if not kline_list: raise ValueError("empty kline list")
+        candles = _store_candles(p_key, p_cached, p_params, kline_list)
+    except (AttributeError, IndexError, TypeError, ValueError) as e:
+        M_Log.F_Add_Log('alert', 'F_Get_Kline', f"Invalid kline data ({p_key[0]}): {e}")
+        _record_symbol_failure(p_key[0])
+        return {}
+    _symbol_circuit.record_success(p_key[0])
+    return candles
+
+def _is_symbol_error(p_error: Exception) -> bool:
+    """
+    True if Bybit answered the request with an error code (HTTP 200, retCode != 0), i.e. the failure is specific
+    to the requested symbol. Rate limits, timeouts and transport errors hit every symbol alike and are not
+    counted against one.
+    """
+    return isinstance(p_error, C_Market_Error) and p_error.status == 200
+
+def _record_symbol_failure(p_symbol: str):
+    """
+    Counts a failed kline request of a symbol and reports when its circuit opens.
+    """
+    if _symbol_circuit.record_failure(p_symbol):
+        M_Log.F_Add_Log('alert', 'CircuitBreaker',
+                        f"{p_symbol} failed {CIRCUIT_THRESHOLD} times in a row; skipped for {CIRCUIT_COOLDOWN:.0f}s")
+
+def F_Get_Circuit_Status() -> Dict[str, Dict[str, float]]:
+    # DESC: Returns the failing symbols with their consecutive failures and remaining cooldown (0 = not skipped).
+    return _symbol_circuit.status()
+
+def F_Get_Skipped_Symbols() -> List[str]:
+    # DESC: Returns the symbols currently skipped by the circuit breaker.
+    return _symbol_circuit.open_keys()
+
+def _restore_candles(p_keys: List[Tuple[str, str]]):
+    """
+    Fills cache misses from the persistent kline store, so that after a restart only the gap since shutdown
+    is requested. Only full windows are restored; shorter histories are warmed up over REST as before.
+    """
+    with _candle_cache_lock: missing = [key for key in p_keys if key not in _candle_cache]
+    if not missing or not M_Kline_Store.F_Is_Enabled(): return
+    stored = M_Kline_Store.F_Load_Many(missing, KLINE_LIMIT)
+    with _candle_cache_lock:
+        for key, candles in stored.items():
+            if len(candles['start_time']) < KLINE_LIMIT or key in _candle_cache: continue
+            # Fetched-at 0 keeps restored bundles stale until the gap has been requested
+            _candle_cache[key] = candles
+            _candle_fetched_at[key] = 0.0
+            _candle_cache_stats['restored'] += 1
+
+def _kline_params(p_symbol: str, p_period: str, p_cached: Optional[Dict[str, List[float]]]) -> Dict[str, Any]:
+    """
+    Builds get_kline arguments. With a warm cache only candles from the cached tail onwards are requested,
+    because the cached tail candle may still have been forming.
+    """
+    params = {"category": "linear", "symbol": p_symbol, "interval": p_period, "limit": KLINE_LIMIT}
+    if p_cached and p_cached['start_time']: params["start"] = p_cached['start_time'][-1]
+    return params
+
+def _store_candles(p_key: Tuple[str, str], p_cached: Optional[Dict[str, List[float]]],
+                   p_params: Dict[str, Any], p_kline_list: List[List[str]]) -> Dict[str, List[float]]:
+    """
+    Merges a kline response into the cache and returns the resulting bundle.
+    """
+    fresh = _build_candles(p_kline_list)
+    if "start" in p_params:
+        # A full page means the gap is at least as wide as the window, so the page replaces the cache
+        candles = fresh if len(p_kline_list) >= KLINE_LIMIT else _merge_candles(p_cached, fresh)
+        stat_key = 'incremental'
+    else:
+        candles = fresh
+        stat_key = 'warm_up'
+    with _candle_cache_lock:
+        _candle_cache[p_key] = candles
+        _candle_fetched_at[p_key] = L_Time.time()
+        _candle_cache_stats[stat_key] += 1
+        _candle_cache_stats['rows'] += len(p_kline_list)
+    M_Kline_Store.F_Append(p_key[0], p_key[1], fresh)
+    return candles
+
+def _merge_candles(p_cached: Dict[str, List[float]], p_fresh: Dict[str, List[float]]) -> Dict[str, List[float]]:
+    """
+    Appends fresh candles to the cached series. Cached candles starting at or after the first fresh
+    candle (the previously forming candle) are replaced by their updated values.
+    Returns new lists so that bundles handed out earlier are never mutated.
+    """
+    if not p_fresh['start_time']: return p_cached
+    first_start = p_fresh['start_time'][0]
+    keep = len(p_cached['start_time'])
+    while keep > 0 and p_cached['start_time'][keep - 1] >= first_start: keep -= 1
+    merged = {}
+    for column in KLINE_COLUMNS:
+        series = p_cached[column][:keep] + p_fresh[column]
+        merged[column] = series[-KLINE_LIMIT:]
+    return merged
+
+def F_Apply_Stream_Candle(p_symbol: str, p_period: str, p_candle: Dict[str, float]) -> bool:
+    # DESC: Merges one streamed candle (a dict keyed by KLINE_COLUMNS) into the cache.
+    # Returns False when the pair has not been warmed up over REST yet.
+    key = (p_symbol, p_period)
+    fresh = {column: [p_candle[column]] for column in KLINE_COLUMNS}
+    with _candle_cache_lock:
+        cached = _candle_cache.get(key)
+        if not cached or not cached['start_time']: return False
+        if p_candle['start_time'] < cached['start_time'][-1]: return True
+        _candle_cache[key] = _merge_candles(cached, fresh)
+        _candle_fetched_at[key] = L_Time.time()
+        _candle_cache_stats['streamed'] += 1
+    M_Kline_Store.F_Append(p_symbol, p_period, fresh)
+    return True
+
+def F_Evict_Candles(p_active_symbols: Iterable[str]) -> int:
+    # DESC: Drops cached candles of symbols that left the scan universe. Returns the number of evicted entries.
+    active = set(p_active_symbols)
+    with _candle_cache_lock:
+        stale = [key for key in _candle_cache if key[0] not in active]
+        for key in stale:
+            del _candle_cache[key]
+            _candle_fetched_at.pop(key, None)
+        _candle_cache_stats['evicted'] += len(stale)
+    return len(stale)
+
+def F_Drop_Candles(p_symbols: Iterable[str]) -> int:
+    # DESC: Drops cached candles of the given symbols (e.g. delisted instruments). Returns the number of evicted entries.
+    dropped = set(p_symbols)
+    with _candle_cache_lock:
+        stale = [key for key in _candle_cache if key[0] in dropped]
+        for key in stale:
+            del _candle_cache[key]
+            _candle_fetched_at.pop(key, None)
+        _candle_cache_stats['evicted'] += len(stale)
+    return len(stale)
+
+def F_Get_Candle_Cache_Stats() -> Dict[str, int]:
+    # DESC: Returns candle cache counters (warm-up vs incremental fetches, bundles restored from the kline store,
+    # parsed kline rows, evictions, cached keys).
+    with _candle_cache_lock:
+        stats = dict(_candle_cache_stats)
+        stats['cached_keys'] = len(_candle_cache)
+    return stats
+
+def F_Clear_Candle_Cache():
+    # DESC: Empties the candle cache and resets its counters.
+    with _candle_cache_lock:
+        _candle_cache.clear()
+        _candle_fetched_at.clear()
+        for key in _candle_cache_stats: _candle_cache_stats[key] = 0
+
+def _build_candles(p_kline_list: List[List[str]]) -> Dict[str, List[float]]:
+    """
+    Converts raw V5 kline rows into column series.
+    Row layout: [startTime, open, high, low, close, volume, turnover]
+    """
+    candles = {column: [] for column in KLINE_COLUMNS}
+    # Bybit V5 returns klines in reverse chronological order (newest first).
+    # Strategies expect Oldest -> Newest so that series[-1] is the CURRENT candle.
+    for item in reversed(p_kline_list):
+        candles['start_time'].append(int(item[0]))
+        for index, column in enumerate(KLINE_COLUMNS[1:], start=1):
+            candles[column].append(float(item[index]))
+    return candles
+
+def _fetch_kline_data(p_params: Dict[str, Any], p_deadline: Optional[float] = None) -> List[List[str]]:
+    """
+    Helper function to fetch the get_kline response (rows newest first) for the given get_kline arguments.
+    Raises the last error if the request still fails at the deadline.
+    """
+    session = _get_session()
+    return _call_until_deadline('F_Get_Kline', session.get_kline, p_deadline, **p_params)
 
 def F_Get_Volume(p_symbol: str) -> float:
     # DESC: Returns 24h trading volume for a symbol from Bybit. p_symbol: Trading pair (e.g., 'BTCUSDT').
+    # Served from the cycle ticker snapshot; a request is only sent for symbols missing from it.
+    ticker = F_Get_Ticker(p_symbol)
+    if ticker is not None: return ticker['turnover24h']
     try:
         session = _get_session()
-        response = session.get_tickers(category="linear", symbol=p_symbol)
-        tickers = response.get('result', {}).get('list', [])
+        response = _market_flight.do(('get_tickers', p_symbol), lambda: _handle_api_call(
+            session.get_tickers, p_deadline=L_Time.time() + REQUEST_DEADLINE, category="linear", symbol=p_symbol))
+        tickers = response.get('result', {}).get('list', []) if response else []
         if tickers:
             return float(tickers[0].get('turnover24h', 0))
         return 0.0
@@ -0,0 +1,57 @@
+# ----- HEADER --------------------------------------------------
+
+# File: candle_clock.py
+# Description: Candle boundaries of Bybit kline intervals (the values stored in the periods table).
+
+# ----- LIBRARY --------------------------------------------------
+
+import calendar as L_Calendar
+import time as L_Time
+from typing import Iterable, Optional
+
+# ----- VARIABLE --------------------------------------------------
+
+# Length of the fixed-size Bybit intervals in seconds ("M" follows the calendar)
+INTERVAL_SECONDS = {
+    '1': 60, '3': 180, '5': 300, '15': 900, '30': 1800, '60': 3600, '120': 7200, '240': 14400,
+    '360': 21600, '720': 43200, 'D': 86400, 'W': 604800,
+}
+
+# Weekly candles open on Monday 00:00 UTC; the epoch fell on a Thursday
+WEEK_OFFSET = 4 * 86400
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Get_Interval_Seconds(p_interval: str) -> Optional[int]:
+    # DESC: Returns the candle length of a Bybit interval in seconds (None for "M" and unknown intervals).
+    return INTERVAL_SECONDS.get(str(p_interval))
+
+def F_Get_Candle_Open(p_interval: str, p_now: Optional[float] = None) -> Optional[float]:
+    # DESC: Returns the open time (epoch seconds) of the candle forming at p_now, which is also the close time of
+    # the last closed candle. Returns None for intervals without known boundaries.
+    now = L_Time.time() if p_now is None else p_now
+    interval = str(p_interval)
+    if interval == 'M':
+        moment = L_Time.gmtime(now)
+        return float(L_Calendar.timegm((moment.tm_year, moment.tm_mon, 1, 0, 0, 0)))
+    step = INTERVAL_SECONDS.get(interval)
+    if step is None: return None
+    offset = WEEK_OFFSET if interval == 'W' else 0
+    return float((now - offset) // step * step + offset)
+
+def F_Get_Next_Close(p_interval: str, p_now: Optional[float] = None) -> Optional[float]:
+    # DESC: Returns the close time (epoch seconds) of the candle forming at p_now.
+    now = L_Time.time() if p_now is None else p_now
+    interval = str(p_interval)
+    if interval == 'M':
+        moment = L_Time.gmtime(now)
+        year, month = (moment.tm_year + 1, 1) if moment.tm_mon == 12 else (moment.tm_year, moment.tm_mon + 1)
+        return float(L_Calendar.timegm((year, month, 1, 0, 0, 0)))
+    candle_open = F_Get_Candle_Open(interval, now)
+    return None if candle_open is None else candle_open + INTERVAL_SECONDS[interval]
+
+def F_Get_Seconds_To_Close(p_intervals: Iterable[str], p_now: Optional[float] = None) -> Optional[float]:
+    # DESC: Returns the seconds until the next candle close among p_intervals (None if none has known boundaries).
+    now = L_Time.time() if p_now is None else p_now
+    closes = [close for close in (F_Get_Next_Close(interval, now) for interval in p_intervals) if close is not None]
+    return min(closes) - now if closes else None
@@ -0,0 +1,77 @@
+# ----- HEADER --------------------------------------------------
+
+# File: circuit_breaker.py
+# Description: Per-key circuit breaker that skips repeatedly failing market data requests for a cooldown.
+
+# ----- LIBRARY --------------------------------------------------
+
+import time as L_Time
+import threading as L_Thread
+from typing import Dict, Hashable, List
+
+# ----- CLASS --------------------------------------------------
+
+class C_Circuit_Breaker:
+    # DESC: Counts consecutive failures per key (e.g. a symbol). After p_threshold failures the circuit opens and
+    # allow() returns False for p_cooldown seconds. After the cooldown the circuit is half-open: exactly one caller
+    # is let through as a trial and the others are rejected until the trial is recorded; a failed trial opens the
+    # circuit again, any success closes it. A trial whose outcome is never recorded (e.g. it hit a rate limit that
+    # does not count as a failure) expires after p_trial_timeout seconds, and the next caller becomes the trial.
+    def __init__(self, p_threshold: int = 3, p_cooldown: float = 300.0, p_trial_timeout: float = 30.0):
+        self.threshold = p_threshold
+        self.cooldown = p_cooldown
+        self.trial_timeout = p_trial_timeout
+        self.opened = 0
+        self._failures: Dict[Hashable, int] = {}
+        self._open_until: Dict[Hashable, float] = {}
+        # Half-open keys and the monotonic time their trial expires
+        self._trial_until: Dict[Hashable, float] = {}
+        self._lock = L_Thread.Lock()
+
+    def allow(self, p_key: Hashable) -> bool:
+        # DESC: Returns False while the circuit of p_key is open, or half-open with a trial in flight.
+        with self._lock:
+            now = L_Time.monotonic()
+            trial_until = self._trial_until.get(p_key)
+            if trial_until is not None:
+                if now < trial_until: return False
+            else:
+                open_until = self._open_until.get(p_key)
+                if open_until is None: return True
+                if now < open_until: return False
+                del self._open_until[p_key]
+            # Half-open: this caller is the trial; a failure re-opens immediately because the count is at threshold
+            self._trial_until[p_key] = now + self.trial_timeout
+            return True
+
+    def record_success(self, p_key: Hashable):
+        # DESC: Closes the circuit of p_key.
+        with self._lock:
+            self._failures.pop(p_key, None)
+            self._open_until.pop(p_key, None)
+            self._trial_until.pop(p_key, None)
+
+    def record_failure(self, p_key: Hashable) -> bool:
+        # DESC: Counts a failure. Returns True when this failure opened the circuit.
+        with self._lock:
+            self._trial_until.pop(p_key, None)
+            failures = self._failures[p_key] = self._failures.get(p_key, 0) + 1
+            if failures < self.threshold or p_key in self._open_until: return False
+            self._open_until[p_key] = L_Time.monotonic() + self.cooldown
+            self.opened += 1
+            return True
+
+    def open_keys(self) -> List[Hashable]:
+        # DESC: Returns the keys whose circuit is currently open.
+        with self._lock:
+            now = L_Time.monotonic()
+            return sorted(key for key, open_until in self._open_until.items() if open_until > now)
+
+    def status(self) -> Dict[Hashable, Dict[str, float]]:
+        # DESC: Returns consecutive failures and remaining cooldown (seconds) of every failing key.
+        with self._lock:
+            now = L_Time.monotonic()
+            return {
+                key: {'failures': failures, 'cooldown': max(0.0, round(self._open_until.get(key, now) - now, 1))}
+                for key, failures in self._failures.items()
+            }
@@ -0,0 +1,97 @@
+# ----- HEADER --------------------------------------------------
+
+# File: concurrency.py
+# Description: AIMD controller that adapts the number of concurrent symbol scans to latency, errors and rate headroom.
+
+# ----- LIBRARY --------------------------------------------------
+
+import time as L_Time
+import threading as L_Thread
+from collections import deque as L_Deque
+from typing import Any, Dict, List, Optional
+
+# ----- VARIABLE --------------------------------------------------
+
+# Scans completed between two adjustments
+ADJUST_WINDOW = 20
+
+# Latency above this multiple of the baseline (and at least LATENCY_FLOOR seconds above it) counts as congestion.
+# The baseline is the best window latency, drifting up by BASELINE_DRIFT per window so that it follows slow changes.
+LATENCY_TOLERANCE = 2.0
+LATENCY_FLOOR = 0.05
+BASELINE_DRIFT = 1.1
+
+# Rate governor utilization above which the level is held instead of increased
+UTILIZATION_CEILING = 0.9
+
+# Adjustments kept for the status display
+HISTORY_SIZE = 50
+
+# ----- CLASS --------------------------------------------------
+
+class C_AIMD_Controller:
+    # DESC: Limits the number of in-flight symbol scans. Every ADJUST_WINDOW completed scans the limit is
+    # halved (multiplicative decrease) when the window saw 429s/timeouts or its latency rose above
+    # LATENCY_TOLERANCE x the latency baseline, held when the rate governor has no headroom left,
+    # and otherwise raised by one (additive increase).
+    def __init__(self, p_min: int = 1, p_max: int = 32, p_initial: int = 5, p_decrease: float = 0.5):
+        self.min = p_min
+        self.max = p_max
+        self.decrease = p_decrease
+        self.level = max(p_min, min(p_max, p_initial))
+        self.history = L_Deque(maxlen=HISTORY_SIZE)
+        self._in_flight = 0
+        self._latencies: List[float] = []
+        self._best_latency: Optional[float] = None
+        self._condition = L_Thread.Condition()
+
+    def acquire(self, p_stop_event: Optional[L_Thread.Event] = None) -> bool:
+        # DESC: Blocks until a scan may start. Returns False if p_stop_event was set while waiting.
+        with self._condition:
+            while self._in_flight >= self.level:
+                if p_stop_event is not None and p_stop_event.is_set(): return False
+                self._condition.wait(0.5)
+            self._in_flight += 1
+            return True
+
+    def release(self, p_latency: float) -> bool:
+        # DESC: Ends a scan that took p_latency seconds. Returns True when an adjustment window is complete;
+        # the caller then supplies the window's error count and rate headroom through adjust().
+        with self._condition:
+            self._in_flight -= 1
+            self._latencies.append(p_latency)
+            self._condition.notify()
+            return len(self._latencies) >= ADJUST_WINDOW
+
+    def adjust(self, p_errors: int, p_utilization: float) -> int:
+        # DESC: Applies one AIMD step from the completed window and returns the new level.
+        with self._condition:
+            if not self._latencies: return self.level
+            latencies = sorted(self._latencies)
+            self._latencies = []
+            latency = latencies[len(latencies) // 2]
+            baseline = self._best_latency
+            congested = (baseline is not None and latency > baseline * LATENCY_TOLERANCE
+                         and latency - baseline > LATENCY_FLOOR)
+            self._best_latency = latency if baseline is None else min(latency, baseline * BASELINE_DRIFT)
+            if p_errors:
+                level, reason = int(self.level * self.decrease), f"{p_errors} errors"
+            elif congested:
+                level, reason = int(self.level * self.decrease), f"latency {latency:.2f}s"
+            elif p_utilization >= UTILIZATION_CEILING:
+                level, reason = self.level, f"utilization {p_utilization:.0%}"
+            else:
+                level, reason = self.level + 1, "headroom"
+            level = max(self.min, min(self.max, level))
+            if level != self.level or not self.history or self.history[-1]['reason'] != reason:
+                self.history.append({'time': L_Time.strftime("%H:%M:%S"), 'level': level, 'reason': reason,
+                                     'latency': round(latency, 3)})
+            self.level = level
+            self._condition.notify_all()
+            return level
+
+    def status(self) -> Dict[str, Any]:
+        # DESC: Returns the current level, in-flight scans and the recent adjustments.
+        with self._condition:
+            return {'level': self.level, 'in_flight': self._in_flight, 'min': self.min, 'max': self.max,
+                    'history': list(self.history)}
@@ -0,0 +1,127 @@
+# ----- HEADER --------------------------------------------------
+
+# File: instrument_registry.py
+# Description: Cached Bybit instrument universe, persisted in SQLite and refreshed on a TTL with change detection.
+
+# ----- LIBRARY --------------------------------------------------
+
+import json as L_JSON
+import time as L_Time
+import threading as L_Thread
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from backend.core import config as M_Bybit
+from backend.core import database as DB
+from backend.logger import log_service as M_Log
+
+# ----- VARIABLE --------------------------------------------------
+
+# Default refresh interval (seconds); override with the instrument_ttl setting
+DEFAULT_TTL = 3600
+
+_instruments: Optional[Dict[str, Dict[str, Any]]] = None
+_refreshed_at = 0.0
+_lock = L_Thread.Lock()
+_refresh_thread: Optional[L_Thread.Thread] = None
+
+# Symbols added/removed since the last F_Pop_Changes call
+_pending_changes: Dict[str, Set[str]] = {'added': set(), 'removed': set()}
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Get_Instruments(p_fetch: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    # DESC: Returns the instrument list. The first call reads the persisted registry; an expired registry is served
+    # as-is while it refreshes in the background. The network (p_fetch) is only awaited when nothing is persisted.
+    global _refresh_thread
+    with _lock:
+        if _instruments is None: _load_persisted()
+        empty = not _instruments
+        expired = L_Time.time() - _refreshed_at >= _get_ttl()
+        start_background = expired and not empty and (_refresh_thread is None or not _refresh_thread.is_alive())
+        if start_background:
+            _refresh_thread = L_Thread.Thread(target=F_Refresh_Instruments, args=(p_fetch,),
+                                              name="InstrumentRefresh", daemon=True)
+            _refresh_thread.start()
+    if empty: F_Refresh_Instruments(p_fetch)
+    with _lock: return list(_instruments.values()) if _instruments else []
+
+def F_Refresh_Instruments(p_fetch: Callable[[], List[Dict[str, Any]]]) -> Optional[Dict[str, List[str]]]:
+    # DESC: Downloads the instrument list, persists it and returns the {'added': [...], 'removed': [...]} diff.
+    # Returns None (and keeps the current registry) when the download fails or comes back empty.
+    global _instruments, _refreshed_at
+    try:
+        fetched = p_fetch()
+    except Exception as e:
+        M_Log.F_Add_Log('alert', 'F_Refresh_Instruments', f"Instrument refresh failed: {e}")
+        return None
+    if not fetched: return None
+    latest = {item['symbol']: item for item in fetched if item.get('symbol')}
+    with _lock:
+        previous = _instruments or {}
+        added = sorted(set(latest) - set(previous))
+        removed = sorted(set(previous) - set(latest))
+        changed = [symbol for symbol in latest if symbol in previous and latest[symbol] != previous[symbol]]
+        _instruments, _refreshed_at = latest, L_Time.time()
+        # A symbol re-listed before the consumer saw its removal only needs a warm-up, and vice versa
+        _pending_changes['added'].update(added)
+        _pending_changes['removed'].difference_update(added)
+        _pending_changes['removed'].update(removed)
+        _pending_changes['added'].difference_update(removed)
+        refreshed_at = _refreshed_at
+    _persist(latest, added + changed, removed, refreshed_at)
+    if added or removed:
+        M_Log.F_Add_Log('transaction', 'InstrumentRegistry', f"Instruments changed | Added: {added} | Removed: {removed}")
+    return {'added': added, 'removed': removed}
+
+def F_Pop_Changes() -> Dict[str, List[str]]:
+    # DESC: Returns and clears the symbols added/removed since the previous call.
+    with _lock:
+        changes = {key: sorted(symbols) for key, symbols in _pending_changes.items()}
+        for symbols in _pending_changes.values(): symbols.clear()
+    return changes
+
+def F_Get_Registry_Age() -> Optional[float]:
+    # DESC: Returns the age of the registry in seconds (None if it was never refreshed).
+    with _lock: return L_Time.time() - _refreshed_at if _refreshed_at else None
+
+def _get_ttl() -> float:
+    """
+    Reads the instrument_ttl setting (seconds).
+    """
+    try: return float(M_Bybit.F_Get_Settings().get('instrument_ttl', DEFAULT_TTL))
+    except (TypeError, ValueError): return DEFAULT_TTL
+
+def _load_persisted():
+    """
+    Loads the registry saved by the previous run. Must be called with _lock held.
+    """
+    global _instruments, _refreshed_at
+    try:
+        conn = DB.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT symbol, data, updated_at FROM instruments")
+        rows = cursor.fetchall()
+        conn.close()
+    except Exception as e:
+        M_Log.F_Add_Log('error', 'InstrumentRegistry', f"Could not load persisted instruments: {e}")
+        rows = []
+    _instruments = {row['symbol']: L_JSON.loads(row['data']) for row in rows}
+    _refreshed_at = max((row['updated_at'] for row in rows), default=0.0)
+
+def _persist(p_instruments: Dict[str, Dict[str, Any]], p_upserts: List[str], p_removed: List[str], p_refreshed_at: float):
+    """
+    Writes new/changed instruments, deletes removed ones and stamps every row with the refresh time.
+    """
+    try:
+        conn = DB.get_connection()
+        cursor = conn.cursor()
+        cursor.executemany("DELETE FROM instruments WHERE symbol = ?", [(symbol,) for symbol in p_removed])
+        cursor.executemany(
+            "INSERT OR REPLACE INTO instruments (symbol, data, updated_at) VALUES (?, ?, ?)",
+            [(symbol, L_JSON.dumps(p_instruments[symbol]), p_refreshed_at) for symbol in p_upserts]
+        )
+        cursor.execute("UPDATE instruments SET updated_at = ?", (p_refreshed_at,))
+        conn.commit()
+        conn.close()
+    except Exception as e:
+        M_Log.F_Add_Log('error', 'InstrumentRegistry', f"Could not persist instruments: {e}")
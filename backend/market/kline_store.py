@@ -0,0 +1,164 @@
+# ----- HEADER --------------------------------------------------
+
+# File: kline_store.py
+# Description: Persistent SQLite candle store keyed by (symbol, interval, start) for warm restarts.
+
+# ----- LIBRARY --------------------------------------------------
+
+import atexit as L_Atexit
+import sqlite3 as L_SQLite
+import time as L_Time
+import threading as L_Thread
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.core import config as M_Bybit
+from backend.logger import log_service as M_Log
+
+# ----- VARIABLE --------------------------------------------------
+
+# Column order of a stored candle (matches bybit_service.KLINE_COLUMNS)
+STORE_COLUMNS = ('start_time', 'open', 'high', 'low', 'close', 'volume', 'turnover')
+
+# Pending candles are written once this many rows are buffered or the oldest buffered row is this old (seconds)
+FLUSH_ROWS = 5000
+FLUSH_INTERVAL = 30.0
+
+# Candles kept per (symbol, interval): the window bybit_service requests (KLINE_LIMIT). Older rows are deleted
+# after every flush, so the store does not grow with uptime.
+RETAIN_ROWS = 500
+
+_conn: Optional[L_SQLite.Connection] = None
+_path: Optional[str] = None
+_configured = False
+_lock = L_Thread.Lock()
+
+# Rows waiting to be written: (symbol, interval, start, open, high, low, close, volume, turnover)
+_pending: List[Tuple] = []
+_pending_since = 0.0
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Set_Path(p_path: Optional[str]):
+    # DESC: Opens the store at p_path (None disables it). Buffered candles of the previous store are written first.
+    global _path, _configured
+    F_Flush()
+    with _lock:
+        _close()
+        _path, _configured = p_path, True
+
+def F_Is_Enabled() -> bool:
+    # DESC: Returns True when a store path is configured.
+    with _lock: return _get_conn() is not None
+
+def F_Load_Many(p_keys: Iterable[Tuple[str, str]], p_limit: int) -> Dict[Tuple[str, str], Dict[str, List[float]]]:
+    # DESC: Returns the newest p_limit stored candles of every (symbol, interval) key as column series
+    # (Oldest -> Newest). Keys without stored candles are left out.
+    F_Flush()
+    result = {}
+    with _lock:
+        conn = _get_conn()
+        if conn is None: return result
+        try:
+            for symbol, interval in p_keys:
+                rows = conn.execute(
+                    "SELECT start, open, high, low, close, volume, turnover FROM klines "
+                    "WHERE symbol = ? AND interval = ? ORDER BY start DESC LIMIT ?", (symbol, interval, p_limit)
+                ).fetchall()
+                if rows: result[(symbol, interval)] = _to_series(reversed(rows))
+        except L_SQLite.Error as e:
+            M_Log.F_Add_Log('error', 'KlineStore', f"Could not load candles: {e}")
+    return result
+
+def F_Append(p_symbol: str, p_interval: str, p_candles: Dict[str, List[float]]):
+    # DESC: Buffers candles (column series) for writing. A candle that is already stored is replaced,
+    # so the forming candle is overwritten until it closes.
+    global _pending_since
+    if not p_candles['start_time']: return
+    rows = [(p_symbol, p_interval) + values for values in zip(*(p_candles[column] for column in STORE_COLUMNS))]
+    with _lock:
+        if _get_conn() is None: return
+        if not _pending: _pending_since = L_Time.monotonic()
+        _pending.extend(rows)
+        flush = len(_pending) >= FLUSH_ROWS or L_Time.monotonic() - _pending_since >= FLUSH_INTERVAL
+    if flush: F_Flush()
+
+def F_Flush() -> int:
+    # DESC: Writes buffered candles in one transaction and prunes the written keys to their newest RETAIN_ROWS
+    # candles. Returns the number of written rows.
+    global _pending
+    with _lock:
+        rows, _pending = _pending, []
+        conn = _get_conn() if rows else None
+        if conn is None: return 0
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO klines (symbol, interval, start, open, high, low, close, volume, turnover) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                _prune(conn, {row[:2] for row in rows}, RETAIN_ROWS)
+        except L_SQLite.Error as e:
+            M_Log.F_Add_Log('error', 'KlineStore', f"Could not write {len(rows)} candles: {e}")
+            return 0
+    return len(rows)
+
+def _prune(p_conn: L_SQLite.Connection, p_keys: Iterable[Tuple[str, str]], p_keep: int):
+    """
+    Deletes the candles of every (symbol, interval) key older than its newest p_keep. Must be called with _lock
+    held.
+    """
+    for symbol, interval in p_keys:
+        p_conn.execute(
+            "DELETE FROM klines WHERE symbol = ? AND interval = ? AND start < ("
+            "SELECT start FROM klines WHERE symbol = ? AND interval = ? ORDER BY start DESC LIMIT 1 OFFSET ?)",
+            (symbol, interval, symbol, interval, p_keep - 1)
+        )
+
+def _get_conn() -> Optional[L_SQLite.Connection]:
+    """
+    Opens the store on first use. Must be called with _lock held.
+    """
+    global _conn, _path, _configured
+    if not _configured:
+        _path, _configured = M_Bybit.F_Get_Kline_Store_Path(), True
+    if _conn is None and _path:
+        try:
+            _conn = L_SQLite.connect(_path, check_same_thread=False)
+            _conn.execute("PRAGMA journal_mode=WAL")
+            _conn.execute("PRAGMA synchronous=NORMAL")
+            _conn.execute('''
+                CREATE TABLE IF NOT EXISTS klines (
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    start INTEGER NOT NULL,
+                    open REAL, high REAL, low REAL, close REAL, volume REAL, turnover REAL,
+                    PRIMARY KEY (symbol, interval, start)
+                ) WITHOUT ROWID
+            ''')
+            _conn.commit()
+        except L_SQLite.Error as e:
+            M_Log.F_Add_Log('error', 'KlineStore', f"Could not open kline store {_path}: {e}")
+            _conn, _path = None, None
+    return _conn
+
+def _close():
+    """
+    Closes the connection. Must be called with _lock held.
+    """
+    global _conn
+    if _conn is not None: _conn.close()
+    _conn = None
+
+def _to_series(p_rows: Iterable[Tuple]) -> Dict[str, List[float]]:
+    """
+    Converts (start, open, high, low, close, volume, turnover) rows into column series.
+    """
+    candles = {column: [] for column in STORE_COLUMNS}
+    for row in p_rows:
+        candles['start_time'].append(int(row[0]))
+        for index, column in enumerate(STORE_COLUMNS[1:], start=1):
+            candles[column].append(float(row[index]))
+    return candles
+
+# Buffered candles are written when the process exits
+L_Atexit.register(F_Flush)
@@ -0,0 +1,200 @@
+# ----- HEADER --------------------------------------------------
+
+# File: kline_stream.py
+# Description: Bybit V5 public kline WebSocket subscriber with reconnect and REST gap backfill hooks.
+
+# ----- LIBRARY --------------------------------------------------
+
+import json as L_JSON
+import random as L_Random
+import asyncio as L_Asyncio
+import threading as L_Thread
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import aiohttp as L_Aiohttp
+
+from backend.logger import log_service as M_Log
+
+# ----- VARIABLE --------------------------------------------------
+
+BYBIT_STREAM_URL = "wss://stream.bybit.com/v5/public/linear"
+
+# Bybit asks for a ping every 20s and accepts at most 10 args per subscribe request
+PING_INTERVAL = 20
+SUBSCRIBE_BATCH = 10
+RECONNECT_DELAY_MIN = 1.0
+RECONNECT_DELAY_MAX = 60.0
+
+# ----- CLASS --------------------------------------------------
+
+class C_Kline_Stream:
+    # DESC: Keeps kline topics for a set of (symbol, interval) pairs subscribed on one WebSocket connection.
+    # on_candle(symbol, interval, candle) receives every update, on_close(symbol, interval) fires when a candle is
+    # confirmed, on_reconnect(pairs) runs after a reconnect so that missed candles can be backfilled over REST.
+    def __init__(
+            self,
+            p_on_candle: Callable[[str, str, Dict[str, float]], None],
+            p_on_close: Callable[[str, str], None],
+            p_on_reconnect: Optional[Callable[[List[Tuple[str, str]]], None]] = None,
+            p_url: str = BYBIT_STREAM_URL,
+            p_record_path: Optional[str] = None
+            ):
+        self.url = p_url
+        self.on_candle = p_on_candle
+        self.on_close = p_on_close
+        self.on_reconnect = p_on_reconnect
+        self.record_path = p_record_path
+        self.stats = {'connects': 0, 'messages': 0, 'closed_candles': 0, 'backfills': 0, 'bad_frames': 0}
+        self._pairs: Set[Tuple[str, str]] = set()
+        self._subscribed: Set[Tuple[str, str]] = set()
+        self._loop: Optional[L_Asyncio.AbstractEventLoop] = None
+        self._thread: Optional[L_Thread.Thread] = None
+        self._ws: Optional[L_Aiohttp.ClientWebSocketResponse] = None
+        self._stopping = False
+        # Set by stop() on the stream loop to cut the reconnect backoff short
+        self._wakeup: Optional[L_Asyncio.Event] = None
+
+    def start(self):
+        # DESC: Starts the connection loop on its own thread.
+        if self._thread: return
+        self._stopping = False
+        self._loop = L_Asyncio.new_event_loop()
+        self._wakeup = L_Asyncio.Event()
+        self._thread = L_Thread.Thread(target=self._run, name="KlineStream", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        # DESC: Closes the connection and stops the thread, waking it if it sleeps in the reconnect backoff.
+        # The state is only cleared once the thread has ended, so start() never runs a second stream thread.
+        self._stopping = True
+        loop, thread = self._loop, self._thread
+        if loop is None: return
+        try:
+            loop.call_soon_threadsafe(self._wakeup.set)
+            if self._ws is not None: L_Asyncio.run_coroutine_threadsafe(self._ws.close(), loop)
+        except RuntimeError: pass # the loop already closed because the thread ended
+        if thread: thread.join(timeout=10)
+        if thread and thread.is_alive():
+            M_Log.F_Add_Log('alert', 'KlineStream', "Stream thread did not stop within 10s.")
+            return
+        self._loop, self._thread = None, None
+
+    def is_alive(self) -> bool:
+        # DESC: Returns True while the connection thread runs (False before start() and after it died or stopped).
+        return self._thread is not None and self._thread.is_alive()
+
+    def set_pairs(self, p_pairs: Iterable[Tuple[str, str]]):
+        # DESC: Replaces the subscribed universe; only the difference is (un)subscribed on the live connection.
+        self._pairs = set(p_pairs)
+        if self._loop is not None: L_Asyncio.run_coroutine_threadsafe(self._sync_topics(), self._loop)
+
+    def _run(self):
+        L_Asyncio.set_event_loop(self._loop)
+        try: self._loop.run_until_complete(self._connect_loop())
+        finally: self._loop.close()
+
+    async def _connect_loop(self):
+        """
+        Connects, resubscribes and reads until stopped. Reconnects with jittered exponential backoff.
+        """
+        delay = RECONNECT_DELAY_MIN
+        async with L_Aiohttp.ClientSession() as http:
+            while not self._stopping:
+                try:
+                    async with http.ws_connect(self.url, heartbeat=None) as ws:
+                        self._ws, self._subscribed = ws, set()
+                        # stop() may have run while the connection was being opened
+                        if self._stopping: break
+                        self.stats['connects'] += 1
+                        delay = RECONNECT_DELAY_MIN
+                        await self._sync_topics()
+                        if self.stats['connects'] > 1: await self._backfill()
+                        await self._read(ws)
+                except (L_Aiohttp.ClientError, L_Asyncio.TimeoutError, ConnectionError) as e:
+                    M_Log.F_Add_Log('alert', 'KlineStream', f"Connection error: {e}")
+                except Exception as e:
+                    # Anything else (e.g. a failing backfill) must not end the thread; reconnect with backoff
+                    M_Log.F_Add_Log('error', 'KlineStream', f"Unexpected error: {e!r}")
+                finally:
+                    self._ws = None
+                if self._stopping: break
+                try: await L_Asyncio.wait_for(self._wakeup.wait(), delay * (1 + L_Random.random() * 0.2))
+                except L_Asyncio.TimeoutError: pass
+                delay = min(delay * 2, RECONNECT_DELAY_MAX)
+
+    async def _backfill(self):
+        """
+        Runs the REST backfill for every pair in a worker thread so that the socket keeps being read.
+        """
+        if not self.on_reconnect: return
+        self.stats['backfills'] += 1
+        pairs = sorted(self._pairs)
+        await self._loop.run_in_executor(None, self.on_reconnect, pairs)
+
+    async def _read(self, p_ws: L_Aiohttp.ClientWebSocketResponse):
+        ping_task = L_Asyncio.ensure_future(self._ping(p_ws))
+        try:
+            async for message in p_ws:
+                if message.type != L_Aiohttp.WSMsgType.TEXT: break
+                self._handle(message.data)
+        finally:
+            ping_task.cancel()
+
+    async def _ping(self, p_ws: L_Aiohttp.ClientWebSocketResponse):
+        while not p_ws.closed:
+            await L_Asyncio.sleep(PING_INTERVAL)
+            await p_ws.send_str(L_JSON.dumps({"op": "ping"}))
+
+    async def _sync_topics(self):
+        ws = self._ws
+        if ws is None or ws.closed: return
+        added = sorted(self._pairs - self._subscribed)
+        removed = sorted(self._subscribed - self._pairs)
+        for op, pairs in (("unsubscribe", removed), ("subscribe", added)):
+            for index in range(0, len(pairs), SUBSCRIBE_BATCH):
+                batch = pairs[index:index + SUBSCRIBE_BATCH]
+                await ws.send_str(L_JSON.dumps({"op": op, "args": [F_Get_Topic(s, i) for s, i in batch]}))
+        self._subscribed = set(self._pairs)
+
+    def _handle(self, p_raw: str):
+        """
+        Dispatches one frame. A malformed frame, or a callback failing on it, is logged and skipped so that the
+        stream keeps reading.
+        """
+        self.stats['messages'] += 1
+        try:
+            self._dispatch(p_raw)
+        except Exception as e:
+            self.stats['bad_frames'] += 1
+            M_Log.F_Add_Log('alert', 'KlineStream', f"Skipped frame ({e!r}): {p_raw[:200]}")
+
+    def _dispatch(self, p_raw: str):
+        """
+        Parses one frame and runs the callbacks. Control frames (subscribe/pong acknowledgements) are ignored.
+        """
+        if self.record_path:
+            with open(self.record_path, 'a', encoding='utf-8') as record: record.write(p_raw + "\n")
+        frame = L_JSON.loads(p_raw)
+        topic = frame.get('topic', '')
+        if not topic.startswith('kline.'): return
+        _, interval, symbol = topic.split('.', 2)
+        for item in frame.get('data', []):
+            candle = {
+                'start_time': int(item['start']),
+                'open': float(item['open']),
+                'high': float(item['high']),
+                'low': float(item['low']),
+                'close': float(item['close']),
+                'volume': float(item['volume']),
+                'turnover': float(item['turnover']),
+            }
+            self.on_candle(symbol, interval, candle)
+            if item.get('confirm'):
+                self.stats['closed_candles'] += 1
+                self.on_close(symbol, interval)
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Get_Topic(p_symbol: str, p_interval: str) -> str:
+    # DESC: Returns the public kline topic name (e.g. "kline.15.BTCUSDT").
+    return f"kline.{p_interval}.{p_symbol}"
@@ -0,0 +1,191 @@
+# ----- HEADER --------------------------------------------------
+
+# File: market_client.py
+# Description: Asyncio Bybit V5 market data client sharing one keep-alive connection pool.
+
+# ----- LIBRARY --------------------------------------------------
+
+import asyncio as L_Asyncio
+import time as L_Time
+import threading as L_Thread
+import concurrent.futures as L_Futures
+from typing import Dict, List, Optional, Any, Union, Callable
+
+import aiohttp as L_Aiohttp
+
+from backend.market.rate_limiter import C_Rate_Governor
+from backend.market.market_provider import C_Market_Provider
+
+# ----- VARIABLE --------------------------------------------------
+
+BYBIT_BASE_URL = "https://api.bybit.com"
+
+# HTTP/1.1 keep-alive pool size and the number of requests allowed to wait on it
+MAX_CONNECTIONS = 100
+MAX_IN_FLIGHT = 500
+REQUEST_TIMEOUT = 10
+
+# Bybit retCode returned when the API rate limit is breached
+RATE_LIMIT_RET_CODE = 10006
+
+# HTTP statuses Bybit uses for rate limit breaches (403 = IP limit)
+RATE_LIMIT_STATUSES = (403, 429)
+
+# pybit-compatible method names mapped to V5 public market endpoints
+ENDPOINTS = {
+    'get_instruments_info': "/v5/market/instruments-info",
+    'get_tickers': "/v5/market/tickers",
+    'get_kline': "/v5/market/kline",
+}
+
+# ----- CLASS --------------------------------------------------
+
+class C_Market_Error(Exception):
+    # DESC: HTTP or API level failure. The message keeps the HTTP status text (e.g. "429 Too Many Requests")
+    # so that callers matching on the error string keep working.
+    def __init__(self, p_message: str, p_status: Optional[int] = None, p_headers: Optional[Dict[str, str]] = None):
+        super().__init__(p_message)
+        self.status = p_status
+        self.headers = p_headers or {}
+
+class C_Market_Client(C_Market_Provider):
+    # DESC: Runs an aiohttp session on a private event loop thread. Blocking callers use the pybit-style
+    # get_* methods, bulk callers use map() to keep hundreds of requests in flight over the shared pool.
+    def __init__(
+            self,
+            p_base_url: str = BYBIT_BASE_URL,
+            p_max_connections: int = MAX_CONNECTIONS,
+            p_max_in_flight: int = MAX_IN_FLIGHT,
+            p_timeout: float = REQUEST_TIMEOUT,
+            p_governor: Optional[C_Rate_Governor] = None
+            ):
+        self.base_url = p_base_url.rstrip('/')
+        self.governor = p_governor
+        self.max_connections = p_max_connections
+        self.max_in_flight = p_max_in_flight
+        self.timeout = p_timeout
+        self._loop: Optional[L_Asyncio.AbstractEventLoop] = None
+        self._thread: Optional[L_Thread.Thread] = None
+        self._http: Optional[L_Aiohttp.ClientSession] = None
+        self._semaphore: Optional[L_Asyncio.Semaphore] = None
+        self._lock = L_Thread.Lock()
+
+    def _ensure_loop(self) -> L_Asyncio.AbstractEventLoop:
+        """
+        Starts the event loop thread and opens the HTTP session on first use.
+        """
+        with self._lock:
+            if self._loop is None:
+                loop = L_Asyncio.new_event_loop()
+                thread = L_Thread.Thread(target=loop.run_forever, name="MarketClientLoop", daemon=True)
+                thread.start()
+                L_Asyncio.run_coroutine_threadsafe(self._open(), loop).result()
+                self._loop, self._thread = loop, thread
+        return self._loop
+
+    async def _open(self):
+        """
+        Creates the pooled session. Must run on the client loop.
+        """
+        connector = L_Aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.max_connections,
+                                           keepalive_timeout=60, ttl_dns_cache=300)
+        self._http = L_Aiohttp.ClientSession(
+            connector=connector,
+            timeout=L_Aiohttp.ClientTimeout(total=self.timeout),
+            headers={"Accept": "application/json"}
+        )
+        self._semaphore = L_Asyncio.Semaphore(self.max_in_flight)
+
+    async def request(self, p_path: str, p_params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sends one GET request and returns the decoded V5 payload. Raises C_Market_Error on failure.
+        With a governor attached the request is paced before it is sent and its rate limit headers are fed back.
+        """
+        params = {key: str(value) for key, value in p_params.items() if value is not None}
+        endpoint_class = F_Get_Endpoint_Class(p_path)
+        async with self._semaphore:
+            if self.governor: await self.governor.acquire_async(endpoint_class)
+            try:
+                async with self._http.get(self.base_url + p_path, params=params) as response:
+                    headers = dict(response.headers)
+                    if response.status in RATE_LIMIT_STATUSES and self.governor:
+                        self.governor.penalize(endpoint_class, headers)
+                    if response.status != 200:
+                        raise C_Market_Error(f"{response.status} {response.reason} ({p_path})", response.status, headers)
+                    payload = await response.json(content_type=None)
+            except L_Asyncio.TimeoutError:
+                raise C_Market_Error(f"Request timeout after {self.timeout}s ({p_path})")
+            except L_Aiohttp.ClientError as e:
+                raise C_Market_Error(f"Connection error ({p_path}): {e}")
+        ret_code = payload.get('retCode', 0)
+        if ret_code == RATE_LIMIT_RET_CODE:
+            if self.governor: self.governor.penalize(endpoint_class, headers)
+            raise C_Market_Error(f"429 Too Many Requests ({p_path}): {payload.get('retMsg')}", 429, headers)
+        if self.governor: self.governor.observe(endpoint_class, headers)
+        if ret_code:
+            raise C_Market_Error(f"{payload.get('retMsg')} (ErrCode: {ret_code})", 200, headers)
+        return payload
+
+    async def _gather(self, p_path: str, p_params_list: List[Dict[str, Any]],
+                      p_limit: Optional[Callable[[], int]] = None, p_deadline: Optional[float] = None) -> List[Any]:
+        """
+        Runs the requests concurrently. With p_limit the requests in flight form a sliding window: the next request
+        starts as soon as one completes and the limit (read again each time) allows it, so a slow response never
+        holds back the others. Requests still waiting at p_deadline are not sent (None).
+        """
+        if p_limit is None and p_deadline is None:
+            return await L_Asyncio.gather(*(self.request(p_path, params) for params in p_params_list),
+                                          return_exceptions=True)
+        gate, in_flight = L_Asyncio.Condition(), [0]
+        async def limited(p_params):
+            async with gate:
+                if p_limit: await gate.wait_for(lambda: in_flight[0] < max(1, p_limit()))
+                if p_deadline is not None and L_Time.time() >= p_deadline: return None
+                in_flight[0] += 1
+            try: return await self.request(p_path, p_params)
+            finally:
+                async with gate:
+                    in_flight[0] -= 1
+                    gate.notify_all()
+        return await L_Asyncio.gather(*(limited(params) for params in p_params_list), return_exceptions=True)
+
+    def call(self, p_method: str, p_params: Dict[str, Any]) -> Dict[str, Any]:
+        # DESC: Blocking single request for a pybit-style method name.
+        loop = self._ensure_loop()
+        return L_Asyncio.run_coroutine_threadsafe(self.request(ENDPOINTS[p_method], p_params), loop).result()
+
+    def map(self, p_method: str, p_params_list: List[Dict[str, Any]], p_limit: Optional[Callable[[], int]] = None,
+            p_deadline: Optional[float] = None) -> List[Union[Dict[str, Any], Exception, None]]:
+        # DESC: Sends the requests concurrently (at most p_limit() in flight) and returns payloads (or exceptions)
+        # in input order; requests not started by p_deadline (epoch seconds) are skipped and returned as None.
+        if not p_params_list: return []
+        loop = self._ensure_loop()
+        gather = self._gather(ENDPOINTS[p_method], p_params_list, p_limit, p_deadline)
+        return L_Asyncio.run_coroutine_threadsafe(gather, loop).result()
+
+    def get_instruments_info(self, **kwargs) -> Dict[str, Any]:
+        return self.call('get_instruments_info', kwargs)
+
+    def get_tickers(self, **kwargs) -> Dict[str, Any]:
+        return self.call('get_tickers', kwargs)
+
+    def get_kline(self, **kwargs) -> Dict[str, Any]:
+        return self.call('get_kline', kwargs)
+
+    def close(self):
+        # DESC: Closes the connection pool and stops the loop thread.
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None: return
+        try: L_Asyncio.run_coroutine_threadsafe(self._http.close(), loop).result(timeout=5)
+        except (L_Futures.TimeoutError, RuntimeError): pass
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread: self._thread.join(timeout=5)
+        loop.close()
+        self._http, self._thread = None, None
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Get_Endpoint_Class(p_path: str) -> str:
+    # DESC: Returns the rate limit class of an endpoint path (e.g. "/v5/market/kline" -> "kline").
+    return p_path.rstrip('/').rsplit('/', 1)[-1]
@@ -0,0 +1,199 @@
+# ----- HEADER --------------------------------------------------
+
+# File: market_provider.py
+# Description: Pluggable market data providers: the provider interface, a recorder and an offline replay source.
+
+# ----- LIBRARY --------------------------------------------------
+
+import abc as L_ABC
+import gzip as L_Gzip
+import json as L_JSON
+import time as L_Time
+import threading as L_Thread
+import concurrent.futures as L_Futures
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# ----- VARIABLE --------------------------------------------------
+
+# Methods every provider serves (pybit / V5 names)
+PROVIDER_METHODS = ('get_instruments_info', 'get_tickers', 'get_kline')
+
+# Requests served concurrently by the replay provider's map() when latency is simulated
+REPLAY_CONCURRENCY = 100
+
+# ----- CLASS --------------------------------------------------
+
+class C_Market_Provider(L_ABC.ABC):
+    # DESC: Interface of a market data source used by bybit_service. Methods take the V5 query parameters as
+    # keyword arguments and return the raw V5 payload ({'retCode': 0, 'result': {'list': [...]}}).
+    @L_ABC.abstractmethod
+    def get_instruments_info(self, **kwargs) -> Dict[str, Any]:
+        pass
+
+    @L_ABC.abstractmethod
+    def get_tickers(self, **kwargs) -> Dict[str, Any]:
+        pass
+
+    @L_ABC.abstractmethod
+    def get_kline(self, **kwargs) -> Dict[str, Any]:
+        pass
+
+    def map(self, p_method: str, p_params_list: List[Dict[str, Any]], p_limit: Optional[Callable[[], int]] = None,
+            p_deadline: Optional[float] = None) -> List[Union[Dict[str, Any], Exception, None]]:
+        # DESC: Runs many requests of one method and returns payloads (or exceptions) in input order.
+        # p_limit returns the number of requests allowed in flight and is read again whenever one may start.
+        # Requests not started by p_deadline (epoch seconds) are skipped and returned as None.
+        # Providers that can overlap requests override this; the default runs them one after another.
+        results = []
+        for params in p_params_list:
+            if p_deadline is not None and L_Time.time() >= p_deadline:
+                results.append(None)
+                continue
+            try: results.append(getattr(self, p_method)(**params))
+            except Exception as e: results.append(e)
+        return results
+
+    def close(self):
+        # DESC: Releases provider resources.
+        pass
+
+class C_Recording_Provider(C_Market_Provider):
+    # DESC: Forwards every call to another provider and appends (method, params, response, elapsed) to a
+    # gzip-compressed JSON-lines file that C_Replay_Provider can serve later. Requests sent together by map() are
+    # not timed one by one: each carries the elapsed time of the whole map() and its size ("batch"), and the
+    # replay divides one by the other.
+    def __init__(self, p_inner: C_Market_Provider, p_path: str):
+        self.inner = p_inner
+        self.path = p_path
+        self._lock = L_Thread.Lock()
+        self._file = L_Gzip.open(p_path, 'at', encoding='utf-8')
+
+    def _record(self, p_method: str, p_params: Dict[str, Any], p_response: Dict[str, Any], p_elapsed: float,
+                p_batch: int = 1):
+        entry = {"method": p_method, "params": p_params, "response": p_response, "elapsed": round(p_elapsed, 4)}
+        if p_batch > 1: entry["batch"] = p_batch
+        line = L_JSON.dumps(entry)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def _call(self, p_method: str, p_params: Dict[str, Any]) -> Dict[str, Any]:
+        started = L_Time.perf_counter()
+        response = getattr(self.inner, p_method)(**p_params)
+        self._record(p_method, p_params, response, L_Time.perf_counter() - started)
+        return response
+
+    def get_instruments_info(self, **kwargs) -> Dict[str, Any]:
+        return self._call('get_instruments_info', kwargs)
+
+    def get_tickers(self, **kwargs) -> Dict[str, Any]:
+        return self._call('get_tickers', kwargs)
+
+    def get_kline(self, **kwargs) -> Dict[str, Any]:
+        return self._call('get_kline', kwargs)
+
+    def map(self, p_method: str, p_params_list: List[Dict[str, Any]], p_limit: Optional[Callable[[], int]] = None,
+            p_deadline: Optional[float] = None) -> List[Union[Dict[str, Any], Exception, None]]:
+        started = L_Time.perf_counter()
+        results = self.inner.map(p_method, p_params_list, p_limit, p_deadline)
+        elapsed = L_Time.perf_counter() - started
+        # Requests skipped at the deadline (None) were never sent
+        sent = sum(1 for response in results if response is not None)
+        for params, response in zip(p_params_list, results):
+            if isinstance(response, dict): self._record(p_method, params, response, elapsed, sent)
+        return results
+
+    def close(self):
+        with self._lock: self._file.close()
+        self.inner.close()
+
+class C_Replay_Provider(C_Market_Provider):
+    # DESC: Serves a recording without network access. Instrument and ticker responses are replayed in recorded
+    # order (the last one repeats); klines of every (symbol, interval) are merged into one candle table and sliced
+    # by the request's start/limit, so warm-up and incremental fetches both work.
+    # p_latency adds a fixed delay per request; p_latency_scale replays recorded latencies scaled by that factor.
+    def __init__(self, p_path: str, p_latency: float = 0.0, p_latency_scale: Optional[float] = None):
+        self.path = p_path
+        self.latency = p_latency
+        self.latency_scale = p_latency_scale
+        self.stats = {'served': 0, 'missing': 0}
+        self._responses: Dict[Tuple[str, Optional[str]], List[Tuple[Dict[str, Any], float]]] = {}
+        self._cursors: Dict[Tuple[str, Optional[str]], int] = {}
+        self._klines: Dict[Tuple[str, str], Dict[int, List[str]]] = {}
+        self._kline_elapsed: Dict[Tuple[str, str], float] = {}
+        self._lock = L_Thread.Lock()
+        self._load()
+
+    def _load(self):
+        with L_Gzip.open(self.path, 'rt', encoding='utf-8') as record:
+            for line in record:
+                if not line.strip(): continue
+                entry = L_JSON.loads(line)
+                method, params, response = entry['method'], entry['params'], entry['response']
+                # Per-request latency; requests recorded from one map() share its elapsed time
+                elapsed = entry.get('elapsed', 0.0) / entry.get('batch', 1)
+                if method == 'get_kline':
+                    key = (params['symbol'], str(params['interval']))
+                    table = self._klines.setdefault(key, {})
+                    for row in response.get('result', {}).get('list', []): table[int(row[0])] = row
+                    self._kline_elapsed[key] = elapsed
+                else:
+                    self._responses.setdefault((method, params.get('symbol')), []).append((response, elapsed))
+
+    def _delay(self, p_recorded: float):
+        delay = self.latency + (p_recorded * self.latency_scale if self.latency_scale else 0.0)
+        if delay > 0: L_Time.sleep(delay)
+
+    def _next_response(self, p_method: str, p_symbol: Optional[str]) -> Dict[str, Any]:
+        key = (p_method, p_symbol)
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                self.stats['missing'] += 1
+                return {'retCode': 0, 'result': {'list': []}}
+            index = self._cursors.get(key, 0)
+            self._cursors[key] = min(index + 1, len(responses) - 1)
+            self.stats['served'] += 1
+        response, elapsed = responses[index]
+        self._delay(elapsed)
+        return response
+
+    def get_instruments_info(self, **kwargs) -> Dict[str, Any]:
+        return self._next_response('get_instruments_info', kwargs.get('symbol'))
+
+    def get_tickers(self, **kwargs) -> Dict[str, Any]:
+        return self._next_response('get_tickers', kwargs.get('symbol'))
+
+    def get_kline(self, **kwargs) -> Dict[str, Any]:
+        key = (kwargs['symbol'], str(kwargs['interval']))
+        table = self._klines.get(key)
+        with self._lock: self.stats['served' if table else 'missing'] += 1
+        if not table: return {'retCode': 0, 'result': {'list': []}}
+        start = int(kwargs.get('start') or 0)
+        limit = int(kwargs.get('limit') or 200)
+        rows = [table[candle_start] for candle_start in sorted(table, reverse=True) if candle_start >= start][:limit]
+        self._delay(self._kline_elapsed.get(key, 0.0))
+        return {'retCode': 0, 'result': {'symbol': key[0], 'category': 'linear', 'list': rows}}
+
+    def map(self, p_method: str, p_params_list: List[Dict[str, Any]], p_limit: Optional[Callable[[], int]] = None,
+            p_deadline: Optional[float] = None) -> List[Union[Dict[str, Any], Exception, None]]:
+        # Overlap simulated latency the way the pooled live client overlaps network round-trips
+        if not (self.latency or self.latency_scale): return super().map(p_method, p_params_list, p_limit, p_deadline)
+        gate, in_flight = L_Thread.Condition(), [0]
+        def limited(p_params):
+            with gate:
+                gate.wait_for(lambda: in_flight[0] < max(1, p_limit()) if p_limit else True)
+                if p_deadline is not None and L_Time.time() >= p_deadline: return None
+                in_flight[0] += 1
+            try: return getattr(self, p_method)(**p_params)
+            finally:
+                with gate:
+                    in_flight[0] -= 1
+                    gate.notify_all()
+        with L_Futures.ThreadPoolExecutor(max_workers=REPLAY_CONCURRENCY) as executor:
+            futures = [executor.submit(limited, params) for params in p_params_list]
+        results = []
+        for future in futures:
+            try: results.append(future.result())
+            except Exception as e: results.append(e)
+        return results
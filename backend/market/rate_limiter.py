@@ -0,0 +1,176 @@
+# ----- HEADER --------------------------------------------------
+
+# File: rate_limiter.py
+# Description: Token-bucket rate governor that paces Bybit requests before they are sent.
+
+# ----- LIBRARY --------------------------------------------------
+
+import time as L_Time
+import asyncio as L_Asyncio
+import threading as L_Thread
+from collections import deque as L_Deque
+from typing import Dict, Optional, Tuple, Mapping
+
+# ----- VARIABLE --------------------------------------------------
+
+# Bybit V5 rate limit response headers
+HEADER_LIMIT = "X-Bapi-Limit"
+HEADER_REMAINING = "X-Bapi-Limit-Status"
+HEADER_RESET = "X-Bapi-Limit-Reset-Timestamp"
+
+# Window (seconds) used to measure the observed request rate
+UTILIZATION_WINDOW = 5.0
+
+# Pause applied after a 429 whose reset header is missing or already past
+DEFAULT_PENALTY = 1.0
+
+# ----- CLASS --------------------------------------------------
+
+class C_Token_Bucket:
+    # DESC: Token bucket with reservations. Tokens may go negative; the deficit is the caller's wait time,
+    # so concurrent callers queue up in order instead of all retrying at once.
+    def __init__(self, p_rate: float, p_capacity: float):
+        self.rate = float(p_rate)
+        self.capacity = float(p_capacity)
+        self.tokens = float(p_capacity)
+        self.updated = L_Time.monotonic()
+        self.blocked_until = 0.0
+        self.remaining: Optional[int] = None
+        self.throttled = 0
+        self._sent = L_Deque()
+
+    def _refill(self, p_now: float):
+        self.tokens = min(self.capacity, self.tokens + (p_now - self.updated) * self.rate)
+        self.updated = p_now
+
+    def reserve(self, p_now: float) -> float:
+        # DESC: Takes one token and returns the number of seconds the caller has to wait before sending.
+        self._refill(p_now)
+        self.tokens -= 1
+        wait = max(0.0, -self.tokens / self.rate)
+        if wait > 0: self.throttled += 1
+        return wait
+
+    def record(self, p_now: float, p_send_at: float):
+        # DESC: Remembers when a reserved request is actually sent (for utilization).
+        self._sent.append(p_send_at)
+        while self._sent[0] < p_now - UTILIZATION_WINDOW: self._sent.popleft()
+
+    def observe(self, p_limit: Optional[int], p_remaining: Optional[int], p_reset: Optional[float], p_target: float):
+        # DESC: Aligns the local bucket with the server-side quota reported in the response headers.
+        # p_limit is the quota of the window that ends p_reset seconds from now. Bybit documents per-second limits,
+        # whose reset is at most one second ahead; a reset further ahead means a longer window, and the quota is
+        # spread over the time left in it. Either way burst plus refill until the reset stays within p_limit.
+        now = L_Time.monotonic()
+        self._refill(now)
+        if p_limit:
+            window = max(1.0, p_reset or 0.0)
+            self.rate = max(1.0, p_limit * p_target / window)
+            self.capacity = max(1.0, p_limit * (1 - p_target))
+        if p_remaining is not None:
+            self.remaining = p_remaining
+            # Keep (1 - target) of the server quota as headroom
+            reserve = p_limit * (1 - p_target) if p_limit else 0
+            self.tokens = min(self.tokens, p_remaining - reserve)
+            if p_remaining <= reserve and p_reset is not None: self._defer(now, p_reset)
+
+    def block(self, p_seconds: float):
+        # DESC: Stops handing out tokens for the given number of seconds (used after a 429).
+        now = L_Time.monotonic()
+        self._refill(now)
+        self._defer(now, p_seconds)
+
+    def _defer(self, p_now: float, p_seconds: float):
+        """
+        Puts the bucket p_seconds worth of tokens into debt, so queued callers resume at the paced rate
+        once the pause is over instead of all at once.
+        """
+        self.blocked_until = max(self.blocked_until, p_now + p_seconds)
+        self.tokens = min(self.tokens, -p_seconds * self.rate)
+
+    def utilization(self, p_now: float) -> float:
+        # DESC: Observed request rate over the last window as a fraction of the paced rate.
+        while self._sent and self._sent[0] < p_now - UTILIZATION_WINDOW: self._sent.popleft()
+        sent = sum(1 for sent_at in self._sent if sent_at <= p_now)
+        return sent / (UTILIZATION_WINDOW * self.rate)
+
+class C_Rate_Governor:
+    # DESC: Process-wide pacing for Bybit requests. Every request reserves a token from its endpoint class budget
+    # and from the shared IP budget; response headers and 429s tighten the budgets before the next request.
+    def __init__(self, p_budgets: Mapping[str, Tuple[float, float]], p_shared: Tuple[float, float], p_target: float = 0.95):
+        self.target = p_target
+        # Budgets are (requests per second, burst); only target of each is handed out
+        self._buckets = {name: C_Token_Bucket(rate * p_target, burst * p_target) for name, (rate, burst) in p_budgets.items()}
+        self._shared = C_Token_Bucket(p_shared[0] * p_target, p_shared[1] * p_target)
+        self._lock = L_Thread.Lock()
+
+    def _bucket(self, p_class: str) -> C_Token_Bucket:
+        bucket = self._buckets.get(p_class)
+        if bucket is None:
+            shared_rate = self._shared.rate
+            bucket = self._buckets[p_class] = C_Token_Bucket(shared_rate, self._shared.capacity)
+        return bucket
+
+    def reserve(self, p_class: str) -> float:
+        # DESC: Reserves one request for the endpoint class and returns the required delay in seconds.
+        with self._lock:
+            now = L_Time.monotonic()
+            bucket = self._bucket(p_class)
+            wait = max(bucket.reserve(now), self._shared.reserve(now))
+            bucket.record(now, now + wait)
+            self._shared.record(now, now + wait)
+            return wait
+
+    def acquire(self, p_class: str):
+        # DESC: Blocking variant for worker threads.
+        wait = self.reserve(p_class)
+        if wait > 0: L_Time.sleep(wait)
+
+    async def acquire_async(self, p_class: str):
+        # DESC: Awaitable variant for the asyncio market client.
+        wait = self.reserve(p_class)
+        if wait > 0: await L_Asyncio.sleep(wait)
+
+    def observe(self, p_class: str, p_headers: Mapping[str, str]):
+        # DESC: Reads the remaining-quota and reset headers of a response.
+        limit, remaining, reset = _parse_headers(p_headers)
+        if limit is None and remaining is None: return
+        with self._lock: self._bucket(p_class).observe(limit, remaining, reset, self.target)
+
+    def penalize(self, p_class: str, p_headers: Optional[Mapping[str, str]] = None):
+        # DESC: Pauses the endpoint class after a 429 until the reported reset time, or for DEFAULT_PENALTY when
+        # the response carries no reset in the future.
+        _, _, reset = _parse_headers(p_headers or {})
+        with self._lock: self._bucket(p_class).block(reset if reset else DEFAULT_PENALTY)
+
+    def status(self) -> Dict[str, Dict[str, float]]:
+        # DESC: Returns per-class utilization (fraction of the server quota), paced rate, remaining quota and throttle count.
+        with self._lock:
+            now = L_Time.monotonic()
+            buckets = dict(self._buckets, shared=self._shared)
+            return {
+                name: {
+                    'utilization': round(bucket.utilization(now) * self.target, 3),
+                    'rate': round(bucket.rate, 2),
+                    'remaining': bucket.remaining,
+                    'throttled': bucket.throttled,
+                    'blocked': max(0.0, round(bucket.blocked_until - now, 2)),
+                }
+                for name, bucket in buckets.items()
+            }
+
+# ----- FUNCTION --------------------------------------------------
+
+def _parse_headers(p_headers: Mapping[str, str]) -> Tuple[Optional[int], Optional[int], Optional[float]]:
+    """
+    Extracts (limit, remaining, seconds until reset) from Bybit response headers. Missing values are None.
+    """
+    headers = {key.lower(): value for key, value in p_headers.items()}
+    def _int(p_name):
+        try: return int(headers[p_name.lower()])
+        except (KeyError, ValueError): return None
+    limit = _int(HEADER_LIMIT)
+    remaining = _int(HEADER_REMAINING)
+    reset_ms = _int(HEADER_RESET)
+    reset = max(0.0, reset_ms / 1000 - L_Time.time()) if reset_ms is not None else None
+    return limit, remaining, reset
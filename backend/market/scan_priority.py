@@ -0,0 +1,94 @@
+# ----- HEADER --------------------------------------------------
+
+# File: scan_priority.py
+# Description: Orders the scan universe so liquid and active markets are evaluated first.
+
+# ----- LIBRARY --------------------------------------------------
+
+import math as L_Math
+import time as L_Time
+import threading as L_Thread
+from typing import Any, Dict, List, Optional
+
+# ----- VARIABLE --------------------------------------------------
+
+# Score weights: 24h turnover rank, recent range expansion rank and recent signals
+TURNOVER_WEIGHT = 0.5
+RANGE_WEIGHT = 0.3
+SIGNAL_WEIGHT = 0.2
+
+# Closed candles averaged as the reference range, and the last closed candles compared against it
+RANGE_LOOKBACK = 20
+RANGE_RECENT = 3
+
+# Signal boost halves every SIGNAL_HALF_LIFE seconds
+SIGNAL_HALF_LIFE = 6 * 3600
+
+# ----- CLASS --------------------------------------------------
+
+class C_Scan_Priority:
+    # DESC: Scores symbols by 24h turnover, recent range expansion (mean range of the last RANGE_RECENT closed
+    # candles over the mean of the RANGE_LOOKBACK before them) and how recently they produced a signal.
+    # Turnover and range expansion enter as percentile ranks within the universe, so the score lies in [0, 1].
+    def __init__(self):
+        self._range_expansion: Dict[str, Dict[str, float]] = {}
+        self._last_signal: Dict[str, float] = {}
+        self._lock = L_Thread.Lock()
+
+    def record_candles(self, p_symbol: str, p_period: str, p_candles: Dict[str, List[float]]):
+        # DESC: Updates the range expansion of a symbol/period from its candle bundle (the forming candle is ignored).
+        highs, lows = p_candles.get('high') or [], p_candles.get('low') or []
+        if len(highs) < RANGE_LOOKBACK + RANGE_RECENT + 1: return
+        ranges = [high - low for high, low in zip(highs[-RANGE_LOOKBACK - RANGE_RECENT - 1:-1],
+                                                  lows[-RANGE_LOOKBACK - RANGE_RECENT - 1:-1])]
+        reference = sum(ranges[:RANGE_LOOKBACK]) / RANGE_LOOKBACK
+        if reference <= 0: return
+        expansion = sum(ranges[RANGE_LOOKBACK:]) / RANGE_RECENT / reference
+        with self._lock: self._range_expansion.setdefault(p_symbol, {})[p_period] = expansion
+
+    def record_signal(self, p_symbol: str, p_time: Optional[float] = None):
+        # DESC: Marks that p_symbol produced a signal.
+        with self._lock: self._last_signal[p_symbol] = L_Time.time() if p_time is None else p_time
+
+    def order(self, p_symbols: List[Dict[str, Any]], p_now: Optional[float] = None) -> List[Dict[str, Any]]:
+        # DESC: Returns the symbol dicts (with 'symbol' and 'volume' = 24h turnover) sorted by descending score.
+        now = L_Time.time() if p_now is None else p_now
+        with self._lock:
+            expansions = {symbol: max(periods.values()) for symbol, periods in self._range_expansion.items()}
+            last_signal = dict(self._last_signal)
+        turnover_rank = _percentile_ranks({data['symbol']: data.get('volume', 0) for data in p_symbols})
+        range_rank = _percentile_ranks({data['symbol']: expansions.get(data['symbol'], 0.0) for data in p_symbols})
+        def score(data):
+            symbol = data['symbol']
+            signal = last_signal.get(symbol)
+            boost = L_Math.pow(0.5, (now - signal) / SIGNAL_HALF_LIFE) if signal is not None else 0.0
+            return TURNOVER_WEIGHT * turnover_rank[symbol] + RANGE_WEIGHT * range_rank[symbol] + SIGNAL_WEIGHT * boost
+        return sorted(p_symbols, key=score, reverse=True)
+
+    def evict(self, p_active_symbols) -> int:
+        # DESC: Forgets symbols that left the scan universe. Returns the number of forgotten symbols.
+        active = set(p_active_symbols)
+        with self._lock:
+            stale = [symbol for symbol in self._range_expansion if symbol not in active]
+            for symbol in stale: del self._range_expansion[symbol]
+            for symbol in [symbol for symbol in self._last_signal if symbol not in active]: del self._last_signal[symbol]
+            return len(stale)
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Select_Cycle_Symbols(p_ordered: List[Dict[str, Any]], p_head_size: int, p_tail_every: int,
+                           p_cycle: int) -> List[Dict[str, Any]]:
+    # DESC: Returns the symbols to scan in cycle p_cycle: the p_head_size best-scored symbols always, the tail
+    # behind them only every p_tail_every cycles (head size 0 or tail_every <= 1 scans everything every cycle).
+    if not p_head_size or p_tail_every <= 1 or p_cycle % p_tail_every == 0: return p_ordered
+    return p_ordered[:p_head_size]
+
+def _percentile_ranks(p_values: Dict[str, float]) -> Dict[str, float]:
+    """
+    Maps every key to the rank of its value in [0, 1] (ties share the lower rank).
+    """
+    if len(p_values) < 2: return {key: 1.0 for key in p_values}
+    ordered = sorted(p_values.values())
+    positions, last = {}, len(ordered) - 1
+    for position, value in enumerate(ordered): positions.setdefault(value, position)
+    return {key: positions[value] / last for key, value in p_values.items()}
@@ -7,11 +7,22 @@
 
 import threading as L_Thread
 import time as L_Time
+import queue as L_Queue
 import concurrent.futures as L_Futures
+from concurrent.futures.process import BrokenProcessPool
 
 from backend.market import bybit_service as S_Bybit
+from backend.market import instrument_registry as M_Instruments
+from backend.market.kline_stream import C_Kline_Stream
+from backend.market.concurrency import C_AIMD_Controller
+from backend.market import candle_clock as M_Candle_Clock
+from backend.market import scan_priority as M_Scan_Priority
+from backend.trade import evaluation_cache as M_Evaluation_Cache
+from backend.trade import zigzag_stream as M_ZigZag_Stream
+from backend.trade import signal_batch as M_Signal_Batch
+from backend.trade import strategy_pool as M_Strategy_Pool
+from backend.trade import strategy_registry as M_Strategy_Registry
 from backend.trade import signal_logic as S_Strategy
-from backend.notification import telegram_service as S_Telegram
 from backend.trade.signal_queue import Signal_Que as S_Signal_Que
 
 from backend.core import config as M_Bybit
@@ -24,6 +35,12 @@ _scanner_thread = None
 _scanner_stop_event = None
 _scanner_status = "stopped" # possible states: stopped, running, waiting, starting, stopping
 
+# Streaming mode (scan_mode = "stream"): live kline subscription and the queue of closed (symbol, interval) candles
+_kline_stream = None
+_closed_candle_que = L_Queue.Queue()
+# Pairs the stream keeps current; only pairs outside this set are warmed up over REST
+_stream_pairs = set()
+
 # Scanner status information
 _scanner_stats = {
     'total_symbols': 0,
@@ -34,9 +51,63 @@ _scanner_stats = {
     'last_signal_time': None,
     'current_price': '-',
     'last_zigzag_level': '-',
-    'last_fibo_level': '-'
+    'last_fibo_level': '-',
+    'budget_skipped': 0,
+    'cycle_count': 0,
+    'last_cycle_time': None
 }
 
+# Worker threads used to evaluate symbols. The number of concurrent scans adapts between MIN_WORKERS and
+# MAX_WORKERS (starting at INITIAL_WORKERS) to scan latency, 429/timeout errors and rate limit headroom.
+# The same level bounds the kline requests a prefetch keeps in flight.
+MIN_WORKERS = 1
+MAX_WORKERS = 32
+INITIAL_WORKERS = 5
+_concurrency = C_AIMD_Controller(MIN_WORKERS, MAX_WORKERS, INITIAL_WORKERS)
+_concurrency_errors = 0
+_concurrency_lock = L_Thread.Lock()
+
+# Polling schedule (scan_schedule setting): "candle" evaluates a (symbol, interval) pair once per closed candle and
+# sleeps until the next candle close (wait_time only caps the sleep, so new listings are still picked up);
+# "interval" rescans every pair and sleeps wait_time between cycles.
+DEFAULT_SCAN_SCHEDULE = "candle"
+
+# Seconds after a candle close before its pairs are evaluated, so Bybit has finalized the closed candle
+CLOSE_SETTLE = 2
+MIN_WAKE_INTERVAL = 1
+
+# Open time of the forming candle of the bundle each (symbol, interval) pair was last evaluated on (candle schedule)
+_evaluated_candles = {}
+_evaluated_lock = L_Thread.Lock()
+
+# Strategy results per (symbol, interval, zigzag_period, strategy name), reused until a new candle closes
+_evaluation_cache = M_Evaluation_Cache.C_Evaluation_Cache()
+
+# strategy_backend value that keeps a ZigZag state per pair and only confirms the pivots of newly closed candles
+# (zigzag_stream.py); the other values select a signal_logic backend
+INCREMENTAL_BACKEND = "incremental"
+
+# strategy_backend value that evaluates the pivots of all pairs of a polling cycle in vectorized cross-symbol passes
+# (signal_batch.py) before the workers run; the workers pick the prepared contexts up by (symbol, period)
+BATCH_BACKEND = "batch"
+_batch_contexts = {}
+_batch_lock = L_Thread.Lock()
+
+# strategy_processes setting: worker processes that run the strategy math of the signal_logic backends
+# (strategy_pool.py); 0 (the default) evaluates in the scanner's worker threads. Enable the pool only on multi-core
+# hosts where backend/benchmark/process_pool.py shows a gain over the threads.
+DEFAULT_STRATEGY_PROCESSES = 0
+
+# Scan order: symbols are submitted by priority score (turnover, range expansion, recent signals). The
+# priority_head best symbols are scanned every polling cycle, the tail behind them every tail_scan_every cycles.
+PRIORITY_HEAD = 50
+TAIL_SCAN_EVERY = 1
+_scan_priority = M_Scan_Priority.C_Scan_Priority()
+
+# Default time budget of one polling cycle (seconds); symbols not reached in time wait for the next cycle.
+# Override with the cycle_budget setting (0 disables the budget).
+CYCLE_BUDGET = 300
+
 # Callback to clear the Recent Activities table
 _activity_table_clear_callback = None
 def set_activity_table_clear_callback(cb):
@@ -46,176 +117,237 @@ def set_activity_table_clear_callback(cb):
 # ----- FUCNTION --------------------------------------------------
 
 def F_Get_Price(symbol):
-    # DESC: Gets the current price of the symbol
+    # DESC: Gets the current price of the symbol from the cycle ticker snapshot (1m kline only as a fallback)
     try:
+        ticker = S_Bybit.F_Get_Ticker(symbol)
+        if ticker and ticker['last_price'] > 0: return f"{ticker['last_price']:.8f}"
         closes = S_Bybit.F_Get_Close(symbol, "1")
         if closes and len(closes) > 0: return f"{closes[-1]:.8f}"
         return "-"
     except: return "-"
 
-def F_Get_Zigzag(closes, highs, lows, zigzag_period):
-    # DESC: Calculates the last ZigZag level
-    try:
-        zigzag = S_Strategy.F_Get_ZigZag_Periodic(closes, zigzag_period)
-        if zigzag and len(zigzag) > 0: return f"{zigzag[-1]:.8f}"
-        return "-"
-    except: return "-"
-
-def F_Scan(symbol_data, periods_to_scan, zigzag_period):
+def F_Scan(symbol_data, periods_to_scan, zigzag_period, cycle_started=None, deadline=None):
     symbol = symbol_data['symbol']
     global _scanner_stats
     
+    # Past the cycle budget the remaining symbols are left for the next cycle
+    if deadline is not None and L_Time.time() >= deadline:
+        _scanner_stats['budget_skipped'] += 1
+        return
+
     # NOTE: Incrementing shared counter is not thread-safe without lock, but strict accuracy isn't critical here.
     # For better thread safety, we should use a lock, but keeping it simple for now to match performance requirements.
     _scanner_stats['scanned_symbols'] += 1
     
     for period in periods_to_scan:
-        if _scanner_stop_event.is_set(): break
-        _scanner_stats['current_symbol'] = symbol
-        _scanner_stats['current_period'] = period
+        if _scanner_stop_event is not None and _scanner_stop_event.is_set(): break
+        F_Scan_Period(symbol, period, zigzag_period, cycle_started, deadline)
+
+def F_Scan_Period(symbol, period, zigzag_period, fresh_since=None, deadline=None):
+    # DESC: Evaluates the strategy for one symbol/period and emits LONG/SHORT signals.
+    # fresh_since: candles refreshed at or after this epoch time are taken from the cache without a request.
+    # deadline: epoch time after which a kline request is given up (the symbol is then treated as "no data").
+    global _scanner_stats
+    _scanner_stats['current_symbol'] = symbol
+    _scanner_stats['current_period'] = period
+
+    # One kline request per symbol/period; close/high/low come from the same candle bundle
+    candles = S_Bybit.F_Get_Candles(symbol, period, p_fresh_since=fresh_since, p_deadline=deadline)
+    closes = candles.get('close')
+    highs = candles.get('high')
+    lows = candles.get('low')
+
+    # Without data the pair is not evaluated, so the candle schedule retries it at the next wake-up
+    if closes is None or highs is None or lows is None or not (closes and highs and lows): return
+
+    # Every strategy of the interval runs over this one bundle and one shared analysis context
+    strategies = M_Strategy_Registry.F_Get_Strategies(period)
+    evaluations = _evaluate(symbol, period, zigzag_period, candles, strategies)
+    _record_evaluation(symbol, period, candles)
+    _scan_priority.record_candles(symbol, period, candles)
+    _scanner_stats['current_price'] = F_Get_Price(symbol)
+    levels = [evaluation for evaluation in evaluations if 'zigzag_level' in evaluation]
+    _scanner_stats['last_zigzag_level'] = levels[0]['zigzag_level'] if levels else '-'
+    _scanner_stats['last_fibo_level'] = levels[0].get('fibo_levels', '-') if levels else '-'
+
+    for strategy, evaluation in zip(strategies, evaluations): _emit_signals(symbol, period, strategy, evaluation)
+
+def _emit_signals(p_symbol, p_period, p_strategy, p_evaluation):
+    """
+    Logs, notifies and queues the LONG/SHORT signals of one strategy result. Signals without Fibonacci
+    stop loss / take profit levels are not emitted.
+    """
+    long_signal = p_evaluation.get('long_signal', {})
+    short_signal = p_evaluation.get('short_signal', {})
+
+    # --- LONG SIGNAL ---
+    if long_signal.get("signal") == "long":
+        fibo_levels = p_evaluation.get('fibo_levels', {})
+        stop_loss = fibo_levels.get('1.272', 0) if fibo_levels else 0
+        take_profit = fibo_levels.get('1.0', 0) if fibo_levels else 0
+        fibo3 = fibo_levels.get('0.382', '-') if fibo_levels else '-'
+        fibo4 = fibo_levels.get('0.5', '-') if fibo_levels else '-'
+        fibo5 = fibo_levels.get('0.618', '-') if fibo_levels else '-'
+        volume = S_Bybit.F_Get_Volume(p_symbol)
         
-        # Optimize: Fetch data for all periods in parallel or batch if possible in future
-        closes = S_Bybit.F_Get_Close(symbol, period)
-        highs = S_Bybit.F_Get_High(symbol, period)
-        lows = S_Bybit.F_Get_Low(symbol, period)
+        if stop_loss == 0 or take_profit == 0: return
         
-        if closes is None or highs is None or lows is None or not (closes and highs and lows):
-            signal_data = {
-                "symbol": symbol,
-                "volume": '-',
-                "period": period,
-                "price": '-',
-                "pattern": 'no data',
-                "fib_0_0": '-',
-                "fib_0_01": '-',
-                "fib_0_236": '-',
-                "fib_0_382": '-',
-                "fib_1_0": '-'
-            }
-            # Only put empty signals if needed for debugging, excessive queue usage can clog UI
-            # S_Signal_Que.put(signal_data) 
-            continue
-
-        _scanner_stats['current_price'] = F_Get_Price(symbol)
-        _scanner_stats['last_zigzag_level'] = F_Get_Zigzag(closes, highs, lows, zigzag_period)
-        _scanner_stats['last_fibo_level'] = S_Strategy.F_Get_Fibonacci(closes, highs, lows)
+        _scanner_stats['found_signals'] += 1
+        _scanner_stats['last_signal_time'] = L_Time.strftime("%H:%M:%S")
+        _scan_priority.record_signal(p_symbol)
+        log_message = (f"LONG SIGNAL | Symbol: {p_symbol} | Period: {p_period} | "
+                     f"Price: {_scanner_stats['current_price']} | Stop Loss: {stop_loss:.8f} | "
+                     f"Take Profit: {take_profit:.8f}")
+
+        M_Log.F_Add_Log('transaction', 'LongSignal', log_message)
+        telegram_message = f"🟢 LONG SIGNAL\n\n" \
+            f"Symbol: {p_symbol}\n" \
+            f"Period: {p_period}\n" \
+            f"Price: {_scanner_stats['current_price']}"
+
+        _notify_users(telegram_message)
+
+        # --- Add signal to GUI queue ---
+        signal_data = {
+            "time": L_Time.strftime("%H:%M:%S"),
+            "symbol": p_symbol,
+            "period": p_period,
+            "direction": "LONG",
+            "price": _scanner_stats['current_price'],
+            "volume": volume,
+            "stop_loss": stop_loss,
+            "take_profit": take_profit,
+            "fibo3": fibo3,
+            "fibo4": fibo4,
+            "fibo5": fibo5,
+            "pattern": p_strategy.patterns.get('long', p_strategy.name),
+            "fib_0_0": fibo_levels.get('0.0', '-'),
+            "fib_0_01": fibo_levels.get('0.01', '-'),
+            "fib_0_236": fibo_levels.get('0.236', '-'),
+            "fib_0_382": fibo_levels.get('0.382', '-'),
+            "fib_1_0": fibo_levels.get('1.0', '-')
+        }
+
+        S_Signal_Que.put(signal_data)
+
+
+    # --- SHORT SIGNAL ---
+    if short_signal.get("signal") == "short":
+        fibo_levels = p_evaluation.get('fibo_levels', {})
+        stop_loss = fibo_levels.get('1.272', 0) if fibo_levels else 0
+        take_profit = fibo_levels.get('1.0', 0) if fibo_levels else 0
+        fibo3 = fibo_levels.get('0.382', '-') if fibo_levels else '-'
+        fibo4 = fibo_levels.get('0.5', '-') if fibo_levels else '-'
+        fibo5 = fibo_levels.get('0.618', '-') if fibo_levels else '-'
+        volume = S_Bybit.F_Get_Volume(p_symbol)
         
-        long_signal = S_Strategy.F_Get_Long_Signal(closes, highs, lows, zigzag_period)
-        short_signal = S_Strategy.F_Get_Short_Signal(closes, highs, lows, zigzag_period)
+        if stop_loss == 0 or take_profit == 0: return
         
-        # --- LONG SIGNAL ---
-        if long_signal.get("signal") == "long":
-            fibo_levels = S_Strategy.F_Get_Fibonacci(closes, highs, lows)
-            stop_loss = fibo_levels.get('1.272', 0) if fibo_levels else 0
-            take_profit = fibo_levels.get('1.0', 0) if fibo_levels else 0
-            fibo3 = fibo_levels.get('0.382', '-') if fibo_levels else '-'
-            fibo4 = fibo_levels.get('0.5', '-') if fibo_levels else '-'
-            fibo5 = fibo_levels.get('0.618', '-') if fibo_levels else '-'
-            volume = S_Bybit.F_Get_Volume(symbol)
-            
-            if stop_loss == 0 or take_profit == 0: continue
-            
-            _scanner_stats['found_signals'] += 1
-            _scanner_stats['last_signal_time'] = L_Time.strftime("%H:%M:%S")
-            log_message = (f"LONG SIGNAL | Symbol: {symbol} | Period: {period} | "
-                         f"Price: {_scanner_stats['current_price']} | Stop Loss: {stop_loss:.8f} | "
-                         f"Take Profit: {take_profit:.8f}")
-
-            M_Log.F_Add_Log('transaction', 'LongSignal', log_message)
-            telegram_message = f"🟢 LONG SIGNAL\n\n" \
-                f"Symbol: {symbol}\n" \
-                f"Period: {period}\n" \
-                f"Price: {_scanner_stats['current_price']}"
-
-            users = M_Telegram.F_Get_All_Users()
-            for user_id, user_data in users.items():
-                if user_data.get('user_active', False): S_Telegram.F_Send_Message(user_id, telegram_message, parse_mode='HTML')
-
-            # --- Add signal to GUI queue ---
-            signal_data = {
-                "time": L_Time.strftime("%H:%M:%S"),
-                "symbol": symbol,
-                "period": period,
-                "direction": "LONG",
-                "price": _scanner_stats['current_price'],
-                "volume": volume,
-                "stop_loss": stop_loss,
-                "take_profit": take_profit,
-                "fibo3": fibo3,
-                "fibo4": fibo4,
-                "fibo5": fibo5,
-                "pattern": "HH-LH-HH",
-                "fib_0_0": fibo_levels.get('0.0', '-'),
-                "fib_0_01": fibo_levels.get('0.01', '-'),
-                "fib_0_236": fibo_levels.get('0.236', '-'),
-                "fib_0_382": fibo_levels.get('0.382', '-'),
-                "fib_1_0": fibo_levels.get('1.0', '-')
-            }
-
-            S_Signal_Que.put(signal_data)
-
-
-        # --- SHORT SIGNAL ---
-        if short_signal.get("signal") == "short":
-            fibo_levels = S_Strategy.F_Get_Fibonacci(closes, highs, lows)
-            stop_loss = fibo_levels.get('1.272', 0) if fibo_levels else 0
-            take_profit = fibo_levels.get('1.0', 0) if fibo_levels else 0
-            fibo3 = fibo_levels.get('0.382', '-') if fibo_levels else '-'
-            fibo4 = fibo_levels.get('0.5', '-') if fibo_levels else '-'
-            fibo5 = fibo_levels.get('0.618', '-') if fibo_levels else '-'
-            volume = S_Bybit.F_Get_Volume(symbol)
-            
-            if stop_loss == 0 or take_profit == 0: continue
-            
-            _scanner_stats['found_signals'] += 1
-            _scanner_stats['last_signal_time'] = L_Time.strftime("%H:%M:%S")
-            log_message = (f"SHORT SIGNAL | Symbol: {symbol} | Period: {period} | "
-                         f"Price: {_scanner_stats['current_price']} | Stop Loss: {stop_loss:.8f} | "
-                         f"Take Profit: {take_profit:.8f}")
-
-            M_Log.F_Add_Log('transaction', 'ShortSignal', log_message)
-            telegram_message = f"🔴 SHORT SIGNAL\n\n" \
-                f"Symbol: {symbol}\n" \
-                f"Period: {period}\n" \
-                f"Price: {_scanner_stats['current_price']}"
-
-            users = M_Telegram.F_Get_All_Users()
-            for user_id, user_data in users.items():
-                if user_data.get('user_active', False): S_Telegram.F_Send_Message(user_id, telegram_message, parse_mode='HTML')
-
-            signal_data = {
-                "time": L_Time.strftime("%H:%M:%S"),
-                "symbol": symbol,
-                "period": period,
-                "direction": "SHORT",
-                "price": _scanner_stats['current_price'],
-                "volume": volume,
-                "stop_loss": stop_loss,
-                "take_profit": take_profit,
-                "fibo3": fibo3,
-                "fibo4": fibo4,
-                "fibo5": fibo5,
-                "pattern": "LL-LH-LL",
-                "fib_0_0": fibo_levels.get('0.0', '-'),
-                "fib_0_01": fibo_levels.get('0.01', '-'),
-                "fib_0_236": fibo_levels.get('0.236', '-'),
-                "fib_0_382": fibo_levels.get('0.382', '-'),
-                "fib_1_0": fibo_levels.get('1.0', '-')
-            }
-
-            S_Signal_Que.put(signal_data)
+        _scanner_stats['found_signals'] += 1
+        _scanner_stats['last_signal_time'] = L_Time.strftime("%H:%M:%S")
+        _scan_priority.record_signal(p_symbol)
+        log_message = (f"SHORT SIGNAL | Symbol: {p_symbol} | Period: {p_period} | "
+                     f"Price: {_scanner_stats['current_price']} | Stop Loss: {stop_loss:.8f} | "
+                     f"Take Profit: {take_profit:.8f}")
+
+        M_Log.F_Add_Log('transaction', 'ShortSignal', log_message)
+        telegram_message = f"🔴 SHORT SIGNAL\n\n" \
+            f"Symbol: {p_symbol}\n" \
+            f"Period: {p_period}\n" \
+            f"Price: {_scanner_stats['current_price']}"
+
+        _notify_users(telegram_message)
+
+        signal_data = {
+            "time": L_Time.strftime("%H:%M:%S"),
+            "symbol": p_symbol,
+            "period": p_period,
+            "direction": "SHORT",
+            "price": _scanner_stats['current_price'],
+            "volume": volume,
+            "stop_loss": stop_loss,
+            "take_profit": take_profit,
+            "fibo3": fibo3,
+            "fibo4": fibo4,
+            "fibo5": fibo5,
+            "pattern": p_strategy.patterns.get('short', p_strategy.name),
+            "fib_0_0": fibo_levels.get('0.0', '-'),
+            "fib_0_01": fibo_levels.get('0.01', '-'),
+            "fib_0_236": fibo_levels.get('0.236', '-'),
+            "fib_0_382": fibo_levels.get('0.382', '-'),
+            "fib_1_0": fibo_levels.get('1.0', '-')
+        }
+
+        S_Signal_Que.put(signal_data)
+
+def _evaluate(p_symbol, p_period, p_zigzag_period, p_candles, p_strategies):
+    """
+    Runs p_strategies over a candle bundle and returns their results in order. A strategy whose previous result
+    was computed before any candle closed since (see evaluation_cache.F_Get_Candle_Stamp) is not run again; the
+    others share one analysis context.
+    """
+    stamp = M_Evaluation_Cache.F_Get_Candle_Stamp(p_candles)
+    keys = [(p_symbol, p_period, p_zigzag_period, strategy.name) for strategy in p_strategies]
+    evaluations = [_evaluation_cache.get(key, stamp) for key in keys]
+    stale = [strategy for strategy, evaluation in zip(p_strategies, evaluations) if evaluation is None]
+    if not stale: return evaluations
+    settings = M_Bybit.F_Get_Settings()
+    backend = settings.get('strategy_backend', S_Strategy.DEFAULT_STRATEGY_BACKEND)
+    processes = int(settings.get('strategy_processes', DEFAULT_STRATEGY_PROCESSES) or 0)
+    results = None
+    if processes > 0 and backend in S_Strategy.STRATEGY_BACKENDS:
+        # Stateless backends run in the process pool; this thread only waits for the results
+        try: results = M_Strategy_Pool.F_Get_Pool(processes).evaluate(stale, p_candles, p_zigzag_period, backend)
+        # A settings change or shutdown may close the pool after F_Get_Pool; evaluate here instead
+        except (BrokenProcessPool, RuntimeError, L_Futures.CancelledError): pass
+    if results is None:
+        context = _create_context(p_symbol, p_period, p_zigzag_period, p_candles, backend)
+        results = [strategy.evaluate(context, p_candles, p_zigzag_period) for strategy in stale]
+    results = iter(results)
+    for index, key in enumerate(keys):
+        if evaluations[index] is not None: continue
+        evaluation = next(results)
+        if 'zigzag_level' in evaluation:
+            level = evaluation['zigzag_level']
+            evaluation = dict(evaluation, zigzag_level=f"{level:.8f}" if level is not None else "-")
+        _evaluation_cache.put(key, stamp, evaluation)
+        evaluations[index] = evaluation
+    return evaluations
+
+def _create_context(p_symbol, p_period, p_zigzag_period, p_candles, p_backend):
+    """
+    Returns the analysis context of the selected strategy backend. The pivots of each zigzag period are computed
+    once per context and shared by every consumer.
+    """
+    closes, highs, lows = p_candles['close'], p_candles['high'], p_candles['low']
+    if p_backend == INCREMENTAL_BACKEND:
+        return M_ZigZag_Stream.F_Create_Context(p_symbol, p_period, p_zigzag_period, p_candles)
+    if p_backend == BATCH_BACKEND:
+        with _batch_lock: context = _batch_contexts.pop((p_symbol, p_period), None)
+        # A prepared context only applies to the very bundle it was computed from
+        if context is not None and context.close is closes: return context
+        return S_Strategy.F_Create_Context(closes, highs, lows, 'numpy')
+    return S_Strategy.F_Create_Context(closes, highs, lows, p_backend)
+
+def _notify_users(p_message):
+    """
+    Sends a signal message to every active Telegram user. The Telegram service is imported on first use, so the
+    scanner also runs without a configured bot (e.g. a replayed cycle).
+    """
+    users = M_Telegram.F_Get_All_Users()
+    active_users = [user_id for user_id, user_data in users.items() if user_data.get('user_active', False)]
+    if not active_users: return
+    from backend.notification import telegram_service as S_Telegram
+    for user_id in active_users: S_Telegram.F_Send_Message(user_id, p_message, parse_mode='HTML')
 
 def F_Scanner():
     # DESC: Main loop of the scanner. This function runs in a thread.
     global _scanner_status, _scanner_stats
     
-    # Initialize ThreadPoolExecutor with a reasonable number of workers
-    # Adjust max_workers based on system capabilities and API rate limits
-    MAX_WORKERS = 5 
-    
     while not _scanner_stop_event.is_set():
         try:
             _scanner_status = "running"
+            cycle_started = L_Time.time()
             settings = M_Bybit.F_Get_Settings()
             zigzag_period = settings.get('zigzag_period')
             period_str_1 = settings.get('period_1')
@@ -234,6 +366,8 @@ def F_Scanner():
                 return period_map.get(period_str, period_str)
 
             periods_to_scan = [map_period_to_api(period_str_1), map_period_to_api(period_str_2)]
+            # Intervals without a strategy are not scanned
+            periods_to_scan = [period for period in periods_to_scan if M_Strategy_Registry.F_Get_Strategies(period)]
             symbols_to_scan = S_Bybit.F_Get_Symbol()
             
             if symbols_to_scan is None:
@@ -243,49 +377,246 @@ def F_Scanner():
                 _scanner_stop_event.wait(30)
                 continue # Return to the start of the loop
 
+            # Symbols that left the universe no longer need their cached candles
+            S_Bybit.F_Evict_Candles(symbol_data['symbol'] for symbol_data in symbols_to_scan)
+            _prune_evaluations(symbol_data['symbol'] for symbol_data in symbols_to_scan)
+            _evaluation_cache.evict(symbol_data['symbol'] for symbol_data in symbols_to_scan)
+            M_ZigZag_Stream.F_Evict(symbol_data['symbol'] for symbol_data in symbols_to_scan)
+            _scan_priority.evict(symbol_data['symbol'] for symbol_data in symbols_to_scan)
+            symbols_to_scan = _scan_priority.order(symbols_to_scan)
+
             _scanner_stats['total_symbols'] = len(symbols_to_scan)
             _scanner_stats['scanned_symbols'] = 0
             _scanner_stats['found_signals'] = 0
-            
-            # Using ThreadPoolExecutor safely manages thread lifecycle
-            with L_Futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-                futures = []
-                for symbol_data in symbols_to_scan:
-                    if _scanner_stop_event.is_set(): 
-                        executor.shutdown(wait=False, cancel_futures=True)
-                        break
-                    
-                    future = executor.submit(F_Scan, symbol_data, periods_to_scan, zigzag_period)
-                    futures.append(future)
-                
-                # Wait for all submitted tasks to complete
-                # We do this in a way that respects the stop event if possible, 
-                # but map/submit blocks until completion or exception.
-                # L_Futures.wait(futures) is blocking.
-                
-                # Monitor for stop event while waiting
-                done, not_done = L_Futures.wait(futures, return_when=L_Futures.FIRST_EXCEPTION)
-                # If we broke out due to exception, we just continue loop and re-enter or catch error
+            _scanner_stats['budget_skipped'] = 0
+
+            if settings.get('scan_mode') == 'stream':
+                F_Stream_Cycle(symbols_to_scan, periods_to_scan, zigzag_period, wait_time)
+                continue
+            _stop_kline_stream()
+
+            symbols_to_scan = M_Scan_Priority.F_Select_Cycle_Symbols(
+                symbols_to_scan, int(settings.get('priority_head', PRIORITY_HEAD)),
+                int(settings.get('tail_scan_every', TAIL_SCAN_EVERY)), _scanner_stats['cycle_count'])
+            candle_schedule = settings.get('scan_schedule', DEFAULT_SCAN_SCHEDULE) == 'candle'
+            due_periods = F_Get_Due_Periods(symbols_to_scan, periods_to_scan) if candle_schedule else None
+            if due_periods is None or due_periods:
+                F_Scan_Cycle(symbols_to_scan, periods_to_scan, zigzag_period,
+                             settings.get('cycle_budget', CYCLE_BUDGET), due_periods)
+                _scanner_stats['cycle_count'] += 1
+                _scanner_stats['last_cycle_time'] = round(L_Time.time() - cycle_started, 3)
             
             if _scanner_stop_event.is_set(): break
 
+            sleep_time = F_Get_Wake_Delay(periods_to_scan, wait_time) if candle_schedule else wait_time
             _scanner_status = "waiting"
             _scanner_stats['current_symbol'] = "In waiting mode..."
-            _scanner_stats['current_period'] = f"{wait_time}s"
+            _scanner_stats['current_period'] = f"{sleep_time:.0f}s"
             _scanner_stats['current_price'] = "-"
             _scanner_stats['last_zigzag_level'] = "-"
             _scanner_stats['last_fibo_level'] = "-"
             
             # Smart wait that can be interrupted
-            _scanner_stop_event.wait(wait_time)
+            _scanner_stop_event.wait(sleep_time)
             
         except Exception as e:
             M_Log.F_Add_Log('error', 'ScannerLoopError', str(e))
             _scanner_status = "waiting"
             _scanner_stop_event.wait(60)
             
+    _stop_kline_stream()
     _scanner_status = "stopped"
-    
+
+def F_Scan_Cycle(symbols_to_scan, periods_to_scan, zigzag_period, cycle_budget=CYCLE_BUDGET, due_periods=None):
+    # DESC: Polling mode cycle. Refreshes every symbol/period with concurrent requests over the shared connection
+    # pool, then evaluates the symbols on the worker threads, which read the candles from the cache.
+    # cycle_budget (seconds) bounds the cycle, prefetch included: no request is started after the budget, and the
+    # symbols left are skipped (they stay due for the next cycle).
+    # due_periods ({symbol: [periods]}, see F_Get_Due_Periods) limits the cycle to those pairs; None scans all.
+    cycle_started = L_Time.time()
+    deadline = cycle_started + float(cycle_budget) if cycle_budget else None
+    if due_periods is not None:
+        symbols_to_scan = [symbol_data for symbol_data in symbols_to_scan if symbol_data['symbol'] in due_periods]
+    def periods_of(symbol):
+        return periods_to_scan if due_periods is None else due_periods[symbol]
+    S_Bybit.F_Prefetch_Candles(((symbol_data['symbol'], period)
+                                for symbol_data in symbols_to_scan for period in periods_of(symbol_data['symbol'])),
+                               _prefetch_concurrency, deadline)
+    if M_Bybit.F_Get_Settings().get('strategy_backend') == BATCH_BACKEND:
+        _prepare_batch([(symbol_data['symbol'], period) for symbol_data in symbols_to_scan
+                        for period in periods_of(symbol_data['symbol'])], zigzag_period, cycle_started)
+
+    # Using ThreadPoolExecutor safely manages thread lifecycle
+    with L_Futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = []
+        for symbol_data in symbols_to_scan:
+            if (_scanner_stop_event is not None and _scanner_stop_event.is_set()) or not _concurrency.acquire(_scanner_stop_event):
+                executor.shutdown(wait=False, cancel_futures=True)
+                break
+
+            future = executor.submit(_run_scan, F_Scan, symbol_data, periods_of(symbol_data['symbol']), zigzag_period,
+                                     cycle_started, deadline)
+            futures.append(future)
+
+        # Wait for all submitted tasks to complete
+        # If we broke out due to exception, the scanner loop continues and re-enters or catches the error
+        L_Futures.wait(futures, return_when=L_Futures.FIRST_EXCEPTION)
+
+    if _scanner_stats['budget_skipped']:
+        M_Log.F_Add_Log('alert', 'ScannerLoop', f"Cycle budget of {cycle_budget}s exhausted; "
+                        f"{_scanner_stats['budget_skipped']} symbols left for the next cycle.")
+
+def _prepare_batch(p_pairs, p_zigzag_period, p_fresh_since):
+    """
+    Batch backend: stacks the freshly cached candles of every pair that needs an evaluation and computes their
+    pivots in vectorized cross-symbol passes. Pairs whose evaluation is cached or whose candles are missing are
+    left to the regular path.
+    """
+    pairs, bundles = [], []
+    for symbol, period in p_pairs:
+        candles = S_Bybit.F_Peek_Candles(symbol, period, p_fresh_since)
+        if not candles.get('close'): continue
+        stamp = M_Evaluation_Cache.F_Get_Candle_Stamp(candles)
+        if all(_evaluation_cache.is_fresh((symbol, period, p_zigzag_period, strategy.name), stamp)
+               for strategy in M_Strategy_Registry.F_Get_Strategies(period)): continue
+        pairs.append((symbol, period))
+        bundles.append(candles)
+    contexts = M_Signal_Batch.F_Create_Contexts(bundles, (p_zigzag_period, S_Strategy.FIBONACCI_PERIOD))
+    with _batch_lock:
+        # Contexts of the previous cycle that were never picked up are dropped
+        _batch_contexts.clear()
+        _batch_contexts.update(zip(pairs, contexts))
+
+def F_Get_Due_Periods(symbols_to_scan, periods_to_scan, now=None):
+    # DESC: Candle schedule. Returns {symbol: [periods]} of the pairs with a candle closed since their last
+    # evaluation (new symbols are always due). Pairs are only marked evaluated once F_Scan_Period has evaluated
+    # them, so pairs skipped by the budget, the stop event or an error stay due.
+    # Intervals without known boundaries are due on every call.
+    now = L_Time.time() if now is None else now
+    candle_opens = {period: M_Candle_Clock.F_Get_Candle_Open(period, now - CLOSE_SETTLE) for period in periods_to_scan}
+    due_periods = {}
+    with _evaluated_lock:
+        for symbol_data in symbols_to_scan:
+            symbol = symbol_data['symbol']
+            due = []
+            for period, candle_open in candle_opens.items():
+                if candle_open is not None and _evaluated_candles.get((symbol, period)) == candle_open: continue
+                due.append(period)
+            if due: due_periods[symbol] = due
+    return due_periods
+
+def F_Get_Wake_Delay(periods_to_scan, wait_time=None, now=None):
+    # DESC: Candle schedule. Seconds until the next candle close of periods_to_scan has settled,
+    # capped by wait_time (when set) so that the symbol universe keeps being refreshed.
+    now = L_Time.time() if now is None else now
+    # Measured from now - CLOSE_SETTLE so that a close that has not settled yet is still waited for
+    delay = M_Candle_Clock.F_Get_Seconds_To_Close(periods_to_scan, now - CLOSE_SETTLE)
+    if delay is None: delay = wait_time or 60
+    elif wait_time: delay = min(delay, float(wait_time))
+    return max(MIN_WAKE_INTERVAL, delay)
+
+def _record_evaluation(p_symbol, p_period, p_candles):
+    """
+    Marks a pair evaluated for the candle forming in its bundle (open time in epoch seconds), i.e. the bundle
+    contained every candle closed before it.
+    """
+    with _evaluated_lock: _evaluated_candles[(p_symbol, p_period)] = p_candles['start_time'][-1] / 1000.0
+
+def _prune_evaluations(p_active_symbols):
+    """
+    Drops the evaluation marks of symbols that left the universe.
+    """
+    active = set(p_active_symbols)
+    with _evaluated_lock:
+        for key in [key for key in _evaluated_candles if key[0] not in active]: del _evaluated_candles[key]
+
+def F_Stream_Cycle(symbols_to_scan, periods_to_scan, zigzag_period, wait_time):
+    # DESC: Streaming mode cycle. Keeps the kline topics of the filtered universe subscribed and evaluates a
+    # symbol/period as soon as its candle closes. Returns after wait_time so the universe can be refreshed.
+    global _kline_stream, _scanner_status, _stream_pairs
+    pairs = [(symbol_data['symbol'], period) for symbol_data in symbols_to_scan for period in periods_to_scan]
+    # A stream whose thread died is replaced by a new connection; the REST warm-up below fills the gap
+    if _kline_stream is not None and not _kline_stream.is_alive():
+        M_Log.F_Add_Log('alert', 'ScannerLoop', "Kline stream thread stopped; restarting the stream.")
+        _stop_kline_stream()
+    # REST warm-up only for pairs the stream does not keep current yet (new listings, pairs not cached, or every
+    # pair after the stream was (re)started); gaps of a live stream are filled by its reconnect backfill
+    S_Bybit.F_Prefetch_Candles([pair for pair in pairs
+                                if pair not in _stream_pairs or not S_Bybit.F_Peek_Candles(*pair)],
+                               _prefetch_concurrency)
+    _stream_pairs = set(pairs)
+    if _kline_stream is None:
+        _kline_stream = C_Kline_Stream(S_Bybit.F_Apply_Stream_Candle, _on_candle_close, _on_stream_reconnect,
+                                       M_Bybit.F_Get_Stream_Url())
+        _kline_stream.start()
+    _kline_stream.set_pairs(pairs)
+    active_pairs = set(pairs)
+
+    _scanner_status = "running"
+    deadline = L_Time.time() + wait_time
+    with L_Futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        while not _scanner_stop_event.is_set() and L_Time.time() < deadline:
+            try: symbol, period = _closed_candle_que.get(timeout=1)
+            except L_Queue.Empty: continue
+            if (symbol, period) not in active_pairs: continue
+            if not _concurrency.acquire(_scanner_stop_event): break
+            _scanner_stats['scanned_symbols'] += 1
+            # The stream keeps the cache current, so evaluation never waits for a REST request
+            executor.submit(_run_scan, F_Scan_Period, symbol, period, zigzag_period, 0)
+
+def _run_scan(p_func, *args):
+    """
+    Runs one scan slot granted by the concurrency controller, releases it with the scan latency and
+    applies an AIMD step when an adjustment window is complete.
+    """
+    started = L_Time.time()
+    try:
+        p_func(*args)
+    finally:
+        if _concurrency.release(L_Time.time() - started): _adjust_concurrency()
+
+def _prefetch_concurrency():
+    """
+    Kline requests a prefetch may keep in flight: the current AIMD level, the same bound as the symbol scans.
+    """
+    return _concurrency.level
+
+def _adjust_concurrency():
+    """
+    Feeds the 429/timeout errors since the previous adjustment and the shared rate limit utilization
+    into the concurrency controller.
+    """
+    global _concurrency_errors
+    errors = S_Bybit.F_Get_Error_Stats()
+    total = errors['rate_limited'] + errors['timeouts']
+    with _concurrency_lock:
+        window_errors, _concurrency_errors = total - _concurrency_errors, total
+    utilization = S_Bybit.F_Get_Rate_Status().get('shared', {}).get('utilization', 0.0)
+    _concurrency.adjust(window_errors, utilization)
+
+def _on_candle_close(p_symbol, p_period):
+    """
+    Stream callback: a candle has closed, queue the pair for evaluation.
+    """
+    _closed_candle_que.put((p_symbol, p_period))
+
+def _on_stream_reconnect(p_pairs):
+    """
+    Stream callback: backfill candles missed while disconnected over REST, then re-evaluate every pair.
+    """
+    S_Bybit.F_Prefetch_Candles(p_pairs, _prefetch_concurrency)
+    for pair in p_pairs: _closed_candle_que.put(pair)
+
+def _stop_kline_stream():
+    """
+    Closes the kline subscription when leaving streaming mode.
+    """
+    global _kline_stream, _stream_pairs
+    _stream_pairs = set()
+    if _kline_stream is None: return
+    _kline_stream.stop()
+    _kline_stream = None
+
 def F_Start_Scanner():
     # DESC: Starts the scanner as a thread
     global _scanner_thread, _scanner_stop_event, _scanner_status, _scanner_stats
@@ -300,8 +631,12 @@ def F_Start_Scanner():
         'last_signal_time': None,
         'current_price': '-',
         'last_zigzag_level': '-',
-        'last_fibo_level': '-'
+        'last_fibo_level': '-',
+        'budget_skipped': 0,
+        'cycle_count': 0,
+        'last_cycle_time': None
     })
+    _evaluation_cache.clear()
 
     _scanner_stop_event = L_Thread.Event()
     _scanner_thread = L_Thread.Thread(target=F_Scanner, daemon=True)
@@ -317,6 +652,7 @@ def F_Stop_Scanner():
     _scanner_stop_event.set()
     # Wait for thread to finish with a timeout
     if _scanner_thread: _scanner_thread.join(timeout=10)
+    M_Strategy_Pool.F_Close_Pool()
     _scanner_thread = None
     _scanner_status = "stopped"
     return {"status": "success", "message": "Scanner stopped."}
@@ -334,6 +670,20 @@ def F_Get_Status_Scanner():
         "last_signal_time": _scanner_stats['last_signal_time'],
         "current_price": _scanner_stats['current_price'],
         "last_zigzag_level": _scanner_stats['last_zigzag_level'],
-        "last_fibo_level": _scanner_stats['last_fibo_level']
+        "last_fibo_level": _scanner_stats['last_fibo_level'],
+        "budget_skipped": _scanner_stats['budget_skipped'],
+        "open_circuits": S_Bybit.F_Get_Skipped_Symbols(),
+        "circuit_status": S_Bybit.F_Get_Circuit_Status(),
+        "instrument_registry_age": M_Instruments.F_Get_Registry_Age(),
+        "ticker_snapshot_age": S_Bybit.F_Get_Ticker_Snapshot_Age(),
+        "coalesced_requests": S_Bybit.F_Get_Coalescing_Stats()['hits'],
+        "concurrency": _concurrency.level,
+        "concurrency_history": _concurrency.status()['history'],
+        "cycle_count": _scanner_stats['cycle_count'],
+        "last_cycle_time": _scanner_stats['last_cycle_time'],
+        "rate_utilization": S_Bybit.F_Get_Rate_Status().get('shared', {}).get('utilization', 0.0),
+        "evaluation_cache": _evaluation_cache.get_stats(),
+        "strategies": [strategy.name for strategy in M_Strategy_Registry.F_Get_Strategies()],
+        "zigzag_stream": M_ZigZag_Stream.F_Get_Stats()
     }
     return status_info
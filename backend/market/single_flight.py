@@ -0,0 +1,75 @@
+# ----- HEADER --------------------------------------------------
+
+# File: single_flight.py
+# Description: Request coalescing: concurrent callers asking for the same resource share one in-flight call.
+
+# ----- LIBRARY --------------------------------------------------
+
+import threading as L_Thread
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+# ----- CLASS --------------------------------------------------
+
+class C_Flight:
+    # DESC: One in-flight call. Followers wait on done and then read result or error.
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = L_Thread.Event()
+        self.result: Any = None
+        self.error: Exception = None
+
+    def wait(self) -> Any:
+        # DESC: Blocks until the leader finished and returns its result (or raises its error).
+        self.done.wait()
+        if self.error is not None: raise self.error
+        return self.result
+
+class C_Single_Flight:
+    # DESC: Coalesces calls by key. The first caller (leader) runs the call; callers arriving while it is in flight
+    # (followers) wait for it and receive the same result object, which therefore must not be mutated.
+    # stats counts misses (calls that went out) and hits (calls that were served by a call already in flight).
+    def __init__(self):
+        self.stats = {'hits': 0, 'misses': 0}
+        self._flights: Dict[Hashable, C_Flight] = {}
+        self._lock = L_Thread.Lock()
+
+    def do(self, p_key: Hashable, p_func: Callable[[], Any]) -> Any:
+        # DESC: Returns p_func() for the leader, or the leader's result for concurrent callers with the same key.
+        flight, leader = self.begin(p_key)
+        if not leader: return flight.wait()
+        try:
+            result = p_func()
+        except Exception as e:
+            self.finish(p_key, flight, p_error=e)
+            raise
+        self.finish(p_key, flight, result)
+        return result
+
+    def begin(self, p_key: Hashable) -> Tuple[C_Flight, bool]:
+        # DESC: Joins the call in flight for p_key or registers a new one. Returns (flight, is_leader);
+        # a leader must call finish() with the outcome. Used directly by batch callers that lead many keys at once.
+        with self._lock:
+            flight = self._flights.get(p_key)
+            if flight is not None:
+                self.stats['hits'] += 1
+                return flight, False
+            flight = self._flights[p_key] = C_Flight()
+            self.stats['misses'] += 1
+            return flight, True
+
+    def finish(self, p_key: Hashable, p_flight: C_Flight, p_result: Any = None, p_error: Exception = None):
+        # DESC: Publishes the outcome of a led call and releases its followers.
+        with self._lock:
+            if self._flights.get(p_key) is p_flight: del self._flights[p_key]
+        p_flight.result, p_flight.error = p_result, p_error
+        p_flight.done.set()
+
+    def get_stats(self) -> Dict[str, int]:
+        # DESC: Returns hit/miss counters and the number of calls currently in flight.
+        with self._lock: return dict(self.stats, in_flight=len(self._flights))
+
+    def reset_stats(self):
+        # DESC: Clears the hit/miss counters.
+        with self._lock:
+            for key in self.stats: self.stats[key] = 0
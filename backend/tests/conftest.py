@@ -0,0 +1,16 @@
+# ----- HEADER --------------------------------------------------
+
+# File: conftest.py
+# Description: Shared test setup. The bot database and the kline store point at throw-away locations before any
+# backend module is imported, so tests never touch data/bot_data.db.
+
+# ----- LIBRARY --------------------------------------------------
+
+import os as L_OS
+import tempfile as L_Tempfile
+
+# ----- VARIABLE --------------------------------------------------
+
+TEST_DIRECTORY = L_Tempfile.mkdtemp(prefix="bot_tests_")
+L_OS.environ["BOT_DB_PATH"] = L_OS.path.join(TEST_DIRECTORY, "bot_data.db")
+L_OS.environ["KLINE_STORE_PATH"] = ""
@@ -0,0 +1,90 @@
+# ----- HEADER --------------------------------------------------
+
+# File: test_candle_cache.py
+# Description: Incremental candle cache: after the warm-up only candles from the cached tail onwards are requested,
+# and the merged bundle always equals a full fetch of the same depth (overlapping tail, updated forming candle,
+# gaps wider than the window, trimming to the depth).
+
+# ----- LIBRARY --------------------------------------------------
+
+import pytest
+
+from backend.market import bybit_service as S_Bybit
+from backend.benchmark.request_count import C_Synthetic_Session
+
+# ----- VARIABLE --------------------------------------------------
+
+SYMBOL = "SYM0USDT"
+PERIOD = "15"
+DEPTH = 50
+
+# ----- CLASS --------------------------------------------------
+
+class C_Forming_Session(C_Synthetic_Session):
+    # DESC: Synthetic session whose newest (forming) candle closes p_tick higher than the random walk, so that a
+    # tick moves the forming candle without closing it. Records the parameters of every kline request.
+    def __init__(self):
+        super().__init__(1, 200)
+        self.tick = 0.0
+        self.requests = []
+
+    def get_kline(self, **kwargs):
+        self.requests.append(dict(kwargs))
+        response = super().get_kline(**kwargs)
+        rows = response['result']['list']
+        if rows and int(rows[0][0]) == (self.candle_count - 1) * 60000:
+            rows[0] = rows[0][:4] + [str(float(rows[0][4]) + self.tick)] + rows[0][5:]
+        return response
+
+# ----- FUNCTION --------------------------------------------------
+
+@pytest.fixture
+def session(monkeypatch):
+    # DESC: Offline market data with an empty candle cache and a kline depth of DEPTH.
+    session = C_Forming_Session()
+    monkeypatch.setattr(S_Bybit, "KLINE_LIMIT", DEPTH)
+    S_Bybit.F_Set_Provider(session)
+    S_Bybit.F_Clear_Candle_Cache()
+    yield session
+    S_Bybit.F_Set_Provider(None)
+    S_Bybit.F_Clear_Candle_Cache()
+
+def F_Full_Fetch(p_session):
+    # DESC: Returns the bundle a cold cache would build from one full request.
+    rows = p_session.get_kline(symbol=SYMBOL, interval=PERIOD, limit=DEPTH)['result']['list']
+    p_session.requests.pop()
+    return S_Bybit._build_candles(rows)
+
+def test_new_candles_are_appended_without_duplicating_the_tail(session):
+    S_Bybit.F_Get_Candles(SYMBOL, PERIOD)
+    session.F_Advance(3)
+    candles = S_Bybit.F_Get_Candles(SYMBOL, PERIOD)
+    # The incremental request starts at the cached tail, which is requested again
+    assert session.requests[-1]['start'] == (200 - 1) * 60000
+    assert candles == F_Full_Fetch(session)
+    assert S_Bybit.F_Get_Candle_Cache_Stats()['incremental'] == 1
+
+def test_updated_forming_candle_replaces_the_cached_one(session):
+    before = S_Bybit.F_Get_Candles(SYMBOL, PERIOD)
+    session.tick = 5.0
+    candles = S_Bybit.F_Get_Candles(SYMBOL, PERIOD)
+    assert candles['close'][-1] == pytest.approx(before['close'][-1] + 5.0)
+    assert candles['start_time'] == before['start_time']
+    assert candles == F_Full_Fetch(session)
+    # Bundles handed out earlier are never mutated
+    assert before['close'][-1] != candles['close'][-1]
+
+def test_full_page_replaces_the_cache(session):
+    S_Bybit.F_Get_Candles(SYMBOL, PERIOD)
+    session.F_Advance(DEPTH + 10)
+    candles = S_Bybit.F_Get_Candles(SYMBOL, PERIOD)
+    assert candles == F_Full_Fetch(session)
+    assert candles['start_time'][0] == (200 + 10) * 60000
+
+def test_merged_bundle_is_trimmed_to_the_depth(session):
+    S_Bybit.F_Get_Candles(SYMBOL, PERIOD)
+    for _ in range(3):
+        session.F_Advance(DEPTH // 2)
+        candles = S_Bybit.F_Get_Candles(SYMBOL, PERIOD)
+        assert len(candles['close']) == DEPTH and candles == F_Full_Fetch(session)
+    assert S_Bybit.F_Get_Candle_Cache_Stats()['incremental'] == 3
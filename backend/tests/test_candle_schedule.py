@@ -0,0 +1,53 @@
+# ----- HEADER --------------------------------------------------
+
+# File: test_candle_schedule.py
+# Description: Candle schedule: a pair stays due until it has been evaluated for the current candle, so pairs
+# skipped by the cycle budget are picked up again at the next wake-up.
+
+# ----- LIBRARY --------------------------------------------------
+
+import threading as L_Thread
+
+import pytest
+
+from backend.market import bybit_service as S_Bybit
+from backend.market import scanner_engine as S_Scanner
+from backend.benchmark.request_count import C_Synthetic_Session
+
+# ----- VARIABLE --------------------------------------------------
+
+PERIODS = ["15", "60"]
+# 901 one-minute synthetic candles: the forming candle opens at 54000s, a 15m and 1h boundary
+CANDLE_COUNT = 901
+NOW = 54000 + 60
+
+# ----- FUNCTION --------------------------------------------------
+
+@pytest.fixture
+def schedule_env(monkeypatch):
+    # DESC: Offline market data and an empty candle schedule.
+    session = C_Synthetic_Session(2, CANDLE_COUNT)
+    monkeypatch.setattr(S_Scanner, "_scanner_stop_event", L_Thread.Event())
+    monkeypatch.setattr(S_Scanner, "_evaluated_candles", {})
+    S_Bybit.F_Set_Provider(session)
+    S_Bybit.F_Clear_Candle_Cache()
+    yield [{'symbol': symbol} for symbol in session.symbols]
+    S_Bybit.F_Set_Provider(None)
+    S_Bybit.F_Clear_Candle_Cache()
+
+def test_skipped_pairs_stay_due(schedule_env):
+    due = S_Scanner.F_Get_Due_Periods(schedule_env, PERIODS, NOW)
+    assert due == {symbol_data['symbol']: PERIODS for symbol_data in schedule_env}
+    # A budget already exhausted skips every symbol
+    S_Scanner.F_Scan_Cycle(schedule_env, PERIODS, 10, -1, due)
+    assert S_Scanner.F_Get_Due_Periods(schedule_env, PERIODS, NOW) == due
+
+def test_evaluated_pairs_are_not_due_until_the_next_close(schedule_env):
+    due = S_Scanner.F_Get_Due_Periods(schedule_env, PERIODS, NOW)
+    S_Scanner.F_Scan_Cycle(schedule_env, PERIODS, 10, 0, due)
+    assert S_Scanner.F_Get_Due_Periods(schedule_env, PERIODS, NOW) == {}
+    # The status shows the last ZigZag level as a price string
+    level = S_Scanner.F_Get_Status_Scanner()['last_zigzag_level']
+    assert level == '-' or float(level) > 0
+    next_close = S_Scanner.F_Get_Due_Periods(schedule_env, PERIODS, 54000 + 900 + S_Scanner.CLOSE_SETTLE)
+    assert next_close == {symbol_data['symbol']: ["15"] for symbol_data in schedule_env}
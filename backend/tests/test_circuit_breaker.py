@@ -0,0 +1,94 @@
+# ----- HEADER --------------------------------------------------
+
+# File: test_circuit_breaker.py
+# Description: Symbol circuit breaker: only failures specific to a symbol (an error code or invalid kline data
+# from Bybit) open its circuit; rate limits, timeouts and transport errors do not. After the cooldown exactly
+# one caller is let through as a trial.
+
+# ----- LIBRARY --------------------------------------------------
+
+import threading as L_Thread
+
+import pytest
+
+from backend.market import bybit_service as S_Bybit
+from backend.market.circuit_breaker import C_Circuit_Breaker
+from backend.market.market_client import C_Market_Error
+from backend.benchmark.request_count import C_Synthetic_Session
+
+# ----- VARIABLE --------------------------------------------------
+
+PERIODS = ["15"]
+
+# Response of get_kline per failing symbol
+FAILURES = {
+    'RATELIMITUSDT': C_Market_Error("429 Too Many Requests (/v5/market/kline)", 429),
+    'TIMEOUTUSDT': C_Market_Error("Request timeout after 10s (/v5/market/kline)"),
+    'OFFLINEUSDT': C_Market_Error("Connection error (/v5/market/kline): connection refused"),
+    'INVALIDUSDT': C_Market_Error("Not supported symbols (ErrCode: 10001)", 200),
+    'EMPTYUSDT': {'retCode': 0, 'result': {'list': []}},
+    'GARBLEDUSDT': {'retCode': 0, 'result': {'list': [["not a number"]]}},
+}
+
+# ----- CLASS --------------------------------------------------
+
+class C_Failing_Session(C_Synthetic_Session):
+    # DESC: Synthetic session whose FAILURES symbols fail every kline request.
+    def __init__(self):
+        super().__init__(1)
+        self.symbols += list(FAILURES)
+
+    def get_kline(self, **kwargs):
+        failure = FAILURES.get(kwargs['symbol'])
+        if isinstance(failure, Exception): raise failure
+        return failure or super().get_kline(**kwargs)
+
+# ----- FUNCTION --------------------------------------------------
+
+@pytest.fixture
+def failing_session(monkeypatch):
+    # DESC: Failing offline market data and a closed circuit for every symbol.
+    session = C_Failing_Session()
+    monkeypatch.setattr(S_Bybit, "_symbol_circuit", C_Circuit_Breaker(S_Bybit.CIRCUIT_THRESHOLD))
+    S_Bybit.F_Set_Provider(session)
+    S_Bybit.F_Clear_Candle_Cache()
+    yield session
+    S_Bybit.F_Set_Provider(None)
+    S_Bybit.F_Clear_Candle_Cache()
+
+def test_only_symbol_failures_open_the_circuit(failing_session):
+    pairs = [(symbol, period) for symbol in failing_session.symbols for period in PERIODS]
+    for _ in range(S_Bybit.CIRCUIT_THRESHOLD):
+        assert S_Bybit.F_Prefetch_Candles(pairs) == 1
+        S_Bybit.F_Clear_Candle_Cache()
+    assert S_Bybit.F_Get_Skipped_Symbols() == ['EMPTYUSDT', 'GARBLEDUSDT', 'INVALIDUSDT']
+    status = S_Bybit.F_Get_Circuit_Status()
+    assert sorted(status) == ['EMPTYUSDT', 'GARBLEDUSDT', 'INVALIDUSDT']
+    assert all(entry['failures'] == S_Bybit.CIRCUIT_THRESHOLD and entry['cooldown'] > 0 for entry in status.values())
+
+def F_Concurrent_Allow(p_circuit, p_key, p_callers):
+    # DESC: Calls allow(p_key) from p_callers threads released at the same time; returns their answers.
+    barrier = L_Thread.Barrier(p_callers)
+    answers = []
+    def call():
+        barrier.wait()
+        answers.append(p_circuit.allow(p_key))
+    threads = [L_Thread.Thread(target=call) for _ in range(p_callers)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    return answers
+
+def test_half_open_circuit_lets_one_trial_through():
+    circuit = C_Circuit_Breaker(p_threshold=1, p_cooldown=0.0)
+    assert circuit.record_failure("SYM")
+    assert sorted(F_Concurrent_Allow(circuit, "SYM", 8)) == [False] * 7 + [True]
+    # A failed trial opens the circuit again; a successful one closes it for everyone
+    assert circuit.record_failure("SYM")
+    assert sorted(F_Concurrent_Allow(circuit, "SYM", 8)) == [False] * 7 + [True]
+    circuit.record_success("SYM")
+    assert F_Concurrent_Allow(circuit, "SYM", 8) == [True] * 8
+
+def test_unrecorded_trial_expires():
+    circuit = C_Circuit_Breaker(p_threshold=1, p_cooldown=0.0, p_trial_timeout=0.0)
+    circuit.record_failure("SYM")
+    assert circuit.allow("SYM") and circuit.allow("SYM")
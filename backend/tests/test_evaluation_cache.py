@@ -0,0 +1,95 @@
+# ----- HEADER --------------------------------------------------
+
+# File: test_evaluation_cache.py
+# Description: Evaluation cache invalidation: a newly closed candle or a changed forming high/low produces a new
+# candle stamp and a fresh evaluation, while updates of the forming candle within its range are cache hits.
+
+# ----- LIBRARY --------------------------------------------------
+
+import random as L_Random
+
+import pytest
+
+from backend.core import config as M_Bybit
+from backend.market import scanner_engine as S_Scanner
+from backend.trade import evaluation_cache as M_Evaluation_Cache
+from backend.trade import strategy_registry as M_Strategy_Registry
+from backend.benchmark.zigzag_equivalence import F_Random_Candles
+
+# ----- VARIABLE --------------------------------------------------
+
+CANDLES = 300
+INTERVAL_MS = 60000
+
+# ----- FUNCTION --------------------------------------------------
+
+@pytest.fixture
+def cache(monkeypatch):
+    # DESC: An empty evaluation cache for the scanner and in-thread evaluation.
+    cache = M_Evaluation_Cache.C_Evaluation_Cache()
+    monkeypatch.setattr(S_Scanner, "_evaluation_cache", cache)
+    monkeypatch.setattr(M_Bybit, "F_Get_Settings", lambda: {'strategy_processes': 0})
+    return cache
+
+def F_Bundle(p_seed=7, p_count=CANDLES):
+    # DESC: Returns a random candle bundle whose last candle is still forming.
+    closes, highs, lows = F_Random_Candles(L_Random.Random(p_seed), p_count)
+    return {'start_time': [float(index * INTERVAL_MS) for index in range(p_count)],
+            'close': closes, 'high': highs, 'low': lows}
+
+def F_Copy(p_bundle):
+    # DESC: Returns a copy of a bundle whose columns can be changed independently.
+    return {column: list(values) for column, values in p_bundle.items()}
+
+def F_Close_Candle(p_bundle, p_keep_length):
+    # DESC: Returns the bundle after the forming candle closed and a new one opened. With p_keep_length the oldest
+    # candle leaves the window, as in a store that retains a fixed number of rows.
+    bundle = F_Copy(p_bundle)
+    last = bundle['close'][-1]
+    bundle['start_time'].append(bundle['start_time'][-1] + INTERVAL_MS)
+    for column in ('close', 'high', 'low'): bundle[column].append(last)
+    if p_keep_length:
+        for values in bundle.values(): del values[0]
+    return bundle
+
+def F_Evaluate(p_bundle):
+    # DESC: Evaluates the 15 minute strategies over a bundle and returns their results.
+    return S_Scanner._evaluate("SYMUSDT", "15", 5, p_bundle, M_Strategy_Registry.F_Get_Strategies("15"))
+
+def test_empty_bundle_has_no_stamp():
+    assert M_Evaluation_Cache.F_Get_Candle_Stamp({'start_time': [], 'high': [], 'low': []}) is None
+    assert M_Evaluation_Cache.F_Get_Candle_Stamp({}) is None
+
+def test_unchanged_forming_candle_is_a_cache_hit(cache):
+    bundle = F_Bundle()
+    expected = F_Evaluate(bundle)
+    strategies = len(expected)
+    assert cache.get_stats()['misses'] == strategies and cache.get_stats()['hits'] == 0
+    # The forming candle trades within its range: only the close moves
+    moved = F_Copy(bundle)
+    moved['close'][-1] = (moved['high'][-1] + moved['low'][-1]) / 2
+    assert M_Evaluation_Cache.F_Get_Candle_Stamp(moved) == M_Evaluation_Cache.F_Get_Candle_Stamp(bundle)
+    assert F_Evaluate(moved) == expected
+    assert cache.get_stats()['hits'] == strategies and cache.get_stats()['misses'] == strategies
+
+@pytest.mark.parametrize("keep_length", [False, True])
+def test_new_closed_candle_invalidates(cache, keep_length):
+    bundle = F_Bundle()
+    strategies = len(F_Evaluate(bundle))
+    closed = F_Close_Candle(bundle, keep_length)
+    assert M_Evaluation_Cache.F_Get_Candle_Stamp(closed) != M_Evaluation_Cache.F_Get_Candle_Stamp(bundle)
+    F_Evaluate(closed)
+    assert cache.get_stats()['hits'] == 0 and cache.get_stats()['misses'] == 2 * strategies
+
+@pytest.mark.parametrize("column, change", [('high', 1.01), ('low', 0.99)])
+def test_changed_forming_high_or_low_invalidates(cache, column, change):
+    bundle = F_Bundle()
+    strategies = len(F_Evaluate(bundle))
+    # A new extreme of the forming candle can change the newest pivot
+    extended = F_Copy(bundle)
+    extended[column][-1] *= change
+    assert M_Evaluation_Cache.F_Get_Candle_Stamp(extended) != M_Evaluation_Cache.F_Get_Candle_Stamp(bundle)
+    F_Evaluate(extended)
+    assert cache.get_stats()['hits'] == 0 and cache.get_stats()['misses'] == 2 * strategies
+    assert cache.is_fresh(("SYMUSDT", "15", 5, M_Strategy_Registry.F_Get_Strategies("15")[0].name),
+                          M_Evaluation_Cache.F_Get_Candle_Stamp(extended))
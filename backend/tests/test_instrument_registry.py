@@ -0,0 +1,113 @@
+# ----- HEADER --------------------------------------------------
+
+# File: test_instrument_registry.py
+# Description: Instrument registry: the network is only awaited when nothing is persisted, an expired registry is
+# refreshed in the background, a restart reloads the instruments table, and listings/delistings are reported once.
+
+# ----- LIBRARY --------------------------------------------------
+
+import types as L_Types
+
+import pytest
+
+from backend.core import config as M_Bybit
+from backend.core import database as DB
+from backend.market import instrument_registry as M_Instruments
+
+# ----- VARIABLE --------------------------------------------------
+
+TTL = 600
+# Epoch seconds of the fake clock at the start of a test
+START = 1_700_000_000.0
+
+# ----- CLASS --------------------------------------------------
+
+class C_Listing:
+    # DESC: Instrument source whose symbols can be changed between calls; counts its downloads.
+    def __init__(self, *p_symbols):
+        self.symbols = list(p_symbols)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return [{'symbol': symbol, 'status': 'Trading'} for symbol in self.symbols]
+
+# ----- FUNCTION --------------------------------------------------
+
+@pytest.fixture
+def clock(monkeypatch):
+    # DESC: Empty registry and instruments table, a TTL of TTL seconds and a clock moved by clock.now.
+    fake = L_Types.SimpleNamespace(now=START)
+    monkeypatch.setattr(M_Instruments, "L_Time", L_Types.SimpleNamespace(time=lambda: fake.now))
+    monkeypatch.setattr(M_Bybit, "F_Get_Settings", lambda: {'instrument_ttl': TTL})
+    monkeypatch.setattr(M_Instruments, "_instruments", None)
+    monkeypatch.setattr(M_Instruments, "_refreshed_at", 0.0)
+    monkeypatch.setattr(M_Instruments, "_refresh_thread", None)
+    monkeypatch.setattr(M_Instruments, "_pending_changes", {'added': set(), 'removed': set()})
+    F_Clear_Table()
+    yield fake
+    F_Clear_Table()
+
+def F_Clear_Table():
+    # DESC: Empties the persisted instruments table.
+    conn = DB.get_connection()
+    conn.execute("DELETE FROM instruments")
+    conn.commit()
+    conn.close()
+
+def F_Symbols(p_instruments):
+    # DESC: Returns the sorted symbols of an instrument list.
+    return sorted(item['symbol'] for item in p_instruments)
+
+def F_Wait_For_Refresh():
+    # DESC: Waits until the background refresh (if any) has finished.
+    if M_Instruments._refresh_thread is not None: M_Instruments._refresh_thread.join(timeout=10)
+
+def test_registry_is_downloaded_once_per_ttl(clock):
+    listing = C_Listing("AUSDT", "BUSDT")
+    assert F_Symbols(M_Instruments.F_Get_Instruments(listing)) == ["AUSDT", "BUSDT"]
+    clock.now += TTL - 1
+    assert F_Symbols(M_Instruments.F_Get_Instruments(listing)) == ["AUSDT", "BUSDT"]
+    assert listing.calls == 1 and M_Instruments.F_Get_Registry_Age() == TTL - 1
+
+def test_expired_registry_is_served_while_it_refreshes(clock):
+    listing = C_Listing("AUSDT", "BUSDT")
+    M_Instruments.F_Get_Instruments(listing)
+    listing.symbols.append("CUSDT")
+    clock.now += TTL
+    # The caller gets the expired registry at once; the download runs in the background
+    assert F_Symbols(M_Instruments.F_Get_Instruments(listing)) == ["AUSDT", "BUSDT"]
+    F_Wait_For_Refresh()
+    assert listing.calls == 2 and M_Instruments.F_Get_Registry_Age() == 0
+    assert F_Symbols(M_Instruments.F_Get_Instruments(listing)) == ["AUSDT", "BUSDT", "CUSDT"]
+
+def test_restart_reloads_the_instruments_table(clock, monkeypatch):
+    M_Instruments.F_Get_Instruments(C_Listing("AUSDT", "BUSDT"))
+    M_Instruments.F_Refresh_Instruments(C_Listing("BUSDT", "CUSDT"))
+    clock.now += 60
+    # A new process starts with an empty registry and must not wait for the network
+    monkeypatch.setattr(M_Instruments, "_instruments", None)
+    monkeypatch.setattr(M_Instruments, "_refreshed_at", 0.0)
+    offline = C_Listing()
+    assert F_Symbols(M_Instruments.F_Get_Instruments(offline)) == ["BUSDT", "CUSDT"]
+    assert offline.calls == 0 and M_Instruments.F_Get_Registry_Age() == 60
+
+def test_failed_or_empty_refresh_keeps_the_registry(clock):
+    M_Instruments.F_Get_Instruments(C_Listing("AUSDT"))
+    def failing():
+        raise ConnectionError("offline")
+    assert M_Instruments.F_Refresh_Instruments(failing) is None
+    assert M_Instruments.F_Refresh_Instruments(C_Listing()) is None
+    assert F_Symbols(M_Instruments.F_Get_Instruments(C_Listing())) == ["AUSDT"]
+
+def test_listing_changes_are_reported_once(clock):
+    M_Instruments.F_Get_Instruments(C_Listing("AUSDT", "BUSDT"))
+    assert M_Instruments.F_Pop_Changes() == {'added': ["AUSDT", "BUSDT"], 'removed': []}
+    assert M_Instruments.F_Refresh_Instruments(C_Listing("BUSDT", "CUSDT")) == {'added': ["CUSDT"],
+                                                                                'removed': ["AUSDT"]}
+    assert M_Instruments.F_Pop_Changes() == {'added': ["CUSDT"], 'removed': ["AUSDT"]}
+    assert M_Instruments.F_Pop_Changes() == {'added': [], 'removed': []}
+    # A symbol delisted and re-listed before the consumer looked only needs a warm-up
+    M_Instruments.F_Refresh_Instruments(C_Listing("CUSDT"))
+    M_Instruments.F_Refresh_Instruments(C_Listing("BUSDT", "CUSDT"))
+    assert M_Instruments.F_Pop_Changes() == {'added': ["BUSDT"], 'removed': []}
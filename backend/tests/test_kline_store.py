@@ -0,0 +1,35 @@
+# ----- HEADER --------------------------------------------------
+
+# File: test_kline_store.py
+# Description: Kline store: every flush keeps only the newest RETAIN_ROWS candles of the keys it wrote.
+
+# ----- LIBRARY --------------------------------------------------
+
+import pytest
+
+from backend.market import kline_store as M_Kline_Store
+
+# ----- FUNCTION --------------------------------------------------
+
+@pytest.fixture
+def kline_store(tmp_path, monkeypatch):
+    # DESC: A kline store in a temporary file retaining 5 candles per key.
+    monkeypatch.setattr(M_Kline_Store, "RETAIN_ROWS", 5)
+    M_Kline_Store.F_Set_Path(str(tmp_path / "kline_store.db"))
+    yield M_Kline_Store
+    M_Kline_Store.F_Set_Path("")
+
+def F_Candles(p_starts):
+    # DESC: Returns column series of candles starting at p_starts.
+    return {column: [float(start) for start in p_starts] if column != 'start_time' else list(p_starts)
+            for column in M_Kline_Store.STORE_COLUMNS}
+
+def test_flush_prunes_beyond_the_retained_window(kline_store):
+    kline_store.F_Append("BTCUSDT", "15", F_Candles(range(8)))
+    kline_store.F_Append("ETHUSDT", "15", F_Candles(range(3)))
+    assert kline_store.F_Flush() == 11
+    kline_store.F_Append("BTCUSDT", "15", F_Candles([8, 9]))
+    kline_store.F_Flush()
+    stored = kline_store.F_Load_Many([("BTCUSDT", "15"), ("ETHUSDT", "15")], 100)
+    assert stored[("BTCUSDT", "15")]['start_time'] == [5, 6, 7, 8, 9]
+    assert stored[("ETHUSDT", "15")]['start_time'] == [0, 1, 2]
@@ -0,0 +1,79 @@
+# ----- HEADER --------------------------------------------------
+
+# File: test_kline_stream.py
+# Description: C_Kline_Stream against the local fake kline WebSocket: bad frames and failing callbacks are skipped
+# without ending the stream thread, and stop() ends a thread sleeping in the reconnect backoff.
+
+# ----- LIBRARY --------------------------------------------------
+
+import json as L_JSON
+import time as L_Time
+import socket as L_Socket
+
+from backend.market import kline_stream as M_Kline_Stream
+from backend.market.kline_stream import C_Kline_Stream
+from backend.benchmark.fake_kline_stream import C_Fake_Kline_Stream
+
+# ----- VARIABLE --------------------------------------------------
+
+SYMBOL = "BTCUSDT"
+INTERVAL = "15"
+TIMEOUT = 10.0
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Frame(p_start, p_confirm=True, p_drop=None):
+    # DESC: Returns one kline frame of SYMBOL/INTERVAL; p_drop removes a field to make it malformed.
+    item = {'start': p_start, 'open': '1', 'high': '2', 'low': '0.5', 'close': '1.5', 'volume': '10',
+            'turnover': '15', 'confirm': p_confirm}
+    if p_drop: del item[p_drop]
+    return L_JSON.dumps({'topic': f"kline.{INTERVAL}.{SYMBOL}", 'data': [item]})
+
+def F_Run_Stream(p_frames, p_on_candle, p_expected_closes):
+    # DESC: Streams p_frames through a fake server until p_expected_closes candles closed (or TIMEOUT).
+    # Returns (closed pairs, stream) after stopping both.
+    server = C_Fake_Kline_Stream(p_frames)
+    closes = []
+    stream = C_Kline_Stream(p_on_candle, lambda symbol, interval: closes.append((symbol, interval)), None,
+                            server.start())
+    stream.set_pairs([(SYMBOL, INTERVAL)])
+    stream.start()
+    try:
+        deadline = L_Time.time() + TIMEOUT
+        while len(closes) < p_expected_closes and L_Time.time() < deadline: L_Time.sleep(0.01)
+        alive = stream.is_alive()
+    finally:
+        stream.stop()
+        server.stop()
+    assert alive
+    return closes, stream
+
+def test_malformed_frame_is_skipped():
+    frames = [F_Frame(1000, p_drop='turnover'), F_Frame(2000)]
+    closes, stream = F_Run_Stream(frames, lambda *args: None, 1)
+    assert closes == [(SYMBOL, INTERVAL)]
+    assert stream.stats['bad_frames'] == 1
+
+def test_failing_callback_does_not_stop_the_stream():
+    calls = []
+    def on_candle(symbol, interval, candle):
+        calls.append(candle['start_time'])
+        if len(calls) == 1: raise RuntimeError("callback failure")
+    closes, stream = F_Run_Stream([F_Frame(1000), F_Frame(2000)], on_candle, 1)
+    assert calls == [1000, 2000]
+    assert closes == [(SYMBOL, INTERVAL)]
+    assert stream.stats['bad_frames'] == 1
+
+def test_stop_interrupts_the_reconnect_backoff(monkeypatch):
+    monkeypatch.setattr(M_Kline_Stream, "RECONNECT_DELAY_MIN", 60.0)
+    # A port nobody listens on: every connection attempt fails at once and the thread backs off
+    with L_Socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    stream = C_Kline_Stream(lambda *args: None, lambda *args: None, None, f"ws://127.0.0.1:{port}")
+    stream.start()
+    thread = stream._thread
+    L_Time.sleep(0.5)
+    started = L_Time.time()
+    stream.stop()
+    assert L_Time.time() - started < 5 and not thread.is_alive() and not stream.is_alive()
@@ -0,0 +1,127 @@
+# ----- HEADER --------------------------------------------------
+
+# File: test_market_client.py
+# Description: C_Market_Client against the local fake Bybit REST server: payloads, map() ordering and its sliding
+# in-flight window and deadline, and the C_Market_Error raised for HTTP 429s, retCode rate limits, timeouts and unreachable hosts.
+
+# ----- LIBRARY --------------------------------------------------
+
+import time as L_Time
+import asyncio as L_Asyncio
+
+import pytest
+
+from backend.market.market_client import C_Market_Client, C_Market_Error
+from backend.benchmark.fake_bybit_server import C_Fake_Bybit_Server
+
+# ----- VARIABLE --------------------------------------------------
+
+SYMBOL_COUNT = 5
+
+# Simulated latency (seconds) of the one slow request and of the fast ones in the sliding window test
+SLOW_LATENCY = 0.5
+FAST_LATENCY = 0.01
+
+# ----- CLASS --------------------------------------------------
+
+class C_Timed_Client(C_Market_Client):
+    # DESC: Market client whose requests sleep for params['latency'] instead of calling the network; records the
+    # order in which requests start and finish and the highest number in flight.
+    def __init__(self):
+        super().__init__("http://127.0.0.1:9")
+        self.events = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def request(self, p_path, p_params):
+        self.events.append(('start', p_params['index']))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await L_Asyncio.sleep(p_params['latency'])
+        self.in_flight -= 1
+        self.events.append(('end', p_params['index']))
+        return {'retCode': 0, 'result': {'list': [p_params['index']]}}
+
+# ----- FUNCTION --------------------------------------------------
+
+@pytest.fixture
+def market_server():
+    # DESC: Returns a factory starting a fake server (keyword arguments of C_Fake_Bybit_Server) and a client
+    # connected to it; both are shut down after the test.
+    started = []
+    def serve(p_timeout=5.0, **kwargs):
+        server = C_Fake_Bybit_Server(SYMBOL_COUNT, **kwargs)
+        client = C_Market_Client(server.start(), p_timeout=p_timeout)
+        started.append((server, client))
+        return server, client
+    yield serve
+    for server, client in started:
+        client.close()
+        server.stop()
+
+def test_market_endpoints_return_v5_payloads(market_server):
+    server, client = market_server()
+    instruments = client.get_instruments_info(category="linear")['result']['list']
+    assert [item['symbol'] for item in instruments] == server.symbols
+    tickers = client.get_tickers(category="linear", symbol=server.symbols[0])['result']['list']
+    assert [ticker['symbol'] for ticker in tickers] == server.symbols[:1]
+    rows = client.get_kline(category="linear", symbol=server.symbols[0], interval="15", limit=50)['result']['list']
+    assert len(rows) == 50 and int(rows[0][0]) > int(rows[-1][0])
+
+def test_map_returns_payloads_in_input_order(market_server):
+    server, client = market_server()
+    params_list = [{'category': "linear", 'symbol': symbol, 'interval': "60", 'limit': 10} for symbol in server.symbols]
+    responses = client.map('get_kline', params_list)
+    assert len(responses) == SYMBOL_COUNT
+    for params, response in zip(params_list, responses):
+        assert response['result']['list'] == client.get_kline(**params)['result']['list']
+
+def test_map_keeps_a_sliding_window_in_flight():
+    client = C_Timed_Client()
+    params_list = [{'index': index, 'latency': SLOW_LATENCY if index == 0 else FAST_LATENCY} for index in range(8)]
+    try:
+        responses = client.map('get_kline', params_list, lambda: 2)
+    finally:
+        client.close()
+    assert [response['result']['list'][0] for response in responses] == list(range(8))
+    assert client.max_in_flight == 2
+    # Every fast request runs beside the slow one instead of waiting for its chunk to complete
+    assert client.events[-1] == ('end', 0)
+
+def test_map_starts_no_request_after_the_deadline():
+    client = C_Timed_Client()
+    params_list = [{'index': index, 'latency': SLOW_LATENCY} for index in range(3)]
+    try:
+        responses = client.map('get_kline', params_list, lambda: 1, L_Time.time() + SLOW_LATENCY / 5)
+    finally:
+        client.close()
+    assert responses[0]['result']['list'] == [0] and responses[1:] == [None, None]
+    assert client.events == [('start', 0), ('end', 0)]
+
+def test_http_429_raises_market_error(market_server):
+    _, client = market_server(p_error_rate=1.0)
+    with pytest.raises(C_Market_Error) as error:
+        client.get_kline(category="linear", symbol="SYN00000USDT", interval="15", limit=10)
+    assert error.value.status == 429 and "429" in str(error.value)
+
+def test_rate_limit_ret_code_raises_429(market_server):
+    _, client = market_server(p_rate_limits={'kline': 1})
+    params_list = [{'category': "linear", 'symbol': "SYN00000USDT", 'interval': "15", 'limit': 10}] * 3
+    errors = [response for response in client.map('get_kline', params_list) if isinstance(response, Exception)]
+    assert errors and all(isinstance(error, C_Market_Error) and error.status == 429 for error in errors)
+    assert all("Too Many Requests" in str(error) for error in errors)
+
+def test_timeout_raises_market_error(market_server):
+    _, client = market_server(p_timeout=0.2, p_timeout_rate=1.0, p_timeout_delay=0.5)
+    with pytest.raises(C_Market_Error, match="timeout"):
+        client.get_kline(category="linear", symbol="SYN00000USDT", interval="15", limit=10)
+
+def test_unreachable_host_raises_market_error(market_server):
+    server, _ = market_server()
+    server.stop()
+    client = C_Market_Client(f"http://127.0.0.1:{server.port}", p_timeout=2.0)
+    try:
+        with pytest.raises(C_Market_Error, match="Connection error"):
+            client.get_tickers(category="linear")
+    finally:
+        client.close()
@@ -0,0 +1,54 @@
+# ----- HEADER --------------------------------------------------
+
+# File: test_market_provider.py
+# Description: Record and replay: a recording replays the recorded klines, and requests recorded from one map()
+# call are replayed with their share of its elapsed time instead of the whole of it.
+
+# ----- LIBRARY --------------------------------------------------
+
+import time as L_Time
+
+import pytest
+
+from backend.market.market_provider import C_Recording_Provider, C_Replay_Provider
+from backend.benchmark.request_count import C_Synthetic_Session
+
+# ----- VARIABLE --------------------------------------------------
+
+SYMBOL_COUNT = 5
+# Seconds every synthetic kline request takes
+REQUEST_LATENCY = 0.02
+
+# ----- CLASS --------------------------------------------------
+
+class C_Slow_Session(C_Synthetic_Session):
+    # DESC: Synthetic session whose kline requests take REQUEST_LATENCY seconds each.
+    def get_kline(self, **kwargs):
+        L_Time.sleep(REQUEST_LATENCY)
+        return super().get_kline(**kwargs)
+
+# ----- FUNCTION --------------------------------------------------
+
+@pytest.fixture
+def recording_path(tmp_path):
+    # DESC: Path of a recording made from one map() over every symbol and one single get_kline call.
+    path = str(tmp_path / "market.jsonl.gz")
+    session = C_Slow_Session(SYMBOL_COUNT)
+    recorder = C_Recording_Provider(session, path)
+    params_list = [{'category': "linear", 'symbol': symbol, 'interval': "15", 'limit': 50} for symbol in session.symbols]
+    recorder.map('get_kline', params_list)
+    recorder.get_kline(category="linear", symbol=session.symbols[0], interval="60", limit=50)
+    recorder.close()
+    return path
+
+def test_replay_serves_the_recorded_klines(recording_path):
+    replay = C_Replay_Provider(recording_path)
+    expected = C_Synthetic_Session(SYMBOL_COUNT).get_kline(symbol="SYM1USDT", interval="15", limit=50)
+    assert replay.get_kline(symbol="SYM1USDT", interval="15", limit=50)['result']['list'] == expected['result']['list']
+
+def test_mapped_requests_replay_their_share_of_the_batch_time(recording_path):
+    replay = C_Replay_Provider(recording_path)
+    # The map() took SYMBOL_COUNT request latencies; each request is charged about one of them
+    for symbol in C_Synthetic_Session(SYMBOL_COUNT).symbols:
+        assert REQUEST_LATENCY <= replay._kline_elapsed[(symbol, "15")] < 2 * REQUEST_LATENCY
+    assert REQUEST_LATENCY <= replay._kline_elapsed[("SYM0USDT", "60")] < 2 * REQUEST_LATENCY
@@ -0,0 +1,89 @@
+# ----- HEADER --------------------------------------------------
+
+# File: test_prefetch.py
+# Description: Kline prefetch: all pairs go out in one map() call whose in-flight limit the scanner takes from its
+# AIMD controller (the sliding window itself is tested with the market client); no request starts after the cycle
+# budget.
+
+# ----- LIBRARY --------------------------------------------------
+
+import time as L_Time
+import threading as L_Thread
+
+import pytest
+
+from backend.market import bybit_service as S_Bybit
+from backend.market import scanner_engine as S_Scanner
+from backend.market.concurrency import C_AIMD_Controller
+from backend.benchmark.request_count import C_Synthetic_Session
+
+# ----- VARIABLE --------------------------------------------------
+
+PERIODS = ["15", "60"]
+SYMBOL_COUNT = 5
+
+# ----- CLASS --------------------------------------------------
+
+class C_Counting_Session(C_Synthetic_Session):
+    # DESC: Synthetic session recording the size and in-flight limit of every map() call and the number of kline
+    # requests actually sent.
+    def __init__(self):
+        super().__init__(SYMBOL_COUNT)
+        self.batches = []
+        self.limits = []
+        self.sent = 0
+
+    def get_kline(self, **kwargs):
+        self.sent += 1
+        return super().get_kline(**kwargs)
+
+    def map(self, p_method, p_params_list, p_limit=None, p_deadline=None):
+        self.batches.append(len(p_params_list))
+        self.limits.append(p_limit)
+        return super().map(p_method, p_params_list, p_limit, p_deadline)
+
+# ----- FUNCTION --------------------------------------------------
+
+@pytest.fixture
+def counting_session(monkeypatch):
+    # DESC: Offline market data recording its map() calls, and a clean scanner state.
+    session = C_Counting_Session()
+    monkeypatch.setattr(S_Scanner, "_scanner_stop_event", L_Thread.Event())
+    monkeypatch.setattr(S_Scanner, "_evaluated_candles", {})
+    S_Bybit.F_Set_Provider(session)
+    S_Bybit.F_Clear_Candle_Cache()
+    yield session
+    S_Bybit.F_Set_Provider(None)
+    S_Bybit.F_Clear_Candle_Cache()
+
+def test_prefetch_passes_the_concurrency_limit(counting_session):
+    pairs = [(symbol, period) for symbol in counting_session.symbols for period in PERIODS]
+    limit = lambda: 3
+    assert S_Bybit.F_Prefetch_Candles(pairs, limit) == len(pairs)
+    assert counting_session.batches == [len(pairs)] and counting_session.limits == [limit]
+
+def test_prefetch_without_limit_sends_all_requests(counting_session):
+    pairs = [(symbol, period) for symbol in counting_session.symbols for period in PERIODS]
+    assert S_Bybit.F_Prefetch_Candles(pairs) == len(pairs)
+    assert counting_session.batches == [len(pairs)] and counting_session.limits == [None]
+
+def test_scan_cycle_prefetch_uses_the_aimd_level(counting_session, monkeypatch):
+    controller = C_AIMD_Controller(1, 32, 3)
+    monkeypatch.setattr(S_Scanner, "_concurrency", controller)
+    symbols = [{'symbol': symbol} for symbol in counting_session.symbols]
+    S_Scanner.F_Scan_Cycle(symbols, PERIODS, 10, 0)
+    assert counting_session.batches == [len(symbols) * len(PERIODS)]
+    # The limit follows the controller while the prefetch runs
+    assert counting_session.limits[0]() == controller.level
+
+def test_prefetch_starts_no_request_after_the_deadline(counting_session):
+    pairs = [(symbol, period) for symbol in counting_session.symbols for period in PERIODS]
+    assert S_Bybit.F_Prefetch_Candles(pairs, None, L_Time.time() - 1) == 0
+    assert counting_session.sent == 0 and S_Bybit.F_Get_Coalescing_Stats()['in_flight'] == 0
+
+def test_exhausted_cycle_budget_leaves_pairs_due(counting_session):
+    symbols = [{'symbol': symbol} for symbol in counting_session.symbols]
+    due = S_Scanner.F_Get_Due_Periods(symbols, PERIODS)
+    S_Scanner.F_Scan_Cycle(symbols, PERIODS, 10, -1, due)
+    assert counting_session.sent == 0
+    assert S_Scanner.F_Get_Due_Periods(symbols, PERIODS) == due
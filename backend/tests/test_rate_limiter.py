@@ -0,0 +1,100 @@
+# ----- HEADER --------------------------------------------------
+
+# File: test_rate_limiter.py
+# Description: Token buckets and the rate governor on a fake clock: reservations queue callers at the paced rate,
+# response headers tighten the budget with headroom, 429s pause the class, and the shared IP budget paces every
+# endpoint class together.
+
+# ----- LIBRARY --------------------------------------------------
+
+import types as L_Types
+
+import pytest
+
+from backend.market import rate_limiter as M_Rate_Limiter
+from backend.market.rate_limiter import C_Token_Bucket, C_Rate_Governor
+
+# ----- VARIABLE --------------------------------------------------
+
+# Epoch seconds of the fake clock (monotonic time starts at 0)
+EPOCH = 1_700_000_000.0
+TARGET = 0.95
+
+# ----- CLASS --------------------------------------------------
+
+class C_Fake_Clock:
+    # DESC: Stands in for the time module of rate_limiter; time only moves through advance().
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return EPOCH + self.now
+
+    def advance(self, p_seconds):
+        self.now += p_seconds
+
+# ----- FUNCTION --------------------------------------------------
+
+@pytest.fixture
+def clock(monkeypatch):
+    # DESC: Replaces the clock of rate_limiter with a C_Fake_Clock.
+    fake = C_Fake_Clock()
+    monkeypatch.setattr(M_Rate_Limiter, "L_Time", L_Types.SimpleNamespace(monotonic=fake.monotonic, time=fake.time))
+    return fake
+
+def F_Headers(p_limit, p_remaining, p_reset_in):
+    # DESC: Returns Bybit rate limit headers whose reset lies p_reset_in seconds after the fake clock's start.
+    return {'X-Bapi-Limit': str(p_limit), 'X-Bapi-Limit-Status': str(p_remaining),
+            'X-Bapi-Limit-Reset-Timestamp': str(int((EPOCH + p_reset_in) * 1000))}
+
+def test_reserve_queues_callers_at_the_paced_rate(clock):
+    bucket = C_Token_Bucket(10, 2)
+    assert [bucket.reserve(0.0) for _ in range(4)] == [0.0, 0.0, pytest.approx(0.1), pytest.approx(0.2)]
+    assert bucket.throttled == 2
+    # Refill never exceeds the burst capacity
+    assert [bucket.reserve(10.0) for _ in range(3)] == [0.0, 0.0, pytest.approx(0.1)]
+
+def test_observe_keeps_headroom_below_the_server_quota(clock):
+    bucket = C_Token_Bucket(1000, 1000)
+    bucket.observe(100, 50, 0.5, TARGET)
+    # A per-second quota: burst plus one second of refill equals the limit
+    assert bucket.rate == pytest.approx(95) and bucket.capacity == pytest.approx(5)
+    assert bucket.tokens == pytest.approx(45) and bucket.remaining == 50
+    # Remaining quota within the headroom defers the bucket until the reset
+    bucket.observe(100, 4, 0.5, TARGET)
+    assert bucket.blocked_until == pytest.approx(0.5)
+    assert bucket.reserve(0.0) == pytest.approx(0.5 + 1 / 95)
+
+def test_observe_spreads_a_longer_window(clock):
+    bucket = C_Token_Bucket(1000, 1000)
+    bucket.observe(600, 600, 5.0, TARGET)
+    assert bucket.rate == pytest.approx(600 * TARGET / 5) and bucket.capacity == pytest.approx(30)
+    assert bucket.capacity + bucket.rate * 5.0 == pytest.approx(600)
+
+def test_penalize_pauses_until_the_reset(clock):
+    governor = C_Rate_Governor({'kline': (100, 10)}, (1000, 100), TARGET)
+    governor.penalize('kline', F_Headers(100, 0, 2.0))
+    assert governor.status()['kline']['blocked'] == pytest.approx(2.0)
+    # Queued callers resume at the paced rate after the pause
+    assert governor.reserve('kline') == pytest.approx(2.0 + 1 / 95)
+
+@pytest.mark.parametrize("headers", [None, F_Headers(100, 0, 0.0), F_Headers(100, 0, -3.0)])
+def test_penalize_without_future_reset_uses_the_default(clock, headers):
+    governor = C_Rate_Governor({'kline': (100, 10)}, (1000, 100), TARGET)
+    governor.penalize('kline', headers)
+    assert governor.status()['kline']['blocked'] == pytest.approx(M_Rate_Limiter.DEFAULT_PENALTY)
+
+def test_shared_budget_paces_every_class(clock):
+    governor = C_Rate_Governor({'kline': (100, 100), 'tickers': (100, 100)}, (10, 2), TARGET)
+    waits = [governor.reserve(endpoint_class) for endpoint_class in ('kline', 'tickers') * 3]
+    # The class budgets are wide; the shared burst (2 * target) lets one request through, the rest queue
+    assert waits[0] == 0.0 and all(later > earlier for earlier, later in zip(waits[1:], waits[2:]))
+    assert waits[-1] == pytest.approx((6 - 2 * TARGET) / (10 * TARGET))
+    status = governor.status()
+    assert status['shared']['throttled'] == 5 and status['kline']['throttled'] == 0
+    # The bucket of an unknown class inherits the shared budget
+    governor.reserve('orderbook')
+    assert governor.status()['orderbook']['rate'] == status['shared']['rate']
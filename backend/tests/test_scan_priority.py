@@ -0,0 +1,86 @@
+# ----- HEADER --------------------------------------------------
+
+# File: test_scan_priority.py
+# Description: Scan priority: symbols are scored by percentile ranks of turnover and range expansion plus a decaying
+# signal boost, the best-scored head is scanned every cycle and every tail symbol is rotated in periodically.
+
+# ----- LIBRARY --------------------------------------------------
+
+import pytest
+
+from backend.market import scan_priority as M_Scan_Priority
+from backend.market.scan_priority import C_Scan_Priority
+
+# ----- VARIABLE --------------------------------------------------
+
+NOW = 1_700_000_000.0
+CANDLES = M_Scan_Priority.RANGE_LOOKBACK + M_Scan_Priority.RANGE_RECENT + 1
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Universe(p_count):
+    # DESC: Returns p_count symbol dicts; SYM00USDT has the lowest 24h turnover.
+    return [{'symbol': f"SYM{index:02d}USDT", 'volume': 1000.0 * (index + 1)} for index in range(p_count)]
+
+def F_Symbols(p_symbols):
+    # DESC: Returns the symbol names of a list of symbol dicts.
+    return [data['symbol'] for data in p_symbols]
+
+def F_Candles(p_recent_range):
+    # DESC: Returns a bundle whose reference candles span 1.0 and whose last closed candles span p_recent_range.
+    ranges = [1.0] * M_Scan_Priority.RANGE_LOOKBACK + [p_recent_range] * M_Scan_Priority.RANGE_RECENT + [50.0]
+    return {'high': [100.0 + value for value in ranges], 'low': [100.0] * len(ranges)}
+
+def test_percentile_ranks_share_the_lower_rank_on_ties():
+    assert M_Scan_Priority._percentile_ranks({'A': 5.0, 'B': 1.0, 'C': 5.0, 'D': 3.0}) == \
+        {'A': pytest.approx(2 / 3), 'B': 0.0, 'C': pytest.approx(2 / 3), 'D': pytest.approx(1 / 3)}
+    assert M_Scan_Priority._percentile_ranks({'A': 0.0}) == {'A': 1.0}
+
+def test_turnover_orders_the_universe():
+    universe = F_Universe(5)
+    assert F_Symbols(C_Scan_Priority().order(universe, NOW)) == F_Symbols(universe)[::-1]
+
+def test_range_expansion_and_signals_lift_a_symbol():
+    priority = C_Scan_Priority()
+    universe = F_Universe(5)
+    # The forming candle (last) is ignored; the recent closed candles expand 3x against the reference
+    priority.record_candles("SYM00USDT", "15", F_Candles(3.0))
+    # Lowest turnover but the top range rank: 0.3 outranks the 0.125 and 0.25 of SYM01/SYM02 turnover
+    assert F_Symbols(priority.order(universe, NOW)) == ["SYM04USDT", "SYM03USDT", "SYM00USDT", "SYM02USDT",
+                                                        "SYM01USDT"]
+    priority.record_signal("SYM01USDT", NOW)
+    assert F_Symbols(priority.order(universe, NOW))[:4] == ["SYM04USDT", "SYM03USDT", "SYM01USDT", "SYM00USDT"]
+    # The boost halves every SIGNAL_HALF_LIFE, so an old signal no longer outranks turnover
+    later = NOW + 4 * M_Scan_Priority.SIGNAL_HALF_LIFE
+    assert F_Symbols(priority.order(universe, later))[-1] == "SYM01USDT"
+
+def test_short_or_flat_bundles_are_ignored():
+    priority = C_Scan_Priority()
+    priority.record_candles("SYM00USDT", "15", {'high': [2.0] * (CANDLES - 1), 'low': [1.0] * (CANDLES - 1)})
+    priority.record_candles("SYM01USDT", "15", {'high': [1.0] * CANDLES, 'low': [1.0] * CANDLES})
+    assert priority._range_expansion == {}
+
+def test_head_is_scanned_first_and_the_tail_is_rotated_in():
+    priority = C_Scan_Priority()
+    universe = F_Universe(10)
+    priority.record_signal("SYM00USDT", NOW)
+    ordered = priority.order(universe, NOW)
+    head_size, tail_every = 3, 4
+    scanned = {}
+    for cycle in range(1, 2 * tail_every + 1):
+        selected = F_Symbols(M_Scan_Priority.F_Select_Cycle_Symbols(ordered, head_size, tail_every, cycle))
+        # The head is always the best-scored symbols, in score order
+        assert selected[:head_size] == ["SYM09USDT", "SYM08USDT", "SYM07USDT"]
+        for symbol in selected: scanned[symbol] = scanned.get(symbol, 0) + 1
+        if cycle % tail_every: assert len(selected) == head_size
+        else: assert selected == F_Symbols(ordered)
+    # Every symbol is rotated in once per tail_every cycles; the head every cycle
+    assert set(scanned) == set(F_Symbols(universe))
+    assert all(scanned[symbol] == 2 * tail_every for symbol in F_Symbols(ordered)[:head_size])
+    assert all(scanned[symbol] == 2 for symbol in F_Symbols(ordered)[head_size:])
+
+@pytest.mark.parametrize("head_size, tail_every", [(0, 4), (3, 1), (3, 0)])
+def test_rotation_off_scans_everything(head_size, tail_every):
+    ordered = F_Universe(6)
+    for cycle in range(1, 4):
+        assert M_Scan_Priority.F_Select_Cycle_Symbols(ordered, head_size, tail_every, cycle) == ordered
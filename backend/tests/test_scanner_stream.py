@@ -0,0 +1,62 @@
+# ----- HEADER --------------------------------------------------
+
+# File: test_scanner_stream.py
+# Description: Streaming mode cycles: REST warm-up only for pairs the stream does not keep current, and a stream
+# whose thread died is replaced.
+
+# ----- LIBRARY --------------------------------------------------
+
+import threading as L_Thread
+
+import pytest
+
+from backend.market import bybit_service as S_Bybit
+from backend.market import scanner_engine as S_Scanner
+from backend.benchmark.request_count import C_Synthetic_Session
+from backend.benchmark.fake_kline_stream import C_Fake_Kline_Stream
+
+# ----- VARIABLE --------------------------------------------------
+
+PERIODS = ["15", "60"]
+
+# ----- FUNCTION --------------------------------------------------
+
+@pytest.fixture
+def stream_env(monkeypatch):
+    # DESC: Offline market data, a fake kline WebSocket without frames and a clean scanner stream state.
+    session = C_Synthetic_Session(3)
+    server = C_Fake_Kline_Stream([])
+    monkeypatch.setenv("BYBIT_STREAM_URL", server.start())
+    monkeypatch.setattr(S_Scanner, "_scanner_stop_event", L_Thread.Event())
+    S_Bybit.F_Set_Provider(session)
+    S_Bybit.F_Clear_Candle_Cache()
+    S_Bybit.F_Reset_Request_Stats()
+    yield session
+    S_Scanner._stop_kline_stream()
+    S_Bybit.F_Set_Provider(None)
+    S_Bybit.F_Clear_Candle_Cache()
+    server.stop()
+
+def F_Kline_Requests():
+    # DESC: Returns the number of get_kline requests sent so far.
+    return S_Bybit.F_Get_Request_Stats().get('get_kline', 0)
+
+def test_stream_cycle_warms_up_only_new_pairs(stream_env):
+    symbols = [{'symbol': symbol} for symbol in stream_env.symbols]
+    S_Scanner.F_Stream_Cycle(symbols[:2], PERIODS, 10, 0)
+    assert F_Kline_Requests() == 4
+    S_Scanner.F_Stream_Cycle(symbols[:2], PERIODS, 10, 0)
+    assert F_Kline_Requests() == 4
+    S_Scanner.F_Stream_Cycle(symbols, PERIODS, 10, 0)
+    assert F_Kline_Requests() == 6
+
+def test_dead_stream_is_restarted_and_warmed_up(stream_env):
+    symbols = [{'symbol': symbol} for symbol in stream_env.symbols]
+    S_Scanner.F_Stream_Cycle(symbols, PERIODS, 10, 0)
+    dead = S_Scanner._kline_stream
+    dead.stop()
+    assert not dead.is_alive()
+    S_Scanner.F_Stream_Cycle(symbols, PERIODS, 10, 0)
+    assert S_Scanner._kline_stream is not dead and S_Scanner._kline_stream.is_alive()
+    # The gap since the stream died is requested for every pair
+    assert F_Kline_Requests() == 12
@@ -0,0 +1,67 @@
+# ----- HEADER --------------------------------------------------
+
+# File: test_single_flight.py
+# Description: Request coalescing: concurrent callers of one key share a single call and its result, followers are
+# released with the leader's error when it fails, and the next call after a flight goes out again.
+
+# ----- LIBRARY --------------------------------------------------
+
+import time as L_Time
+import threading as L_Thread
+
+from backend.market.single_flight import C_Single_Flight
+
+# ----- VARIABLE --------------------------------------------------
+
+CALLERS = 8
+TIMEOUT = 10.0
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Run_Concurrently(p_flight, p_key, p_func):
+    # DESC: Calls p_flight.do(p_key, p_func) from CALLERS threads. p_func blocks until every other caller has
+    # joined the flight. Returns the outcome of every caller: ('result', value) or ('error', exception).
+    outcomes = []
+    released = L_Thread.Event()
+    def leader_call():
+        released.wait(TIMEOUT)
+        return p_func()
+    def call():
+        try: outcomes.append(('result', p_flight.do(p_key, leader_call)))
+        except Exception as e: outcomes.append(('error', e))
+    threads = [L_Thread.Thread(target=call) for _ in range(CALLERS)]
+    for thread in threads: thread.start()
+    deadline = L_Time.time() + TIMEOUT
+    while p_flight.get_stats()['hits'] < CALLERS - 1 and L_Time.time() < deadline: L_Time.sleep(0.005)
+    released.set()
+    for thread in threads: thread.join(TIMEOUT)
+    return outcomes
+
+def test_concurrent_callers_share_one_call():
+    flight, calls = C_Single_Flight(), []
+    def fetch():
+        calls.append(1)
+        return {'result': {'list': []}}
+    outcomes = F_Run_Concurrently(flight, ('get_kline', "BTCUSDT", "15"), fetch)
+    assert len(calls) == 1 and len(outcomes) == CALLERS
+    # Every caller receives the very same result object
+    assert all(kind == 'result' and value is outcomes[0][1] for kind, value in outcomes)
+    assert flight.get_stats() == {'hits': CALLERS - 1, 'misses': 1, 'in_flight': 0}
+
+def test_followers_are_released_when_the_leader_fails():
+    flight, calls = C_Single_Flight(), []
+    error = ConnectionError("offline")
+    def fetch():
+        calls.append(1)
+        raise error
+    outcomes = F_Run_Concurrently(flight, ('get_kline', "BTCUSDT", "15"), fetch)
+    assert len(calls) == 1 and outcomes == [('error', error)] * CALLERS
+    assert flight.get_stats()['in_flight'] == 0
+    # A failed flight is not cached: the next call goes out again
+    assert flight.do(('get_kline', "BTCUSDT", "15"), lambda: "retried") == "retried"
+
+def test_different_keys_do_not_coalesce():
+    flight = C_Single_Flight()
+    assert flight.do(('get_kline', "BTCUSDT", "15"), lambda: 1) == 1
+    assert flight.do(('get_kline', "BTCUSDT", "60"), lambda: 2) == 2
+    assert flight.get_stats() == {'hits': 0, 'misses': 2, 'in_flight': 0}
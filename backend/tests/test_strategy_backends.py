@@ -0,0 +1,146 @@
+# ----- HEADER --------------------------------------------------
+
+# File: test_strategy_backends.py
+# Description: Every strategy implementation against the reference (zigzag_reference.py): ZigZag points, long/short
+# signals and Fibonacci levels on hand-built long and short setups and on random series.
+
+# ----- LIBRARY --------------------------------------------------
+
+import random as L_Random
+
+import pytest
+
+from backend.trade import signal_logic as S_Strategy
+from backend.trade import signal_numpy as M_Numpy
+from backend.trade import signal_batch as M_Signal_Batch
+from backend.trade import signal_numba as M_Numba
+from backend.trade import zigzag_stream as M_ZigZag_Stream
+from backend.benchmark.zigzag_equivalence import F_Random_Candles
+from backend.benchmark.zigzag_stream_replay import F_Build_Windows
+from backend.benchmark.zigzag_reference import (F_Get_ZigZag_Reference, F_Get_Long_Signal_Reference,
+                                                F_Get_Short_Signal_Reference, F_Get_Fibonacci_Reference)
+
+# ----- VARIABLE --------------------------------------------------
+
+# (low, high) bars whose period-2 pivots form HH-LH-HH (long) and LL-LH-LL (short) setups; the bars between A and B
+# touch the Fibonacci chain levels in order, so the reference emits the signal
+LONG_BARS = [(99, 100), (103, 104), (106, 108), (102, 104), (96, 98), (96, 98), (97, 99), (98, 100), (97, 98),
+             (97, 98), (99, 102), (102, 105), (105, 108), (108, 111), (111, 114), (118, 120), (115, 117),
+             (113, 115), (113, 115)]
+SHORT_BARS = [(120, 122), (124, 126), (128, 130), (122, 125), (110, 114), (104, 107), (108, 112), (112, 116),
+              (116, 120), (114, 117), (111, 113.5), (109, 111), (106, 108.5), (100, 102), (101, 103), (102, 104)]
+PATTERN_PERIOD = 2
+
+# Random series (length up to MAX_LENGTH, zigzag period up to MAX_PERIOD) compared per implementation
+RANDOM_CASES = 150
+RANDOM_SEED = 7
+MAX_LENGTH = 400
+MAX_PERIOD = 20
+
+# Scanner-like kline windows replayed through the incremental engine: (candles, window, zigzag period)
+STREAM_REPLAYS = [(300, 60, 2), (300, 80, 5)]
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Pattern_Candles(p_bars):
+    # DESC: Returns (close, high, low) of (low, high) bars, closing mid-range.
+    return ([(low + high) / 2 for low, high in p_bars], [float(high) for _, high in p_bars],
+            [float(low) for low, _ in p_bars])
+
+def F_Cases():
+    # DESC: Returns (close, high, low, period) cases: the long and short setups, then the random series.
+    cases = [F_Pattern_Candles(LONG_BARS) + (PATTERN_PERIOD,), F_Pattern_Candles(SHORT_BARS) + (PATTERN_PERIOD,)]
+    rng = L_Random.Random(RANDOM_SEED)
+    for _ in range(RANDOM_CASES):
+        length, period = rng.randint(0, MAX_LENGTH), rng.randint(0, MAX_PERIOD)
+        cases.append(F_Random_Candles(rng, length) + (period,))
+    return cases
+
+CASES = F_Cases()
+
+def F_Reference(p_close, p_high, p_low, p_period):
+    # DESC: Returns the reference (zigzag, long, short, fibonacci) of one case.
+    return (F_Get_ZigZag_Reference(p_close, p_high, p_low, p_period),
+            F_Get_Long_Signal_Reference(p_close, p_high, p_low, p_period),
+            F_Get_Short_Signal_Reference(p_close, p_high, p_low, p_period),
+            F_Get_Fibonacci_Reference(p_close, p_high, p_low))
+
+@pytest.fixture(scope="module")
+def references():
+    # DESC: Reference output of every case, computed once.
+    return [F_Reference(*case) for case in CASES]
+
+def test_cases_produce_long_and_short_signals(references):
+    assert references[0][1]['signal'] == 'long' and references[0][2]['signal'] == 'none'
+    assert references[1][1]['signal'] == 'none' and references[1][2]['signal'] == 'short'
+
+def test_python_functions_match_reference(references):
+    for (close, high, low, period), expected in zip(CASES, references):
+        actual = (S_Strategy.F_Get_ZigZag(close, high, low, period),
+                  S_Strategy.F_Get_Long_Signal(close, high, low, period),
+                  S_Strategy.F_Get_Short_Signal(close, high, low, period),
+                  S_Strategy.F_Get_Fibonacci(close, high, low))
+        assert actual == expected, (len(close), period)
+
+def F_Context_Output(p_context, p_period):
+    # DESC: Returns (zigzag, long, short, fibonacci) of an analysis context, in the order of F_Reference.
+    return (p_context.zigzag(p_period), S_Strategy.F_Find_Long_Signal(p_context, p_period),
+            S_Strategy.F_Find_Short_Signal(p_context, p_period), S_Strategy.F_Find_Fibonacci(p_context))
+
+def test_python_context_matches_reference(references):
+    for (close, high, low, period), expected in zip(CASES, references):
+        context = S_Strategy.F_Create_Context(close, high, low, 'python')
+        assert F_Context_Output(context, period) == expected, (len(close), period)
+        # The shared pivots are computed once and reused by every consumer
+        assert context.zigzag(period) is context.zigzag(period)
+
+@pytest.mark.skipif(not M_Numpy.F_Is_Available(), reason="NumPy is not installed")
+def test_numpy_context_matches_reference(references):
+    for (close, high, low, period), expected in zip(CASES, references):
+        context = S_Strategy.F_Create_Context(close, high, low, 'numpy')
+        assert isinstance(context, M_Numpy.C_Numpy_Context)
+        assert F_Context_Output(context, period) == expected, (len(close), period)
+
+def F_Growing_Windows(p_close, p_high, p_low):
+    # DESC: Returns the kline bundles of a series as the scanner sees it candle by candle: every prefix, whose last
+    # candle is the forming one.
+    return [{'start_time': [float(index) for index in range(end)], 'close': p_close[:end], 'high': p_high[:end],
+             'low': p_low[:end]} for end in range(1, len(p_close) + 1)]
+
+def test_incremental_engine_matches_reference():
+    M_ZigZag_Stream.F_Clear()
+    replays = [(F_Growing_Windows(*case[:3]), case[3]) for case in CASES[:2]]
+    replays += [(F_Build_Windows(candles, window, RANDOM_SEED), period) for candles, window, period in STREAM_REPLAYS]
+    signals = set()
+    for replay, (windows, period) in enumerate(replays):
+        for window in windows:
+            close, high, low = window['close'], window['high'], window['low']
+            context = M_ZigZag_Stream.F_Create_Context(f"SYM{replay}", "15", period, window)
+            expected = F_Reference(close, high, low, period)
+            assert F_Context_Output(context, period) == expected, (replay, len(close))
+            signals.update(result['signal'] for result in expected[1:3])
+    assert {'long', 'short'} <= signals
+    assert M_ZigZag_Stream.F_Get_Stats()['appended'] > 0
+    M_ZigZag_Stream.F_Clear()
+
+def test_batch_contexts_match_reference(references):
+    # One batch per zigzag period, mixing series of different lengths
+    periods = {}
+    for index, case in enumerate(CASES): periods.setdefault(case[3], []).append(index)
+    for period, indexes in periods.items():
+        bundles = [{'close': CASES[index][0], 'high': CASES[index][1], 'low': CASES[index][2]} for index in indexes]
+        contexts = M_Signal_Batch.F_Create_Contexts(bundles, (period, S_Strategy.FIBONACCI_PERIOD))
+        for index, context in zip(indexes, contexts):
+            assert F_Context_Output(context, period) == references[index], (index, period)
+
+@pytest.mark.skipif(M_Numba.L_NP is None, reason="NumPy is not installed")
+def test_numba_context_matches_reference(references):
+    # Compiled kernels when Numba is installed, otherwise the same kernels run as plain Python
+    for (close, high, low, period), expected in zip(CASES, references):
+        context = M_Numba.C_Numba_Context(close, high, low)
+        assert F_Context_Output(context, period) == expected, (len(close), period)
+
+@pytest.mark.skipif(not M_Numba.F_Is_Available(), reason="Numba is not installed")
+def test_numba_backend_is_selected():
+    close, high, low = F_Pattern_Candles(LONG_BARS)
+    assert isinstance(S_Strategy.F_Create_Context(close, high, low, 'numba'), M_Numba.C_Numba_Context)
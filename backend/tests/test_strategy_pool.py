@@ -0,0 +1,53 @@
+# ----- HEADER --------------------------------------------------
+
+# File: test_strategy_pool.py
+# Description: Strategy process pool: the pool is off by default, a worker process returns the results of the
+# in-thread evaluation, and a scan whose pool was closed under it evaluates in the scanning thread.
+
+# ----- LIBRARY --------------------------------------------------
+
+import random as L_Random
+
+from backend.core import config as M_Bybit
+from backend.trade import evaluation_cache as M_Evaluation_Cache
+
+from backend.market import scanner_engine as S_Scanner
+from backend.trade import strategy_pool as M_Strategy_Pool
+from backend.trade import strategy_registry as M_Strategy_Registry
+from backend.benchmark.zigzag_equivalence import F_Random_Candles
+
+# ----- FUNCTION --------------------------------------------------
+
+def test_pool_is_off_by_default():
+    assert S_Scanner.DEFAULT_STRATEGY_PROCESSES == 0
+
+def test_pool_matches_in_thread_evaluation():
+    rng = L_Random.Random(3)
+    strategies = M_Strategy_Registry.F_Get_Strategies("15")
+    bundles = []
+    for _ in range(4):
+        closes, highs, lows = F_Random_Candles(rng, 300)
+        bundles.append({'close': closes, 'high': highs, 'low': lows})
+    pool = M_Strategy_Pool.C_Strategy_Pool(1)
+    try:
+        for bundle in bundles:
+            expected = M_Strategy_Pool.F_Evaluate_Strategies(strategies, bundle, 5)
+            assert pool.evaluate(strategies, bundle, 5) == expected
+    finally:
+        pool.close()
+    assert not pool.broken
+
+def test_closed_pool_falls_back_to_the_scanning_thread(monkeypatch):
+    closes, highs, lows = F_Random_Candles(L_Random.Random(5), 300)
+    candles = {'start_time': [float(index) for index in range(300)], 'close': closes, 'high': highs, 'low': lows}
+    strategies = M_Strategy_Registry.F_Get_Strategies("15")
+    monkeypatch.setattr(S_Scanner, "_evaluation_cache", M_Evaluation_Cache.C_Evaluation_Cache())
+    monkeypatch.setattr(M_Bybit, "F_Get_Settings", lambda: {'strategy_processes': 0})
+    expected = S_Scanner._evaluate("SYMUSDT", "15", 5, candles, strategies)
+    # The pool is closed between F_Get_Pool and evaluate, e.g. by a settings change
+    pool = M_Strategy_Pool.C_Strategy_Pool(1)
+    pool.close()
+    monkeypatch.setattr(S_Scanner, "_evaluation_cache", M_Evaluation_Cache.C_Evaluation_Cache())
+    monkeypatch.setattr(M_Bybit, "F_Get_Settings", lambda: {'strategy_processes': 1})
+    monkeypatch.setattr(M_Strategy_Pool, "F_Get_Pool", lambda p_processes: pool)
+    assert S_Scanner._evaluate("SYMUSDT", "15", 5, candles, strategies) == expected
@@ -0,0 +1,48 @@
+# ----- HEADER --------------------------------------------------
+
+# File: test_strategy_registry.py
+# Description: Strategy interface and registry: abstract interface, read-only patterns, strategies per interval and
+# picklable strategies for the process pool.
+
+# ----- LIBRARY --------------------------------------------------
+
+import pickle as L_Pickle
+
+import pytest
+
+from backend.trade import strategy_registry as M_Strategy_Registry
+
+# ----- CLASS --------------------------------------------------
+
+class C_Incomplete_Strategy(M_Strategy_Registry.C_Strategy):
+    # DESC: Strategy without evaluate().
+    name = 'incomplete'
+
+class C_Hourly_Strategy(M_Strategy_Registry.C_Strategy):
+    # DESC: Strategy limited to the 1h interval.
+    name = 'hourly'
+    intervals = ("60",)
+
+    def evaluate(self, p_context, p_candles, p_zigzag_period):
+        return {}
+
+# ----- FUNCTION --------------------------------------------------
+
+def test_strategies_must_implement_the_interface():
+    with pytest.raises(TypeError): M_Strategy_Registry.C_Strategy()
+    with pytest.raises(TypeError): C_Incomplete_Strategy()
+
+def test_patterns_are_read_only():
+    strategy = M_Strategy_Registry.C_Fibonacci_Chain_Strategy()
+    with pytest.raises(TypeError): strategy.patterns['long'] = 'changed'
+    assert M_Strategy_Registry.C_Strategy.patterns == {}
+
+def test_strategies_run_only_on_their_intervals(monkeypatch):
+    monkeypatch.setattr(M_Strategy_Registry, "_strategies", dict(M_Strategy_Registry._strategies))
+    M_Strategy_Registry.F_Register(C_Hourly_Strategy())
+    assert [strategy.name for strategy in M_Strategy_Registry.F_Get_Strategies("60")] == ['fibonacci_chain', 'hourly']
+    assert [strategy.name for strategy in M_Strategy_Registry.F_Get_Strategies("15")] == ['fibonacci_chain']
+
+def test_strategies_are_picklable():
+    strategies = M_Strategy_Registry.F_Get_Strategies("15")
+    assert [strategy.name for strategy in L_Pickle.loads(L_Pickle.dumps(strategies))] == ['fibonacci_chain']
@@ -0,0 +1,73 @@
+# ----- HEADER --------------------------------------------------
+
+# File: evaluation_cache.py
+# Description: Dirty tracking for strategy evaluation: results are reused until a new candle closes.
+
+# ----- LIBRARY --------------------------------------------------
+
+import threading as L_Thread
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# ----- CLASS --------------------------------------------------
+
+class C_Evaluation_Cache:
+    # DESC: Stores the last strategy evaluation per (symbol, interval, zigzag_period) together with the candle stamp
+    # it was computed from. get() returns the stored result only while the stamp is unchanged, i.e. no candle has
+    # closed since. stats counts hits (evaluations skipped) and misses (evaluations computed).
+    def __init__(self):
+        self.stats = {'hits': 0, 'misses': 0}
+        self._entries: Dict[Hashable, Tuple[Hashable, Any]] = {}
+        self._lock = L_Thread.Lock()
+
+    def get(self, p_key: Hashable, p_stamp: Hashable) -> Optional[Any]:
+        # DESC: Returns the cached result for p_key if it was computed from p_stamp, otherwise None (a miss).
+        with self._lock:
+            entry = self._entries.get(p_key)
+            if entry is not None and entry[0] == p_stamp:
+                self.stats['hits'] += 1
+                return entry[1]
+            self.stats['misses'] += 1
+            return None
+
+    def is_fresh(self, p_key: Hashable, p_stamp: Hashable) -> bool:
+        # DESC: Returns True if get() would hit, without counting a lookup.
+        with self._lock:
+            entry = self._entries.get(p_key)
+            return entry is not None and entry[0] == p_stamp
+
+    def put(self, p_key: Hashable, p_stamp: Hashable, p_result: Any):
+        # DESC: Stores the result computed for p_key from p_stamp.
+        with self._lock: self._entries[p_key] = (p_stamp, p_result)
+
+    def evict(self, p_active_symbols: Iterable[str]) -> int:
+        # DESC: Drops the entries of symbols that left the scan universe (keys start with the symbol).
+        # Returns the number of evicted entries.
+        active = set(p_active_symbols)
+        with self._lock:
+            stale = [key for key in self._entries if key[0] not in active]
+            for key in stale: del self._entries[key]
+            return len(stale)
+
+    def clear(self):
+        # DESC: Drops every entry and resets the counters.
+        with self._lock:
+            self._entries.clear()
+            for key in self.stats: self.stats[key] = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        # DESC: Returns hits, misses, hit rate and the number of stored evaluations.
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            hit_rate = round(self.stats['hits'] / lookups, 3) if lookups else 0.0
+            return dict(self.stats, hit_rate=hit_rate, entries=len(self._entries))
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Get_Candle_Stamp(p_candles: Dict[str, List[float]]) -> Optional[Tuple]:
+    # DESC: Returns the stamp identifying the strategy inputs of a candle bundle: the open time of the last closed
+    # candle and the bundle length, plus the high/low of the forming candle, because the newest pivot test
+    # still looks at it. Returns None for an empty bundle.
+    starts = p_candles.get('start_time')
+    if not starts: return None
+    last_closed = starts[-2] if len(starts) > 1 else None
+    return (last_closed, len(starts), p_candles['high'][-1], p_candles['low'][-1])
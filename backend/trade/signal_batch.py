@@ -0,0 +1,92 @@
+# ----- HEADER --------------------------------------------------
+
+# File: signal_batch.py
+# Description: Cross-symbol batch evaluation: the candles of many symbols are stacked into (symbols x bars)
+# matrices and their pivots and bar ranges are computed in a few vectorized passes.
+# Requires NumPy; without it every bundle gets a pure-Python analysis context.
+
+# ----- LIBRARY --------------------------------------------------
+
+from typing import Dict, Iterable, List
+
+from backend.trade import signal_logic as S_Strategy
+from backend.trade import signal_numpy as M_Numpy
+
+if M_Numpy.F_Is_Available():
+    import numpy as L_NP
+
+# ----- CLASS --------------------------------------------------
+
+class C_Batch_Context(M_Numpy.C_Numpy_Context):
+    # DESC: NumPy analysis context over one row of a batch: arrays, bar ranges and the pivots of the batch periods
+    # are taken from the batch instead of being computed per symbol.
+    def __init__(self, p_close, p_high, p_low, p_rows, p_zigzag):
+        S_Strategy.C_Analysis_Context.__init__(self, p_close, p_high, p_low)
+        self._high, self._low, self._bar_min, self._bar_max = p_rows
+        self._zigzag = p_zigzag
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Create_Contexts(p_bundles: List[Dict[str, List[float]]], p_periods: Iterable[int]) -> List:
+    # DESC: Returns one analysis context per candle bundle (in order) with the ZigZag of every period in p_periods
+    # already computed. Bundles of equal length are evaluated together; results are identical to evaluating
+    # each bundle on its own.
+    if not M_Numpy.F_Is_Available():
+        return [S_Strategy.C_Analysis_Context(bundle['close'], bundle['high'], bundle['low']) for bundle in p_bundles]
+    periods = list(dict.fromkeys(p_periods))
+    contexts = [None] * len(p_bundles)
+    groups = {}
+    for index, bundle in enumerate(p_bundles): groups.setdefault(len(bundle['close']), []).append(index)
+    for length, indexes in groups.items():
+        bundles = [p_bundles[index] for index in indexes]
+        highs = L_NP.array([bundle['high'] for bundle in bundles], dtype=L_NP.float64)
+        lows = L_NP.array([bundle['low'] for bundle in bundles], dtype=L_NP.float64)
+        closes = L_NP.array([bundle['close'] for bundle in bundles], dtype=L_NP.float64)
+        bar_min = L_NP.minimum(L_NP.minimum(highs, lows), closes)
+        bar_max = L_NP.maximum(L_NP.maximum(highs, lows), closes)
+        zigzags = [{} for _ in bundles]
+        for period in periods:
+            if length < period * 2:
+                for zigzag in zigzags: zigzag[period] = []
+                continue
+            if period <= 0: continue
+            for row, pivots in enumerate(F_Get_Pivots(highs, lows, period)):
+                zigzags[row][period] = S_Strategy.F_Label_Pivots(bundles[row]['high'], bundles[row]['low'], pivots)
+        for row, index in enumerate(indexes):
+            bundle = bundles[row]
+            contexts[index] = C_Batch_Context(bundle['close'], bundle['high'], bundle['low'],
+                                              (highs[row], lows[row], bar_min[row], bar_max[row]), zigzags[row])
+    return contexts
+
+def F_Get_Pivots(p_highs, p_lows, p_period):
+    # DESC: Returns the pivots of every row of (symbols x bars) high/low matrices as lists of (index, is_high) in
+    # bar order (see signal_logic.F_Get_ZigZag). Requires p_period > 0 and at least 2 * p_period bars.
+    count = p_highs.shape[1]
+    window_highs = _window_extremes(p_highs, p_period, L_NP.maximum)
+    window_lows = _window_extremes(p_lows, p_period, L_NP.minimum)
+    bars = L_NP.arange(p_period, count - p_period)
+    highs, lows = p_highs[:, bars], p_lows[:, bars]
+    is_high = (window_highs[:, bars - p_period] < highs) & (window_highs[:, bars + 1] < highs)
+    is_low = (window_lows[:, bars - p_period] > lows) & (window_lows[:, bars + 1] > lows)
+    rows, columns = L_NP.nonzero(is_high | is_low)
+    pivots = [[] for _ in range(p_highs.shape[0])]
+    for row, column, high in zip(rows.tolist(), columns.tolist(), is_high[rows, columns].tolist()):
+        pivots[row].append((column + p_period, high))
+    return pivots
+
+def _window_extremes(p_matrix, p_width, p_ufunc):
+    """
+    Returns the maximum (p_ufunc = numpy.maximum) or minimum of every window of p_width bars along the rows,
+    shape (rows, bars - p_width + 1), in O(bars) per row: running extremes within blocks of p_width bars, from the
+    left and from the right, combine into any window that spans at most two blocks (van Herk / Gil-Werman).
+    """
+    rows, count = p_matrix.shape
+    blocks = -(-count // p_width)
+    fill = -L_NP.inf if p_ufunc is L_NP.maximum else L_NP.inf
+    padded = L_NP.full((rows, blocks * p_width), fill)
+    padded[:, :count] = p_matrix
+    shaped = padded.reshape(rows, blocks, p_width)
+    prefix = p_ufunc.accumulate(shaped, axis=2).reshape(rows, -1)
+    suffix = p_ufunc.accumulate(shaped[:, :, ::-1], axis=2)[:, :, ::-1].reshape(rows, -1)
+    windows = count - p_width + 1
+    return p_ufunc(suffix[:, :windows], prefix[:, p_width - 1:p_width - 1 + windows])
@@ -3,8 +3,74 @@
 # File: signal_logic.py
 # Description: Auto-generated header for structural compliance.
 
+# ----- LIBRARY --------------------------------------------------
+
+from collections import deque as L_Deque
+
+# ----- VARIABLE --------------------------------------------------
+
+# ZigZag period of the Fibonacci levels shown next to a signal and in the scanner status
+FIBONACCI_PERIOD = 10
+
+# Strategy backends (strategy_backend setting): "python" is the reference implementation, "numpy" vectorizes pivot
+# detection and chain validation (signal_numpy.py), "numba" runs them in compiled kernels (signal_numba.py) and
+# "auto" picks "numba" when Numba is installed, else "python". All of them produce identical signals. The accelerated
+# backends are opt-in (requirements-optional.txt); the default is the dependency-free reference.
+STRATEGY_BACKENDS = ('auto', 'python', 'numpy', 'numba')
+DEFAULT_STRATEGY_BACKEND = 'python'
+
+# ----- CLASS --------------------------------------------------
+
+class C_Analysis_Context:
+    # DESC: Candles of one symbol/period with their ZigZag pivots computed once per zigzag period, shared by the
+    # long/short detectors, the Fibonacci levels and the status display. Returned pivot lists must not be mutated.
+    def __init__(self, p_close, p_high, p_low):
+        self.close = p_close
+        self.high = p_high
+        self.low = p_low
+        self._zigzag = {}
+
+    def zigzag(self, p_period):
+        # DESC: Returns the ZigZag points [index, price, label] for p_period, computing them on first use.
+        points = self._zigzag.get(p_period)
+        if points is None: points = self._zigzag[p_period] = self.compute_zigzag(p_period)
+        return points
+
+    def compute_zigzag(self, p_period):
+        # DESC: Computes the ZigZag points; overridden by the accelerated strategy backends.
+        return F_Get_ZigZag(self.close, self.high, self.low, p_period)
+
+    def find_touch(self, p_right, p_left, p_level, p_avoid_level=None):
+        # DESC: Chain validation step. Scans bars p_right down to p_left and returns the first bar whose
+        # high/low/close range contains p_level but not p_avoid_level (None: no level to avoid), else None.
+        p_high, p_low, p_close = self.high, self.low, self.close
+        for j in range(p_right, p_left - 1, -1):
+            values = [p_high[j], p_low[j], p_close[j]]
+            touched = min(values) <= p_level <= max(values)
+            not_touched = False
+            if p_avoid_level is not None: not_touched = min(values) <= p_avoid_level <= max(values)
+            if touched and not not_touched: return j
+        return None
+
 # ----- FUNCTION --------------------------------------------------
 
+def F_Create_Context(p_close, p_high, p_low, p_backend=DEFAULT_STRATEGY_BACKEND):
+    # DESC: Returns an analysis context of the requested strategy backend (pure Python if its library is missing)
+    if p_backend in ('numba', 'auto'):
+        from backend.trade import signal_numba as M_Numba
+        if M_Numba.F_Is_Available(): return M_Numba.C_Numba_Context(p_close, p_high, p_low)
+    if p_backend == 'numpy':
+        from backend.trade import signal_numpy as M_Numpy
+        if M_Numpy.F_Is_Available(): return M_Numpy.C_Numpy_Context(p_close, p_high, p_low)
+    return C_Analysis_Context(p_close, p_high, p_low)
+
+def F_Get_Strategy_Backends():
+    # DESC: Returns the concrete strategy backends (not "auto") that can run in this environment
+    from backend.trade import signal_numpy as M_Numpy
+    from backend.trade import signal_numba as M_Numba
+    available = {'python': True, 'numpy': M_Numpy.F_Is_Available(), 'numba': M_Numba.F_Is_Available()}
+    return [backend for backend in STRATEGY_BACKENDS if available.get(backend)]
+
 def F_Get_Highest(p_high, p_period):
     # DESC: Implements logic similar to TradingView's ta.highestbars function
     if len(p_high) < p_period: return None
@@ -22,49 +88,59 @@ def F_Get_Lowest(p_low, p_period):
 def F_Get_ZigZag(p_close, p_high, p_low, p_period):
     # DESC: Generates zigzag data points similar to TradingView's zigzag indicator
     if len(p_close) < p_period * 2: return []
-    zigzag_points = []
+    # Bar i is a pivot when it is strictly above (below) every other bar within p_period on both sides, i.e. above
+    # the extreme of the p_period bars before it and of the p_period bars after it. Both are read from one sliding
+    # window extreme series, so the test is O(1) per bar.
+    window_highs = _window_extremes(p_high, p_period, True)
+    window_lows = _window_extremes(p_low, p_period, False)
+    pivots = []
     for i in range(p_period, len(p_close) - p_period):
-        is_high = True
-        for j in range(i - p_period, i + p_period + 1):
-            if j != i and p_high[j] >= p_high[i]:
-                is_high = False
-                break
-        
-        is_low = True
-        for j in range(i - p_period, i + p_period + 1):
-            if j != i and p_low[j] <= p_low[i]:
-                is_low = False
-                break
-        
+        if p_period:
+            is_high = window_highs[i - p_period] < p_high[i] and window_highs[i + 1] < p_high[i]
+            is_low = window_lows[i - p_period] > p_low[i] and window_lows[i + 1] > p_low[i]
+        else: is_high = is_low = True
+        if is_high or is_low: pivots.append((i, is_high))
+    return F_Label_Pivots(p_high, p_low, pivots)
+
+def F_Label_Pivots(p_high, p_low, p_pivots):
+    # DESC: Labels pivots given as (index, is_high) pairs in bar order (a bar that is both a high and a low pivot
+    # counts as high) and returns the ZigZag points [index, price, label]
+    zigzag_points = []
+    # Running extrema of the labeled points replace rescanning all previous points for every new pivot:
+    # highs are compared with the highest HH/HL point, lows with the lowest LL/LH point
+    max_high = None
+    min_low = None
+    for i, is_high in p_pivots:
         if is_high:
-            if len(zigzag_points) > 0:
-                prev_highs = []
-                for point in zigzag_points:
-                    if point[2] in ['HH', 'HL']: prev_highs.append(point[1])
-                
-                if prev_highs:
-                    max_prev_high = max(prev_highs)
-                    if p_high[i] > max_prev_high: label = 'HH'  # Higher High
-                    else: label = 'LH'  # Lower High
-                else: label = 'HH'  # First high point
-            else: label = 'HH'  # First point
-            zigzag_points.append([i, p_high[i], label])
-        
-        elif is_low:
-            if len(zigzag_points) > 0:
-                prev_lows = []
-                for point in zigzag_points:
-                    if point[2] in ['LL', 'LH']: prev_lows.append(point[1])
-                
-                if prev_lows:
-                    min_prev_low = min(prev_lows)
-                    if p_low[i] < min_prev_low: label = 'LL'  # Lower Low
-                    else: label = 'HL'  # Higher Low
-                else: label = 'LL'  # First low point
-            else: label = 'LL'  # First point
-            zigzag_points.append([i, p_low[i], label])
+            price = p_high[i]
+            if max_high is None or price > max_high: label = 'HH'  # Higher High (or first high point)
+            else: label = 'LH'  # Lower High
+        else:
+            price = p_low[i]
+            if min_low is None or price < min_low: label = 'LL'  # Lower Low (or first low point)
+            else: label = 'HL'  # Higher Low
+        zigzag_points.append([i, price, label])
+        if label in ('HH', 'HL'): max_high = price if max_high is None else max(max_high, price)
+        if label in ('LL', 'LH'): min_low = price if min_low is None else min(min_low, price)
     return zigzag_points
 
+def _window_extremes(p_values, p_width, p_highest):
+    """
+    Returns the maximum (p_highest) or minimum of every window p_values[k:k + p_width], k = 0..len - p_width,
+    using a monotonic deque of candidate indices (O(n) overall).
+    """
+    if p_width <= 0: return []
+    extremes, window = [], L_Deque()
+    for k, value in enumerate(p_values):
+        if p_highest:
+            while window and p_values[window[-1]] <= value: window.pop()
+        else:
+            while window and p_values[window[-1]] >= value: window.pop()
+        window.append(k)
+        if window[0] <= k - p_width: window.popleft()
+        if k >= p_width - 1: extremes.append(p_values[window[0]])
+    return extremes
+
 def F_Calculate_Fib_Levels_Long(p_b_point, p_x_point):
     # DESC: Calculates Fibonacci retracement levels for long positions between X (bottom) and B (last HH). 0 level at B, 1 at X.
     diff = p_b_point - p_x_point
@@ -100,7 +176,11 @@ def F_Calculate_Fib_Levels_Short(p_b_point, p_x_point):
 
 def F_Get_Long_Signal(p_close, p_high, p_low, p_zigzag_period):
     # DESC: Finds HH(a)-LH(x)-HH(b) pattern in ZigZag series, calculates AxB Fibonacci levels, and performs chain validation
-    zigzag_points = F_Get_ZigZag(p_close, p_high, p_low, p_zigzag_period)
+    return F_Find_Long_Signal(C_Analysis_Context(p_close, p_high, p_low), p_zigzag_period)
+
+def F_Find_Long_Signal(p_context, p_zigzag_period):
+    # DESC: F_Get_Long_Signal over the shared pivots of an analysis context
+    zigzag_points = p_context.zigzag(p_zigzag_period)
     if len(zigzag_points) < 3: return {"signal": "none", "reason": "Not enough ZigZag points"}
     for i in range(len(zigzag_points) - 2):
         label_a, label_x, label_b = zigzag_points[i][2], zigzag_points[i+1][2], zigzag_points[i+2][2]
@@ -122,26 +202,20 @@ def F_Get_Long_Signal(p_close, p_high, p_low, p_zigzag_period):
             right = b_idx
             left = a_idx
             for step, (must_touch, must_not_touch) in enumerate(chain):
-                found = False
-                touch_idx = None
-                for j in range(right, left-1, -1):
-                    values = [p_high[j], p_low[j], p_close[j]]
-                    touched = min(values) <= fib[must_touch] <= max(values)
-                    not_touched = False
-                    if must_not_touch: not_touched = min(values) <= fib[must_not_touch] <= max(values)
-                    if touched and not not_touched:
-                        found = True
-                        touch_idx = j
-                        break
-
-                if not found: return {"signal": "none", "reason": f"Chain validation failed at {must_touch}"}
+                touch_idx = p_context.find_touch(right, left, fib[must_touch],
+                                                 fib[must_not_touch] if must_not_touch else None)
+                if touch_idx is None: return {"signal": "none", "reason": f"Chain validation failed at {must_touch}"}
                 right = touch_idx - 1  # Narrow down the range for next step
             return {"signal": "long", "reason": "Long signal generated with AxB ZigZag and Fibonacci chain"}
     return {"signal": "none", "reason": "No HH-LH-HH pattern found"}
 
 def F_Get_Short_Signal(p_close, p_high, p_low, p_zigzag_period):
     # DESC: Finds LL(a)-LH(x)-LL(b) pattern in ZigZag series, calculates AxB Fibonacci levels, and performs chain validation
-    zigzag_points = F_Get_ZigZag(p_close, p_high, p_low, p_zigzag_period)
+    return F_Find_Short_Signal(C_Analysis_Context(p_close, p_high, p_low), p_zigzag_period)
+
+def F_Find_Short_Signal(p_context, p_zigzag_period):
+    # DESC: F_Get_Short_Signal over the shared pivots of an analysis context
+    zigzag_points = p_context.zigzag(p_zigzag_period)
     if len(zigzag_points) < 3: return {"signal": "none", "reason": "Not enough ZigZag points"}
     for i in range(len(zigzag_points) - 2):
         label_a, label_x, label_b = zigzag_points[i][2], zigzag_points[i+1][2], zigzag_points[i+2][2]
@@ -163,29 +237,38 @@ def F_Get_Short_Signal(p_close, p_high, p_low, p_zigzag_period):
             right = b_idx
             left = a_idx
             for step, (must_touch, must_not_touch) in enumerate(chain):
-                found = False
-                touch_idx = None
-                for j in range(right, left-1, -1):
-                    values = [p_high[j], p_low[j], p_close[j]]
-                    touched = min(values) <= fib[must_touch] <= max(values)
-                    not_touched = False
-                    if must_not_touch: not_touched = min(values) <= fib[must_not_touch] <= max(values)
-                    if touched and not not_touched:
-                        found = True
-                        touch_idx = j
-                        break
-
-                if not found: return {"signal": "none", "reason": f"Chain validation failed at {must_touch}"}
+                touch_idx = p_context.find_touch(right, left, fib[must_touch],
+                                                 fib[must_not_touch] if must_not_touch else None)
+                if touch_idx is None: return {"signal": "none", "reason": f"Chain validation failed at {must_touch}"}
                 right = touch_idx - 1
             return {"signal": "short", "reason": "Short signal generated with AxB ZigZag and Fibonacci chain"}
     return {"signal": "none", "reason": "No LL-LH-LL pattern found"}
 
 def F_Get_Fibonacci(p_close, p_high, p_low):
     # DESC: Returns appropriate Fibonacci levels based on the last two ZigZag points. Calculates for long if last ZigZag is HH, for short if LL.
-    zigzag_points = F_Get_ZigZag(p_close, p_high, p_low, 10)  # Default period 10, can be parameterized if needed
+    return F_Find_Fibonacci(C_Analysis_Context(p_close, p_high, p_low))
+
+def F_Find_Fibonacci(p_context, p_period=FIBONACCI_PERIOD):
+    # DESC: F_Get_Fibonacci over the shared pivots of an analysis context
+    zigzag_points = p_context.zigzag(p_period)
     if len(zigzag_points) < 2: return {}
     _, last_price, last_label = zigzag_points[-1]
     _, prev_price, _ = zigzag_points[-2]
     if last_label == 'HH': return F_Calculate_Fib_Levels_Long(last_price, prev_price)
     elif last_label == 'LL': return F_Calculate_Fib_Levels_Short(last_price, prev_price)
     else: return {}
+
+def F_Get_ZigZag_Level(p_context, p_period):
+    # DESC: Returns the price of the last ZigZag point for p_period (None without pivots)
+    zigzag_points = p_context.zigzag(p_period)
+    return zigzag_points[-1][1] if zigzag_points else None
+
+def F_Evaluate(p_context, p_zigzag_period):
+    # DESC: Runs the full strategy over an analysis context: last ZigZag level (None without pivots),
+    # Fibonacci levels and the long/short signals
+    return {
+        'zigzag_level': F_Get_ZigZag_Level(p_context, p_zigzag_period),
+        'fibo_levels': F_Find_Fibonacci(p_context),
+        'long_signal': F_Find_Long_Signal(p_context, p_zigzag_period),
+        'short_signal': F_Find_Short_Signal(p_context, p_zigzag_period)
+    }
@@ -0,0 +1,127 @@
+# ----- HEADER --------------------------------------------------
+
+# File: signal_numba.py
+# Description: Numba strategy backend: pivot detection and Fibonacci chain-touch tests compiled to machine code.
+# Numba is optional; F_Is_Available() reports whether this backend can be used. The kernels are compiled for
+# fixed signatures with cache=True, so the machine code is written next to this module (or to NUMBA_CACHE_DIR)
+# once and loaded from disk by later processes instead of being recompiled at every start. Without Numba the
+# kernels stay plain Python over NumPy arrays (used by the tests only).
+
+# ----- LIBRARY --------------------------------------------------
+
+try:
+    import numpy as L_NP
+except ImportError:
+    L_NP = None
+
+try:
+    import numba as L_Numba
+except ImportError:
+    L_Numba = None
+
+from backend.trade import signal_logic as S_Strategy
+
+# ----- VARIABLE --------------------------------------------------
+
+# Compiled signatures: float64 high/low (or bar range) arrays, int64 bar indexes
+WINDOW_SIGNATURE = "float64[:](float64[:], int64, boolean)"
+PIVOT_SIGNATURE = "Tuple((int64[:], boolean[:]))(float64[:], float64[:], int64)"
+TOUCH_SIGNATURE = "int64(float64[:], float64[:], int64, int64, float64, float64, boolean)"
+
+# ----- CLASS --------------------------------------------------
+
+class C_Numba_Context(S_Strategy.C_Analysis_Context):
+    # DESC: Analysis context running pivot detection and chain-touch tests in compiled kernels. Produces exactly the
+    # output of the pure-Python context: the kernels make the same comparisons on the same float64 values and
+    # prices are taken from the original series.
+    def __init__(self, p_close, p_high, p_low):
+        super().__init__(p_close, p_high, p_low)
+        self._high = L_NP.asarray(p_high, dtype=L_NP.float64)
+        self._low = L_NP.asarray(p_low, dtype=L_NP.float64)
+        self._bar_min = None
+        self._bar_max = None
+
+    def compute_zigzag(self, p_period):
+        # DESC: Pivot detection in the compiled kernel; only the labeling of the (few) pivots runs in Python.
+        if len(self.close) < p_period * 2: return []
+        if p_period <= 0: return S_Strategy.F_Get_ZigZag(self.close, self.high, self.low, p_period)
+        bars, highs = _pivot_kernel(self._high, self._low, p_period)
+        return S_Strategy.F_Label_Pivots(self.high, self.low, list(zip(bars.tolist(), highs.tolist())))
+
+    def find_touch(self, p_right, p_left, p_level, p_avoid_level=None):
+        # DESC: Compiled per-bar loop over the precomputed bar ranges.
+        if p_right < p_left: return None
+        if self._bar_min is None:
+            close = L_NP.asarray(self.close, dtype=L_NP.float64)
+            self._bar_min = L_NP.minimum(L_NP.minimum(self._high, self._low), close)
+            self._bar_max = L_NP.maximum(L_NP.maximum(self._high, self._low), close)
+        avoid = p_avoid_level is not None
+        index = _touch_kernel(self._bar_min, self._bar_max, p_right, p_left, float(p_level),
+                              float(p_avoid_level) if avoid else 0.0, avoid)
+        return int(index) if index >= 0 else None
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Is_Available():
+    # DESC: Returns True if Numba (and NumPy) are installed.
+    return L_Numba is not None and L_NP is not None
+
+def _window_kernel(p_values, p_width, p_highest):
+    """
+    Returns the maximum (p_highest) or minimum of every window p_values[k:k + p_width], k = 0..len - p_width
+    (see signal_logic._window_extremes). The monotonic deque of candidate indices lives in an index array.
+    """
+    count = p_values.shape[0]
+    extremes = L_NP.empty(max(count - p_width + 1, 0), L_NP.float64)
+    window = L_NP.empty(count, L_NP.int64)
+    head, tail = 0, 0
+    for k in range(count):
+        value = p_values[k]
+        if p_highest:
+            while tail > head and p_values[window[tail - 1]] <= value: tail -= 1
+        else:
+            while tail > head and p_values[window[tail - 1]] >= value: tail -= 1
+        window[tail] = k
+        tail += 1
+        if window[head] <= k - p_width: head += 1
+        if k >= p_width - 1: extremes[k - p_width + 1] = p_values[window[head]]
+    return extremes
+
+def _pivot_kernel(p_high, p_low, p_period):
+    """
+    Returns (bars, is_high) arrays of the pivots in bar order (see signal_logic.F_Get_ZigZag): a bar is a pivot
+    high if its high is strictly above the high of every other bar within p_period on both sides, a pivot low
+    likewise with the lows. The extremes of the p_period bars before and after each bar come from one sliding
+    window series, so the pass is O(n). p_period must be positive.
+    """
+    count = p_high.shape[0]
+    window_highs = _window_kernel(p_high, p_period, True)
+    window_lows = _window_kernel(p_low, p_period, False)
+    bars = L_NP.empty(count, L_NP.int64)
+    highs = L_NP.empty(count, L_NP.bool_)
+    found = 0
+    for i in range(p_period, count - p_period):
+        is_high = window_highs[i - p_period] < p_high[i] and window_highs[i + 1] < p_high[i]
+        is_low = window_lows[i - p_period] > p_low[i] and window_lows[i + 1] > p_low[i]
+        if is_high or is_low:
+            bars[found] = i
+            highs[found] = is_high
+            found += 1
+    return bars[:found], highs[:found]
+
+def _touch_kernel(p_bar_min, p_bar_max, p_right, p_left, p_level, p_avoid_level, p_avoid):
+    """
+    Returns the first bar from p_right down to p_left whose range contains p_level but not p_avoid_level (only
+    tested when p_avoid is True), else -1.
+    """
+    for j in range(p_right, p_left - 1, -1):
+        if p_bar_min[j] <= p_level <= p_bar_max[j]:
+            if p_avoid and p_bar_min[j] <= p_avoid_level <= p_bar_max[j]: continue
+            return j
+    return -1
+
+if F_Is_Available():
+    # The window kernel is compiled first: the pivot kernel calls the compiled version
+    _window_kernel = L_Numba.njit(WINDOW_SIGNATURE, cache=True, nogil=True)(_window_kernel)
+    _pivot_kernel = L_Numba.njit(PIVOT_SIGNATURE, cache=True, nogil=True)(_pivot_kernel)
+    _touch_kernel = L_Numba.njit(TOUCH_SIGNATURE, cache=True, nogil=True)(_touch_kernel)
@@ -0,0 +1,68 @@
+# ----- HEADER --------------------------------------------------
+
+# File: signal_numpy.py
+# Description: NumPy strategy backend: vectorized pivot detection and Fibonacci chain-touch tests for signal_logic.
+# NumPy is optional; F_Is_Available() reports whether this backend can be used.
+
+# ----- LIBRARY --------------------------------------------------
+
+try:
+    import numpy as L_NP
+    from numpy.lib.stride_tricks import sliding_window_view as L_Sliding_Window
+except ImportError:
+    L_NP = None
+
+from backend.trade import signal_logic as S_Strategy
+
+# ----- CLASS --------------------------------------------------
+
+class C_Numpy_Context(S_Strategy.C_Analysis_Context):
+    # DESC: Analysis context computing pivots and chain-touch tests with NumPy. Produces exactly the output of the
+    # pure-Python context: every comparison is done on the same float64 values and prices are taken from the
+    # original series.
+    def __init__(self, p_close, p_high, p_low):
+        super().__init__(p_close, p_high, p_low)
+        self._high = L_NP.asarray(p_high, dtype=L_NP.float64)
+        self._low = L_NP.asarray(p_low, dtype=L_NP.float64)
+        self._bar_min = None
+        self._bar_max = None
+
+    def compute_zigzag(self, p_period):
+        # DESC: Pivot detection over sliding windows; only the labeling of the (few) pivots runs in Python.
+        if len(self.close) < p_period * 2: return []
+        if p_period <= 0: return S_Strategy.F_Get_ZigZag(self.close, self.high, self.low, p_period)
+        pivots = F_Get_Pivots(self._high, self._low, p_period)
+        return S_Strategy.F_Label_Pivots(self.high, self.low, pivots)
+
+    def find_touch(self, p_right, p_left, p_level, p_avoid_level=None):
+        # DESC: Boolean interval masks over the bar range instead of a per-bar loop.
+        if p_right < p_left: return None
+        if self._bar_min is None:
+            close = L_NP.asarray(self.close, dtype=L_NP.float64)
+            self._bar_min = L_NP.minimum(L_NP.minimum(self._high, self._low), close)
+            self._bar_max = L_NP.maximum(L_NP.maximum(self._high, self._low), close)
+        lows = self._bar_min[p_left:p_right + 1]
+        highs = self._bar_max[p_left:p_right + 1]
+        mask = (lows <= p_level) & (p_level <= highs)
+        if p_avoid_level is not None: mask &= ~((lows <= p_avoid_level) & (p_avoid_level <= highs))
+        touches = L_NP.flatnonzero(mask)
+        return p_left + int(touches[-1]) if len(touches) else None
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Is_Available():
+    # DESC: Returns True if NumPy is installed.
+    return L_NP is not None
+
+def F_Get_Pivots(p_high, p_low, p_period):
+    # DESC: Returns the pivots of float64 high/low arrays as (index, is_high) pairs in bar order (see
+    # signal_logic.F_Get_ZigZag). Requires p_period > 0 and at least 2 * p_period bars.
+    count = len(p_high)
+    window_highs = L_Sliding_Window(p_high, p_period).max(axis=1)
+    window_lows = L_Sliding_Window(p_low, p_period).min(axis=1)
+    bars = L_NP.arange(p_period, count - p_period)
+    highs, lows = p_high[bars], p_low[bars]
+    is_high = (window_highs[bars - p_period] < highs) & (window_highs[bars + 1] < highs)
+    is_low = (window_lows[bars - p_period] > lows) & (window_lows[bars + 1] > lows)
+    pivot_bars = L_NP.flatnonzero(is_high | is_low)
+    return list(zip((bars[pivot_bars]).tolist(), is_high[pivot_bars].tolist()))
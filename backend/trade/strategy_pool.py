@@ -0,0 +1,98 @@
+# ----- HEADER --------------------------------------------------
+
+# File: strategy_pool.py
+# Description: Process pool for strategy evaluation, so the ZigZag/Fibonacci math of concurrent scans runs on all
+# CPU cores instead of being serialized by the GIL. Candles travel as packed float64 buffers, not pickled lists;
+# the registered strategies (strategy_registry.py) travel by reference to their importable class.
+
+# ----- LIBRARY --------------------------------------------------
+
+import array as L_Array
+import threading as L_Thread
+import multiprocessing as L_MP
+import concurrent.futures as L_Futures
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+
+from backend.trade import signal_logic as S_Strategy
+from backend.trade import strategy_registry as M_Strategy_Registry
+
+# ----- VARIABLE --------------------------------------------------
+
+# Worker processes are spawned (not forked): the scanner process runs many threads, which fork does not copy safely
+START_METHOD = "spawn"
+
+# Shared pool used by the scanner (see F_Get_Pool)
+_pool: Optional['C_Strategy_Pool'] = None
+_pool_lock = L_Thread.Lock()
+
+# ----- CLASS --------------------------------------------------
+
+class C_Strategy_Pool:
+    # DESC: Evaluates candle bundles in p_processes worker processes. evaluate() blocks the calling thread until
+    # its result is ready, so the scanner's I/O threads keep feeding the pool while the math runs in parallel.
+    def __init__(self, p_processes: int):
+        self.processes = p_processes
+        self.broken = False
+        self._executor = L_Futures.ProcessPoolExecutor(max_workers=p_processes,
+                                                       mp_context=L_MP.get_context(START_METHOD))
+
+    def submit(self, p_strategies: List[M_Strategy_Registry.C_Strategy], p_candles: Dict[str, List[float]],
+               p_zigzag_period: int, p_backend: str = S_Strategy.DEFAULT_STRATEGY_BACKEND) -> L_Futures.Future:
+        # DESC: Queues the evaluation of one bundle by p_strategies and returns its future (result: the list of
+        # strategy results, see F_Evaluate_Strategies). Only the columns the strategies read are sent.
+        columns = {column: F_Pack(p_candles[column]) for column in M_Strategy_Registry.F_Get_Columns(p_strategies)}
+        payload = (list(p_strategies), columns, p_zigzag_period, p_backend)
+        return self._executor.submit(F_Evaluate_Packed, payload)
+
+    def evaluate(self, p_strategies, p_candles, p_zigzag_period, p_backend=S_Strategy.DEFAULT_STRATEGY_BACKEND):
+        # DESC: Evaluates one bundle in a worker process and returns the results. If a worker died, the pool is
+        # marked broken (F_Get_Pool replaces it) and the bundle is evaluated in the calling thread instead.
+        try:
+            return self.submit(p_strategies, p_candles, p_zigzag_period, p_backend).result()
+        except BrokenProcessPool:
+            self.broken = True
+            return F_Evaluate_Strategies(p_strategies, p_candles, p_zigzag_period, p_backend)
+
+    def close(self):
+        # DESC: Stops the worker processes (queued evaluations are cancelled).
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Get_Pool(p_processes: int) -> Optional[C_Strategy_Pool]:
+    # DESC: Returns the shared pool with p_processes workers, (re)creating it when the size changed or a worker died.
+    # Returns None (evaluate in the calling thread) when p_processes is 0.
+    global _pool
+    with _pool_lock:
+        if _pool is not None and (_pool.processes != p_processes or _pool.broken):
+            _pool.close()
+            _pool = None
+        if p_processes > 0 and _pool is None: _pool = C_Strategy_Pool(p_processes)
+        return _pool
+
+def F_Close_Pool():
+    # DESC: Stops the shared pool.
+    F_Get_Pool(0)
+
+def F_Pack(p_values: List[float]) -> bytes:
+    # DESC: Packs a float series into a float64 buffer (8 bytes per value, exact).
+    return L_Array.array('d', p_values).tobytes()
+
+def F_Unpack(p_buffer: bytes) -> List[float]:
+    # DESC: Restores a series packed by F_Pack.
+    values = L_Array.array('d')
+    values.frombytes(p_buffer)
+    return values.tolist()
+
+def F_Evaluate_Packed(p_payload) -> List[Dict[str, Any]]:
+    # DESC: Worker entry point: unpacks the candles and runs F_Evaluate_Strategies.
+    strategies, columns, zigzag_period, backend = p_payload
+    candles = {column: F_Unpack(buffer) for column, buffer in columns.items()}
+    return F_Evaluate_Strategies(strategies, candles, zigzag_period, backend)
+
+def F_Evaluate_Strategies(p_strategies, p_candles, p_zigzag_period, p_backend=S_Strategy.DEFAULT_STRATEGY_BACKEND):
+    # DESC: Evaluates one bundle by every strategy in p_strategies over one shared analysis context of p_backend.
+    # Returns the strategy results in order.
+    context = S_Strategy.F_Create_Context(p_candles['close'], p_candles['high'], p_candles['low'], p_backend)
+    return [strategy.evaluate(context, p_candles, p_zigzag_period) for strategy in p_strategies]
@@ -0,0 +1,79 @@
+# ----- HEADER --------------------------------------------------
+
+# File: strategy_registry.py
+# Description: Strategy interface and registry. Every strategy declares the intervals it runs on and the candle
+# columns it reads; the scanner fetches one candle bundle per (symbol, interval) and runs every registered strategy
+# over it.
+
+# ----- LIBRARY --------------------------------------------------
+
+import abc as L_ABC
+import threading as L_Thread
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from backend.trade import signal_logic as S_Strategy
+
+# ----- VARIABLE --------------------------------------------------
+
+# Columns of the analysis context every strategy receives (see signal_logic.C_Analysis_Context)
+CONTEXT_COLUMNS = ('close', 'high', 'low')
+
+# Registered strategies by name, in registration order (the scanner evaluates and reports them in this order)
+_strategies: Dict[str, 'C_Strategy'] = {}
+_strategies_lock = L_Thread.Lock()
+
+# ----- CLASS --------------------------------------------------
+
+class C_Strategy(L_ABC.ABC):
+    # DESC: Base class of the scanner strategies. Subclasses set name, columns (candle columns read besides the
+    # analysis context), intervals (None: every scanned interval) and patterns (read-only mapping of signal
+    # direction -> label shown in the signal table), and implement evaluate(). Instances are sent to
+    # the strategy process pool, so they must be picklable (module-level classes with plain attributes).
+    name = ''
+    columns: Tuple[str, ...] = CONTEXT_COLUMNS
+    intervals: Optional[Tuple[str, ...]] = None
+    patterns: Mapping[str, str] = MappingProxyType({})
+
+    @L_ABC.abstractmethod
+    def evaluate(self, p_context, p_candles: Dict[str, List[float]], p_zigzag_period: int) -> Dict[str, Any]:
+        # DESC: Evaluates one candle bundle. p_context is the analysis context shared by all strategies of the bundle,
+        # p_candles holds at least the declared columns. Returns a dict with any of 'zigzag_level' (float or None),
+        # 'fibo_levels' (dict) and 'long_signal' / 'short_signal' ({'signal', 'reason'}), as signal_logic.F_Evaluate.
+        pass
+
+    def applies_to(self, p_interval: str) -> bool:
+        # DESC: Returns True if the strategy runs on p_interval.
+        return self.intervals is None or p_interval in self.intervals
+
+class C_Fibonacci_Chain_Strategy(C_Strategy):
+    # DESC: HH(a)-LH(x)-HH(b) long and LL(a)-LH(x)-LL(b) short patterns of the ZigZag with AxB Fibonacci chain
+    # validation (signal_logic.F_Evaluate).
+    name = 'fibonacci_chain'
+    patterns = MappingProxyType({'long': 'HH-LH-HH', 'short': 'LL-LH-LL'})
+
+    def evaluate(self, p_context, p_candles, p_zigzag_period):
+        # DESC: Runs the strategy over the shared pivots of the analysis context.
+        return S_Strategy.F_Evaluate(p_context, p_zigzag_period)
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Register(p_strategy: C_Strategy) -> C_Strategy:
+    # DESC: Registers a strategy (a strategy of the same name is replaced in place) and returns it.
+    with _strategies_lock: _strategies[p_strategy.name] = p_strategy
+    return p_strategy
+
+def F_Get_Strategies(p_interval: Optional[str] = None) -> List[C_Strategy]:
+    # DESC: Returns the registered strategies in registration order, limited to those running on p_interval if given.
+    with _strategies_lock: strategies = list(_strategies.values())
+    if p_interval is None: return strategies
+    return [strategy for strategy in strategies if strategy.applies_to(p_interval)]
+
+def F_Get_Columns(p_strategies: Sequence[C_Strategy]) -> Tuple[str, ...]:
+    # DESC: Returns the candle columns p_strategies read, the analysis context columns first.
+    columns = list(CONTEXT_COLUMNS)
+    for strategy in p_strategies: columns.extend(column for column in strategy.columns if column not in columns)
+    return tuple(columns)
+
+# Built-in strategies; the first registered one is reported first in the scanner status
+F_Register(C_Fibonacci_Chain_Strategy())
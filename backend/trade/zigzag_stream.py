@@ -0,0 +1,178 @@
+# ----- HEADER --------------------------------------------------
+
+# File: zigzag_stream.py
+# Description: Incremental ZigZag engine: pivots are confirmed as candles close instead of rescanning the whole
+# kline window on every evaluation.
+
+# ----- LIBRARY --------------------------------------------------
+
+import threading as L_Thread
+from collections import deque as L_Deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.trade import signal_logic as S_Strategy
+
+# ----- VARIABLE --------------------------------------------------
+
+# ZigZag state per (symbol, interval, zigzag_period) and its locks
+_streams: Dict[Tuple[str, str, int], 'C_ZigZag_Stream'] = {}
+_stream_locks: Dict[Tuple[str, str, int], L_Thread.Lock] = {}
+_streams_lock = L_Thread.Lock()
+
+# Closed candles appended incrementally vs. states rebuilt from a whole window (first use, gaps, restores)
+_stream_stats = {'appended': 0, 'rebuilt': 0}
+
+# ----- CLASS --------------------------------------------------
+
+class C_ZigZag_Stream:
+    # DESC: ZigZag state of one (symbol, interval, zigzag period), fed with closed candles in order.
+    # A bar is confirmed as a pivot once the p_period bars after it have closed; the sliding window extremes needed
+    # for the test are kept in monotonic deques, so append() is O(1) amortized. Pivots are stored with absolute bar
+    # numbers (0 = first bar fed) and mapped onto a kline window by window_points().
+    def __init__(self, p_period: int):
+        self.period = p_period
+        self.count = 0                      # closed bars fed so far
+        self.last_start: Optional[float] = None
+        self.pivots = L_Deque()             # (absolute bar, is_high) in bar order
+        self.first_kept = 0                 # pivots before this absolute bar have been dropped
+        self._highs = L_Deque(maxlen=p_period + 1)
+        self._lows = L_Deque(maxlen=p_period + 1)
+        self._max_window = L_Deque()        # monotonic deque of (bar, high) for the last p_period bars
+        self._min_window = L_Deque()
+        self._window_highs = L_Deque(maxlen=p_period + 2)   # max of bars [k, k + p_period - 1], newest last
+        self._window_lows = L_Deque(maxlen=p_period + 2)
+
+    def append(self, p_start: float, p_high: float, p_low: float):
+        # DESC: Adds the next closed candle and confirms the bar p_period candles back if it is a pivot.
+        bar, period = self.count, self.period
+        self.count += 1
+        self.last_start = p_start
+        if period <= 0:
+            # Without neighbours every bar is a high pivot (see signal_logic.F_Get_ZigZag)
+            self.pivots.append((bar, True))
+            return
+        self._highs.append(p_high)
+        self._lows.append(p_low)
+        _push_extreme(self._max_window, bar, p_high, period, True)
+        _push_extreme(self._min_window, bar, p_low, period, False)
+        if bar < period - 1: return
+        self._window_highs.append(self._max_window[0][1])
+        self._window_lows.append(self._min_window[0][1])
+        # Candidate bar i = bar - period: left window [i - p, i - 1] was complete p + 1 bars ago, right window
+        # [i + 1, i + p] just completed
+        if bar < 2 * period: return
+        high, low = self._highs[0], self._lows[0]
+        left_high, right_high = self._window_highs[-period - 2], self._window_highs[-1]
+        left_low, right_low = self._window_lows[-period - 2], self._window_lows[-1]
+        is_high = left_high < high and right_high < high
+        is_low = left_low > low and right_low > low
+        if is_high or is_low: self.pivots.append((bar - period, is_high))
+
+    def window_points(self, p_close: List[float], p_high: List[float], p_low: List[float]) -> List[list]:
+        # DESC: Returns the ZigZag points of a kline window (oldest -> newest) whose last bar is the forming candle
+        # following the last appended bar, identical to signal_logic.F_Get_ZigZag over the same lists.
+        period, length = self.period, len(p_close)
+        if length < period * 2: return []
+        start = self.count + 1 - length     # absolute number of the window's first bar
+        last = self.count                   # absolute number of the forming bar
+        # Pivots need period bars on both sides inside the window; the window only moves forward, so pivots
+        # before its start + period are dropped for good
+        while self.pivots and self.pivots[0][0] < start + period: self.pivots.popleft()
+        self.first_kept = max(self.first_kept, start + period)
+        pivots = [(bar - start, is_high) for bar, is_high in self.pivots]
+        # The forming candle completes the right window of one more bar; it is tested directly in O(period)
+        bar = last - period
+        if period > 0 and bar >= start + period:
+            index = bar - start
+            high, low = p_high[index], p_low[index]
+            left_high, left_low = self._window_highs[-period - 1], self._window_lows[-period - 1]
+            right = range(index + 1, index + period + 1)
+            is_high = left_high < high and all(p_high[j] < high for j in right)
+            is_low = left_low > low and all(p_low[j] > low for j in right)
+            if is_high or is_low: pivots.append((index, is_high))
+        elif period <= 0 and bar >= start: pivots.append((bar - start, True))
+        return S_Strategy.F_Label_Pivots(p_high, p_low, pivots)
+
+class C_Stream_Context(S_Strategy.C_Analysis_Context):
+    # DESC: Analysis context whose ZigZag for the stream's period comes from the incremental state;
+    # other periods (e.g. the Fibonacci display period) are computed in batch.
+    def __init__(self, p_stream: C_ZigZag_Stream, p_close, p_high, p_low):
+        super().__init__(p_close, p_high, p_low)
+        self.stream = p_stream
+
+    def compute_zigzag(self, p_period):
+        if p_period != self.stream.period: return super().compute_zigzag(p_period)
+        return self.stream.window_points(self.close, self.high, self.low)
+
+# ----- FUNCTION --------------------------------------------------
+
+def F_Create_Context(p_symbol: str, p_interval: str, p_period: int, p_candles: Dict[str, List[float]]):
+    # DESC: Brings the ZigZag state of the pair up to date with a candle bundle (ordered oldest -> newest, last
+    # candle forming) and returns an analysis context backed by it.
+    key = (p_symbol, p_interval, p_period)
+    with _streams_lock:
+        lock = _stream_locks.setdefault(key, L_Thread.Lock())
+    with lock:
+        stream = _sync(key, p_candles)
+        context = C_Stream_Context(stream, p_candles['close'], p_candles['high'], p_candles['low'])
+        # Resolve the pivots while holding the lock; the context is then independent of later appends
+        context.zigzag(p_period)
+    return context
+
+def F_Evict(p_active_symbols: Iterable[str]) -> int:
+    # DESC: Drops the states of symbols that left the scan universe. Returns the number of dropped states.
+    active = set(p_active_symbols)
+    with _streams_lock:
+        stale = [key for key in _streams if key[0] not in active]
+        for key in stale:
+            del _streams[key]
+            _stream_locks.pop(key, None)
+        return len(stale)
+
+def F_Clear():
+    # DESC: Drops every state and resets the counters.
+    with _streams_lock:
+        _streams.clear()
+        _stream_locks.clear()
+        for key in _stream_stats: _stream_stats[key] = 0
+
+def F_Get_Stats() -> Dict[str, int]:
+    # DESC: Returns appended/rebuilt counters and the number of tracked states.
+    with _streams_lock: return dict(_stream_stats, states=len(_streams))
+
+def _sync(p_key, p_candles) -> C_ZigZag_Stream:
+    """
+    Appends the closed candles of the bundle that the state has not seen yet. The state is rebuilt from the
+    bundle when it is new, when the bundle does not continue it (gap, restore) or when the window moved back.
+    """
+    starts, highs, lows = p_candles['start_time'], p_candles['high'], p_candles['low']
+    closed = len(starts) - 1
+    stream = _streams.get(p_key)
+    if stream is not None and stream.last_start is not None and closed > 0:
+        # Position of the last fed candle in the bundle (new candles are few, so search from the end)
+        position = closed - 1
+        while position >= 0 and starts[position] > stream.last_start: position -= 1
+        if position >= 0 and starts[position] == stream.last_start:
+            window_start = stream.count + (closed - 1 - position) + 1 - len(starts)
+            if window_start + stream.period >= stream.first_kept:
+                for index in range(position + 1, closed): stream.append(starts[index], highs[index], lows[index])
+                _stream_stats['appended'] += closed - 1 - position
+                return stream
+    stream = C_ZigZag_Stream(p_key[2])
+    for index in range(closed): stream.append(starts[index], highs[index], lows[index])
+    with _streams_lock:
+        _streams[p_key] = stream
+        _stream_stats['rebuilt'] += 1
+    return stream
+
+def _push_extreme(p_window, p_bar, p_value, p_width, p_highest):
+    """
+    Pushes a bar into a monotonic deque holding the maximum (p_highest) or minimum candidates of the last
+    p_width bars; the front is the extreme of the window.
+    """
+    if p_highest:
+        while p_window and p_window[-1][1] <= p_value: p_window.pop()
+    else:
+        while p_window and p_window[-1][1] >= p_value: p_window.pop()
+    p_window.append((p_bar, p_value))
+    if p_window[0][0] <= p_bar - p_width: p_window.popleft()